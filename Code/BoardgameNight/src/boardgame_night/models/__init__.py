@@ -0,0 +1,7 @@
+"""Domain models."""
+
+from boardgame_night.models.game import Game
+from boardgame_night.models.play_session import PlaySession
+from boardgame_night.models.player import Player
+
+__all__ = ["Game", "PlaySession", "Player"]
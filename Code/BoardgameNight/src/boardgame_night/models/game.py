@@ -0,0 +1,44 @@
+"""Board game model."""
+
+from dataclasses import dataclass, field
+
+MIN_COMPLEXITY = 1.0
+MAX_COMPLEXITY = 5.0
+
+
+@dataclass(frozen=True, slots=True)
+class Game:
+    """A board game with its player counts, playtime and complexity."""
+
+    name: str
+    min_players: int
+    max_players: int
+    min_playtime: int
+    max_playtime: int
+    complexity: float
+    categories: frozenset[str] = field(default_factory=frozenset)
+    mechanics: frozenset[str] = field(default_factory=frozenset)
+
+    def __post_init__(self) -> None:
+        if not self.name.strip():
+            raise ValueError("Game name must not be empty")
+        if self.min_players < 1:
+            raise ValueError("min_players must be at least 1")
+        if self.max_players < self.min_players:
+            raise ValueError("max_players must be >= min_players")
+        if self.min_playtime < 1:
+            raise ValueError("min_playtime must be at least 1")
+        if self.max_playtime < self.min_playtime:
+            raise ValueError("max_playtime must be >= min_playtime")
+        if not MIN_COMPLEXITY <= self.complexity <= MAX_COMPLEXITY:
+            raise ValueError(
+                f"complexity must be between {MIN_COMPLEXITY} and {MAX_COMPLEXITY}"
+            )
+
+    def supports_player_count(self, count: int) -> bool:
+        """Return True if the game can be played with `count` players."""
+        return self.min_players <= count <= self.max_players
+
+    def fits_time_slot(self, minutes: int) -> bool:
+        """Return True if the game can be played within `minutes`."""
+        return self.min_playtime <= minutes
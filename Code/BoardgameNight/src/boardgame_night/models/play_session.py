@@ -0,0 +1,39 @@
+"""Play session model."""
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from boardgame_night.models.game import Game
+from boardgame_night.models.player import Player
+
+
+def _new_id() -> str:
+    return str(uuid.uuid4())
+
+
+@dataclass(frozen=True, slots=True)
+class PlaySession:
+    """A record of a game being played."""
+
+    game: Game
+    players: frozenset[Player]
+    date: datetime
+    duration_minutes: int | None = None
+    winner: Player | None = None
+    notes: str = ""
+    id: str = field(default_factory=_new_id)
+
+    def __post_init__(self) -> None:
+        if len(self.players) < self.game.min_players:
+            raise ValueError(
+                f"{self.game.name} needs at least {self.game.min_players} players"
+            )
+        if len(self.players) > self.game.max_players:
+            raise ValueError(
+                f"{self.game.name} allows at most {self.game.max_players} players"
+            )
+        if self.winner is not None and self.winner not in self.players:
+            raise ValueError("winner must be one of the players")
+        if self.duration_minutes is not None and self.duration_minutes <= 0:
+            raise ValueError("duration_minutes must be positive")
@@ -0,0 +1,35 @@
+"""Player model."""
+
+import uuid
+from dataclasses import dataclass, field
+
+from boardgame_night.models.game import MAX_COMPLEXITY, MIN_COMPLEXITY
+
+
+def _new_id() -> str:
+    return str(uuid.uuid4())
+
+
+@dataclass(frozen=True, slots=True)
+class Player:
+    """A person who plays games, with their preferences."""
+
+    name: str
+    id: str = field(default_factory=_new_id)
+    favorite_categories: frozenset[str] = field(default_factory=frozenset)
+    complexity_preference: tuple[float, float] = (MIN_COMPLEXITY, MAX_COMPLEXITY)
+
+    def __post_init__(self) -> None:
+        if not self.name.strip():
+            raise ValueError("Player name must not be empty")
+        low, high = self.complexity_preference
+        if not (
+            MIN_COMPLEXITY <= low <= MAX_COMPLEXITY
+            and MIN_COMPLEXITY <= high <= MAX_COMPLEXITY
+        ):
+            raise ValueError(
+                f"complexity preference must be between {MIN_COMPLEXITY} "
+                f"and {MAX_COMPLEXITY}"
+            )
+        if low > high:
+            raise ValueError("complexity preference minimum must be <= maximum")
@@ -0,0 +1,17 @@
+"""Services built on the domain models."""
+
+from boardgame_night.services.collection import GameCollection
+from boardgame_night.services.history import SessionHistory
+from boardgame_night.services.importer import CatalogImporter
+from boardgame_night.services.recommendations import RecommendationService
+from boardgame_night.services.scheduler import GameNightScheduler, Schedule, Table
+
+__all__ = [
+    "CatalogImporter",
+    "GameCollection",
+    "GameNightScheduler",
+    "RecommendationService",
+    "Schedule",
+    "SessionHistory",
+    "Table",
+]
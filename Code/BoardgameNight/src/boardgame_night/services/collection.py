@@ -0,0 +1,253 @@
+"""Game collection with indexed multi-criteria search."""
+
+import sys
+from array import array
+from collections.abc import Iterable
+from itertools import compress
+
+import numpy as np
+from numpy.typing import NDArray
+
+from boardgame_night.models.game import Game
+
+
+def bit_positions(bits: int) -> list[int]:
+    """Positions of the set bits of `bits`, lowest first."""
+    # Split into 64-bit words and let itertools.compress skip the zero words
+    # in C, so Python only looks at words that contain matches.
+    size = (bits.bit_length() + 63) // 64
+    words = array("Q", bits.to_bytes(size * 8, "little"))
+    if sys.byteorder == "big":
+        words.byteswap()
+    positions = []
+    for index in compress(range(size), words):
+        word = words[index]
+        base = index * 64
+        while word:
+            low = word & -word
+            positions.append(base + low.bit_length() - 1)
+            word ^= low
+    return positions
+
+
+def bit_mask(bits: int, size: int) -> NDArray[np.bool_]:
+    """Boolean array of length `size` with True at the set bits of `bits`."""
+    data = np.frombuffer(bits.to_bytes((size + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(data, count=size, bitorder="little").astype(bool)
+
+
+class ThresholdIndex:
+    """Slots keyed by a numeric attribute, answering range queries.
+
+    The value of every slot is kept in a dict. On the first query after a
+    change, the slots are sorted by value once (argsort). A query is then a
+    binary search in the sorted values, and the matching prefix or suffix of
+    the slot order is packed into a bitset. Memory stays linear in the
+    number of slots, however many distinct values there are. Query results
+    are cached per threshold until the next change.
+    """
+
+    _CACHE_SIZE = 64
+
+    def __init__(self) -> None:
+        self._values: dict[int, float] = {}
+        self._sorted: NDArray[np.float64] | None = None
+        self._order: NDArray[np.intp] = np.empty(0, dtype=np.intp)
+        self._width = 0
+        self._cache: dict[tuple[bool, float], int] = {}
+
+    def add(self, value: float, slot: int) -> None:
+        """Index `slot` under `value`."""
+        self._values[slot] = value
+        self._invalidate()
+
+    def remove(self, slot: int) -> None:
+        """Remove `slot` from the index."""
+        del self._values[slot]
+        self._invalidate()
+
+    def at_most(self, value: float) -> int:
+        """Bitset of the slots whose value is <= `value`."""
+        return self._query(True, value)
+
+    def at_least(self, value: float) -> int:
+        """Bitset of the slots whose value is >= `value`."""
+        return self._query(False, value)
+
+    def _invalidate(self) -> None:
+        self._sorted = None
+        self._cache.clear()
+
+    def _query(self, at_most: bool, value: float) -> int:
+        key = (at_most, value)
+        bits = self._cache.get(key)
+        if bits is not None:
+            return bits
+        if self._sorted is None:
+            count = len(self._values)
+            slots = np.fromiter(self._values, dtype=np.intp, count=count)
+            values = np.fromiter(self._values.values(), dtype=np.float64, count=count)
+            order = np.argsort(values, kind="stable")
+            self._sorted = values[order]
+            self._order = slots[order]
+            self._width = int(slots.max()) + 1 if count else 0
+        if at_most:
+            slots = self._order[: np.searchsorted(self._sorted, value, side="right")]
+        else:
+            slots = self._order[np.searchsorted(self._sorted, value, side="left") :]
+        mask = np.zeros(self._width, dtype=bool)
+        mask[slots] = True
+        bits = int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+        if len(self._cache) >= self._CACHE_SIZE:
+            self._cache.clear()
+        self._cache[key] = bits
+        return bits
+
+
+class GameCollection:
+    """A collection of games with CRUD operations and indexed filtering.
+
+    Every game occupies an integer slot, and each index maps attribute
+    values to bitsets of slots (Python ints). A game supports a player
+    count p when min_players <= p <= max_players, so the player-range
+    interval lookup is the intersection of two threshold queries. Playtime
+    and complexity use the same sorted-array threshold indexes. Categories
+    map to one bitset each. A query ANDs the bitsets of its criteria and
+    only materialises the games that match.
+    """
+
+    def __init__(self, games: Iterable[Game] = ()) -> None:
+        self._games: list[Game | None] = []
+        self._slots: dict[str, int] = {}
+        self._free: list[int] = []
+        self._all = 0
+        self._min_players = ThresholdIndex()
+        self._max_players = ThresholdIndex()
+        self._min_playtime = ThresholdIndex()
+        self._complexity = ThresholdIndex()
+        self._categories: dict[str, int] = {}
+        self._version = 0
+        for game in games:
+            self.add_game(game)
+
+    def add_game(self, game: Game) -> None:
+        """Add a game, replacing any game with the same name."""
+        self.remove_game(game.name)
+        if self._free:
+            slot = self._free.pop()
+            self._games[slot] = game
+        else:
+            slot = len(self._games)
+            self._games.append(game)
+        self._slots[game.name] = slot
+        self._version += 1
+
+        bit = 1 << slot
+        self._all |= bit
+        self._min_players.add(game.min_players, slot)
+        self._max_players.add(game.max_players, slot)
+        self._min_playtime.add(game.min_playtime, slot)
+        self._complexity.add(game.complexity, slot)
+        for category in game.categories:
+            self._categories[category] = self._categories.get(category, 0) | bit
+
+    def remove_game(self, game_name: str) -> bool:
+        """Remove a game by name; return True if it was in the collection."""
+        slot = self._slots.pop(game_name, None)
+        if slot is None:
+            return False
+        game = self._games[slot]
+        assert game is not None
+        self._games[slot] = None
+        self._free.append(slot)
+        self._version += 1
+
+        mask = ~(1 << slot)
+        self._all &= mask
+        self._min_players.remove(slot)
+        self._max_players.remove(slot)
+        self._min_playtime.remove(slot)
+        self._complexity.remove(slot)
+        for category in game.categories:
+            bits = self._categories[category] & mask
+            if bits:
+                self._categories[category] = bits
+            else:
+                del self._categories[category]
+        return True
+
+    def get_game(self, name: str) -> Game | None:
+        """Find a game by its exact name."""
+        slot = self._slots.get(name)
+        return None if slot is None else self._games[slot]
+
+    def list_games(self) -> list[Game]:
+        """All games, sorted by name."""
+        return [self._game(self._slots[name]) for name in sorted(self._slots)]
+
+    def find_games(
+        self,
+        player_count: int | None = None,
+        max_playtime: int | None = None,
+        max_complexity: float | None = None,
+        categories: set[str] | None = None,
+    ) -> list[Game]:
+        """Games matching all given criteria, sorted by name.
+
+        Args:
+            player_count: Only games that support this many players
+            max_playtime: Only games that fit a slot of this many minutes
+            max_complexity: Only games at most this complex
+            categories: Only games in at least one of these categories
+        """
+        bits = self.match(player_count, max_playtime, max_complexity, categories)
+        return sorted(
+            (self._game(slot) for slot in bit_positions(bits)), key=lambda g: g.name
+        )
+
+    def match(
+        self,
+        player_count: int | None = None,
+        max_playtime: int | None = None,
+        max_complexity: float | None = None,
+        categories: set[str] | None = None,
+    ) -> int:
+        """Bitset of the slots of the games matching `find_games` criteria."""
+        bits = self._all
+        if player_count is not None:
+            bits &= self._min_players.at_most(player_count)
+            bits &= self._max_players.at_least(player_count)
+        if max_playtime is not None:
+            bits &= self._min_playtime.at_most(max_playtime)
+        if max_complexity is not None:
+            bits &= self._complexity.at_most(max_complexity)
+        if categories is not None:
+            any_category = 0
+            for category in categories:
+                any_category |= self._categories.get(category, 0)
+            bits &= any_category
+        return bits
+
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever a game is added or removed."""
+        return self._version
+
+    def game_slots(self) -> list[Game | None]:
+        """The game in every slot (None for free slots), indexed by slot."""
+        return list(self._games)
+
+    def games_at(self, bits: int) -> list[Game]:
+        """The games in the slots set in `bits`, in slot order."""
+        return [self._game(slot) for slot in bit_positions(bits)]
+
+    def _game(self, slot: int) -> Game:
+        game = self._games[slot]
+        assert game is not None
+        return game
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._slots
@@ -0,0 +1,273 @@
+"""Play session history with incrementally maintained statistics."""
+
+import sqlite3
+from collections import Counter
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+
+from boardgame_night.models import PlaySession
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    game TEXT NOT NULL,
+    played_at TEXT NOT NULL,
+    duration_minutes INTEGER,
+    winner_id TEXT,
+    notes TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS session_players (
+    session_id TEXT NOT NULL,
+    player_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (session_id, player_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS game_stats (
+    game TEXT PRIMARY KEY,
+    plays INTEGER NOT NULL,
+    last_played TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS game_stats_last_played ON game_stats (last_played);
+CREATE TABLE IF NOT EXISTS player_stats (
+    player_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    plays INTEGER NOT NULL,
+    decided INTEGER NOT NULL,
+    wins INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS month_stats (
+    month TEXT PRIMARY KEY,
+    plays INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+_UPSERT_GAME = """
+INSERT INTO game_stats (game, plays, last_played) VALUES (?, ?, ?)
+ON CONFLICT (game) DO UPDATE SET
+    plays = plays + excluded.plays,
+    last_played = max(last_played, excluded.last_played)
+"""
+_UPSERT_PLAYER = """
+INSERT INTO player_stats (player_id, name, plays, decided, wins) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (player_id) DO UPDATE SET
+    name = excluded.name,
+    plays = plays + excluded.plays,
+    decided = decided + excluded.decided,
+    wins = wins + excluded.wins
+"""
+_UPSERT_MONTH = """
+INSERT INTO month_stats (month, plays) VALUES (?, ?)
+ON CONFLICT (month) DO UPDATE SET plays = plays + excluded.plays
+"""
+
+_REBUILD_ROLLUPS = (
+    "DELETE FROM game_stats",
+    "DELETE FROM player_stats",
+    "DELETE FROM month_stats",
+    """
+    INSERT INTO game_stats
+        SELECT game, count(*), max(played_at) FROM sessions GROUP BY game
+    """,
+    """
+    INSERT INTO month_stats
+        SELECT substr(played_at, 1, 7), count(*) FROM sessions
+        GROUP BY substr(played_at, 1, 7)
+    """,
+    # With max(), the bare name column comes from the player's most recently
+    # recorded session.
+    """
+    INSERT INTO player_stats
+        SELECT player_id, name, plays, decided, wins FROM (
+            SELECT p.player_id, p.name, max(s.rowid),
+                   count(*) AS plays, count(s.winner_id) AS decided,
+                   coalesce(sum(s.winner_id = p.player_id), 0) AS wins
+            FROM session_players AS p
+            JOIN sessions AS s ON s.id = p.session_id
+            GROUP BY p.player_id
+        )
+    """,
+)
+
+
+class SessionHistory:
+    """Append-only store of play sessions backed by SQLite.
+
+    Sessions are written to `sessions` and `session_players`. In the same
+    transaction, the rollup tables are updated: plays and last play per
+    game, plays and wins per player, and plays per month. A batch is
+    pre-aggregated in Python, so each rollup row is touched once per batch.
+    Statistics queries read only the small rollup tables, never the session
+    log. "Not played in N days" is an index range scan on the last-play
+    date.
+
+    Args:
+        path: SQLite database file, ":memory:" for a private in-memory store
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+
+    def add_session(self, session: PlaySession) -> None:
+        """Record a play session."""
+        self.add_sessions([session])
+
+    def add_sessions(self, sessions: Iterable[PlaySession]) -> int:
+        """Record many play sessions in one transaction.
+
+        Returns:
+            Number of sessions recorded
+        """
+        rows = []
+        members = []
+        game_plays: Counter[str] = Counter()
+        last_played: dict[str, str] = {}
+        names: dict[str, str] = {}
+        player_plays: Counter[str] = Counter()
+        decided: Counter[str] = Counter()
+        wins: Counter[str] = Counter()
+        months: Counter[str] = Counter()
+        for session in sessions:
+            game = session.game.name
+            played_at = session.date.isoformat()
+            winner_id = session.winner.id if session.winner else None
+            rows.append(
+                (
+                    session.id,
+                    game,
+                    played_at,
+                    session.duration_minutes,
+                    winner_id,
+                    session.notes,
+                )
+            )
+            game_plays[game] += 1
+            last_played[game] = max(last_played.get(game, ""), played_at)
+            months[played_at[:7]] += 1
+            for player in session.players:
+                members.append((session.id, player.id, player.name))
+                names[player.id] = player.name
+                player_plays[player.id] += 1
+                if winner_id is not None:
+                    decided[player.id] += 1
+            if winner_id is not None:
+                wins[winner_id] += 1
+
+        with self._db:
+            self._db.executemany("INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._db.executemany(
+                "INSERT INTO session_players VALUES (?, ?, ?)", members
+            )
+            self._db.executemany(
+                _UPSERT_GAME,
+                (
+                    (game, plays, last_played[game])
+                    for game, plays in game_plays.items()
+                ),
+            )
+            self._db.executemany(
+                _UPSERT_PLAYER,
+                (
+                    (
+                        player_id,
+                        name,
+                        player_plays[player_id],
+                        decided[player_id],
+                        wins[player_id],
+                    )
+                    for player_id, name in names.items()
+                ),
+            )
+            self._db.executemany(_UPSERT_MONTH, months.items())
+        return len(rows)
+
+    def session_count(self) -> int:
+        """Number of recorded sessions."""
+        return int(self._db.execute("SELECT count(*) FROM sessions").fetchone()[0])
+
+    def plays_per_game(self) -> dict[str, int]:
+        """Number of plays of every game that was played."""
+        return dict(self._db.execute("SELECT game, plays FROM game_stats"))
+
+    def plays_per_player(self) -> dict[str, int]:
+        """Number of sessions each player took part in, by player ID."""
+        return dict(self._db.execute("SELECT player_id, plays FROM player_stats"))
+
+    def plays_per_month(
+        self, start: date | None = None, end: date | None = None
+    ) -> dict[str, int]:
+        """Number of sessions per month ("YYYY-MM"), optionally in a range.
+
+        Args:
+            start: First day to include (its whole month is counted)
+            end: Last day to include (its whole month is counted)
+        """
+        low = start.isoformat()[:7] if start else ""
+        high = end.isoformat()[:7] if end else "9999-12"
+        return dict(
+            self._db.execute(
+                "SELECT month, plays FROM month_stats"
+                " WHERE month BETWEEN ? AND ? ORDER BY month",
+                (low, high),
+            )
+        )
+
+    def win_rates(self) -> dict[str, float]:
+        """Share of decided sessions each player won, by player ID.
+
+        Sessions without a recorded winner (e.g. cooperative games) do not
+        count towards a player's win rate.
+        """
+        return {
+            player_id: wins / decided
+            for player_id, wins, decided in self._db.execute(
+                "SELECT player_id, wins, decided FROM player_stats WHERE decided > 0"
+            )
+        }
+
+    def last_played(self, game_name: str) -> datetime | None:
+        """When a game was last played, None if never."""
+        row = self._db.execute(
+            "SELECT last_played FROM game_stats WHERE game = ?", (game_name,)
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def not_played_since(
+        self,
+        days: int,
+        now: datetime | None = None,
+        game_names: Iterable[str] | None = None,
+    ) -> list[str]:
+        """Games whose last play is more than `days` days ago, sorted by name.
+
+        Args:
+            days: Number of days
+            now: Reference time (defaults to the current time)
+            game_names: Games to consider, e.g. a whole collection; those
+                never played are included. Defaults to all played games.
+        """
+        cutoff = ((now or datetime.now()) - timedelta(days=days)).isoformat()
+        stale = {
+            game
+            for (game,) in self._db.execute(
+                "SELECT game FROM game_stats WHERE last_played < ?", (cutoff,)
+            )
+        }
+        if game_names is None:
+            return sorted(stale)
+        played = self.plays_per_game()
+        return sorted(
+            name for name in set(game_names) if name in stale or name not in played
+        )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+
+    def rebuild_rollups(self) -> None:
+        """Recompute all rollup tables from the session log."""
+        # executescript() would COMMIT first and run outside the transaction,
+        # so each statement goes through execute() to keep the rebuild atomic.
+        with self._db:
+            for statement in _REBUILD_ROLLUPS:
+                self._db.execute(statement)
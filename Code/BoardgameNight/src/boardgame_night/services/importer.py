@@ -0,0 +1,364 @@
+"""Bulk import of game catalogs from CSV and XML dumps."""
+
+import csv
+import os
+import re
+import sys
+import xml.etree.ElementTree as ElementTree
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import accumulate
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+
+from boardgame_night.models import Game
+from boardgame_night.models.game import MAX_COMPLEXITY, MIN_COMPLEXITY
+
+CSV_COLUMNS = (
+    "name",
+    "min_players",
+    "max_players",
+    "min_playtime",
+    "max_playtime",
+    "complexity",
+    "categories",
+    "mechanics",
+)
+
+# Comments and CDATA sections are matched whole, so an <item tag inside them
+# is skipped; only the last alternative marks a record.
+_XML_TOKEN = re.compile(rb"<!--.*?-->|<!\[CDATA\[.*?\]\]>|(<item[\s>])", re.DOTALL)
+_CSV_TOKEN = re.compile(rb'["\n]')
+_WINDOW = 1 << 16  # bytes scanned for the next record boundary
+
+# A parsed record: byte offset, name, the five numbers, categories, mechanics.
+RawRecord = tuple[int, str, int, int, int, int, float, tuple[str, ...], tuple[str, ...]]
+# A parsed chunk: valid records and (offset, reason) pairs for rejected ones.
+ParsedChunk = tuple[list[RawRecord], list[tuple[int, str]]]
+
+
+@dataclass(frozen=True, slots=True)
+class RejectedRecord:
+    """A catalog entry that could not be imported."""
+
+    offset: int
+    reason: str
+
+
+def _split_list(value: str, separator: str) -> tuple[str, ...]:
+    return tuple(
+        item for item in (part.strip() for part in value.split(separator)) if item
+    )
+
+
+def _parse_csv(data: bytes, base: int, separator: str) -> ParsedChunk:
+    records: list[RawRecord] = []
+    rejected: list[tuple[int, str]] = []
+    lines = data.splitlines(keepends=True)
+    offsets = list(accumulate((len(line) for line in lines), initial=base))
+    # A quoted field may span lines; line_num tells where each row started.
+    rows = csv.reader(line.decode("utf-8") for line in lines)
+    header = list(CSV_COLUMNS)
+    start = base
+    for row in rows:
+        row_start, start = start, offsets[rows.line_num]
+        if not row or row == header:
+            continue
+        try:
+            name, min_p, max_p, min_t, max_t, weight, categories, mechanics = row
+            records.append(
+                (
+                    row_start,
+                    name.strip(),
+                    int(min_p),
+                    int(max_p),
+                    int(min_t),
+                    int(max_t),
+                    float(weight),
+                    _split_list(categories, separator),
+                    _split_list(mechanics, separator),
+                )
+            )
+        except ValueError:
+            rejected.append((row_start, "malformed row"))
+    return records, rejected
+
+
+def _item_offsets(data: bytes) -> list[int]:
+    """Offsets of the top-level <item> tags in a chunk of XML."""
+    return [match.start(1) for match in _XML_TOKEN.finditer(data) if match.group(1)]
+
+
+_XML_FIELDS = ("minplayers", "maxplayers", "minplaytime", "maxplaytime")
+
+
+def _parse_xml(data: bytes, base: int) -> ParsedChunk:
+    rejected: list[tuple[int, str]] = []
+    starts = _item_offsets(data)
+    # A chunk is small enough to parse as one tree, which is much faster
+    # than iterparse events. Items are not nested, so the n-th <item> child
+    # starts at the n-th tag.
+    items: list[ElementTree.Element | None]
+    try:
+        items = list(ElementTree.fromstring(b"<items>" + data + b"</items>"))
+    except ElementTree.ParseError:
+        # Parse item by item, so only the broken items are rejected.
+        items = []
+        ends = [*starts[1:], len(data)]
+        for start, end in zip(starts, ends, strict=True):
+            try:
+                items.append(ElementTree.fromstring(data[start:end]))
+            except ElementTree.ParseError:
+                items.append(None)
+    records: list[RawRecord] = []
+    for start, item in zip(starts, items, strict=False):
+        offset = base + start
+        if item is None:
+            rejected.append((offset, "malformed item"))
+            continue
+        values = {"name": "", "averageweight": ""}
+        categories: list[str] = []
+        mechanics: list[str] = []
+        for child in item:
+            tag = child.tag
+            if tag == "link":
+                kind = child.get("type")
+                if kind == "boardgamecategory":
+                    categories.append(child.get("value", ""))
+                elif kind == "boardgamemechanic":
+                    mechanics.append(child.get("value", ""))
+            elif tag == "name":
+                if child.get("type") == "primary":
+                    values["name"] = child.get("value", "")
+            elif tag == "statistics":
+                weight = child.find("ratings/averageweight")
+                if weight is not None:
+                    values["averageweight"] = weight.get("value", "")
+            else:
+                values[tag] = child.get("value", "")
+        item.clear()
+        try:
+            min_p, max_p, min_t, max_t = (int(values[tag]) for tag in _XML_FIELDS)
+            records.append(
+                (
+                    offset,
+                    values["name"].strip(),
+                    min_p,
+                    max_p,
+                    min_t,
+                    max_t,
+                    float(values["averageweight"]),
+                    tuple(categories),
+                    tuple(mechanics),
+                )
+            )
+        except (KeyError, ValueError):
+            rejected.append((offset, "malformed item"))
+    return records, rejected
+
+
+def validate_batch(records: list[RawRecord]) -> ParsedChunk:
+    """Check the `Game` rules for a whole batch at once.
+
+    The numeric columns are checked as NumPy arrays, so the cost per record
+    is a few vector operations. Invalid records are reported with the first
+    rule they break instead of raising one exception per record.
+    """
+    if not records:
+        return [], []
+    columns = np.array([record[2:7] for record in records], dtype=np.float64)
+    min_players, max_players, min_time, max_time, weight = columns.T
+    checks = (
+        (np.array([not record[1] for record in records]), "empty name"),
+        (min_players < 1, "min_players below 1"),
+        (max_players < min_players, "max_players below min_players"),
+        (min_time < 1, "min_playtime below 1"),
+        (max_time < min_time, "max_playtime below min_playtime"),
+        (
+            ~((weight >= MIN_COMPLEXITY) & (weight <= MAX_COMPLEXITY)),
+            "complexity out of range",
+        ),
+    )
+    invalid = np.zeros(len(records), dtype=bool)
+    rejected: list[tuple[int, str]] = []
+    for failed, reason in checks:
+        new = failed & ~invalid
+        rejected.extend((records[i][0], reason) for i in np.flatnonzero(new))
+        invalid |= new
+    valid = [records[i] for i in np.flatnonzero(~invalid)]
+    return valid, rejected
+
+
+def _parse_chunk(path: str, start: int, end: int, separator: str) -> ParsedChunk:
+    """Worker entry point: parse and validate one byte range of a dump."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    if path.endswith(".xml"):
+        records, malformed = _parse_xml(data, start)
+    else:
+        records, malformed = _parse_csv(data, start, separator)
+    valid, rejected = validate_batch(records)
+    return valid, malformed + rejected
+
+
+def _csv_boundary(f: BinaryIO, start: int, chunk_size: int) -> int | None:
+    """First line end after `start + chunk_size` that is outside quotes.
+
+    Quotes are counted from `start`, which is a record boundary, so a
+    newline inside a quoted field is never taken for the end of a record.
+    """
+    f.seek(start)
+    quoted = f.read(chunk_size).count(b'"') % 2
+    position = start + chunk_size
+    while window := f.read(_WINDOW):
+        for match in _CSV_TOKEN.finditer(window):
+            if match.group() == b'"':
+                quoted ^= 1
+            elif not quoted:
+                return position + match.end()
+        position += len(window)
+    return None
+
+
+def _xml_boundary(f: BinaryIO, position: int) -> int | None:
+    """First top-level <item> tag at or after `position`."""
+    f.seek(max(0, position - _WINDOW))
+    before = f.read(position - max(0, position - _WINDOW))
+    window = f.read(_WINDOW)
+    # Skip the rest of a comment or CDATA section the position falls into.
+    for opener, closer in ((b"<!--", b"-->"), (b"<![CDATA[", b"]]>")):
+        if before.rfind(opener) > before.rfind(closer):
+            end = window.find(closer)
+            if end < 0:
+                return None
+            return _xml_boundary(f, position + end + len(closer))
+    for match in _XML_TOKEN.finditer(window):
+        if match.group(1):
+            return position + match.start(1)
+    return None
+
+
+def _chunk_ranges(path: str, chunk_size: int) -> list[tuple[int, int]]:
+    """Split a dump into byte ranges that start at record boundaries.
+
+    CSV ranges end after a newline outside quoted fields. XML ranges start
+    at an `<item>` tag outside comments and CDATA sections; the document
+    header and the closing root tag are left out.
+    """
+    is_xml = path.endswith(".xml")
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, "rb") as f:
+        if is_xml:
+            first = _xml_boundary(f, 0)
+            bounds[0] = size if first is None else first
+            f.seek(max(0, size - _WINDOW))
+            tail = f.read()
+            last = tail.rfind(b"</item>")
+            size = size - len(tail) + last + len(b"</item>") if last >= 0 else 0
+        while bounds[-1] + chunk_size < size:
+            if is_xml:
+                bound = _xml_boundary(f, bounds[-1] + chunk_size)
+            else:
+                bound = _csv_boundary(f, bounds[-1], chunk_size)
+            if bound is None or bound >= size:
+                break
+            bounds.append(bound)
+    bounds.append(size)
+    return [(lo, hi) for lo, hi in zip(bounds, bounds[1:], strict=False) if hi > lo]
+
+
+class CatalogImporter:
+    """Stream `Game`s out of large CSV or XML catalog dumps.
+
+    The file is cut into byte ranges on record boundaries, and a process
+    pool parses and validates the ranges in parallel. Each batch is
+    validated with `validate_batch`. Results are consumed in file order with
+    a bounded number of chunks in flight, so memory use does not grow with
+    the file size.
+
+    The parent process builds the frozen `Game` objects. Category and
+    mechanic strings are interned, and equal category or mechanic sets
+    share one `frozenset`. That keeps the few hundred distinct values from
+    being stored once per game.
+
+    CSV dumps have the columns in `CSV_COLUMNS`, one record per line, with
+    the categories and mechanics separated by `list_separator`. XML dumps
+    use the BoardGameGeek `<item>` layout: a primary `<name>`, `minplayers`,
+    `maxplayers`, `minplaytime`, `maxplaytime`, `averageweight`, and
+    `<link>` elements for categories and mechanics.
+
+    Rejected records are collected in `rejected` with the byte offset of
+    their line or `<item>` tag.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        chunk_size: int = 4 << 20,
+        list_separator: str = ",",
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.list_separator = list_separator
+        self.rejected: list[RejectedRecord] = []
+        self._sets: dict[tuple[str, ...], frozenset[str]] = {}
+
+    def iter_games(self, path: str | Path) -> Iterator[Game]:
+        """Yield the valid games of a dump in file order."""
+        for records in self._iter_chunks(str(path)):
+            for record in records:
+                _, name, min_p, max_p, min_t, max_t, weight, categories, mechanics = (
+                    record
+                )
+                yield Game(
+                    name=name,
+                    min_players=min_p,
+                    max_players=max_p,
+                    min_playtime=min_t,
+                    max_playtime=max_t,
+                    complexity=weight,
+                    categories=self._shared_set(categories),
+                    mechanics=self._shared_set(mechanics),
+                )
+
+    def load(self, path: str | Path) -> list[Game]:
+        """Import a whole dump."""
+        return list(self.iter_games(path))
+
+    def _shared_set(self, values: tuple[str, ...]) -> frozenset[str]:
+        shared = self._sets.get(values)
+        if shared is None:
+            shared = frozenset(sys.intern(value) for value in values)
+            self._sets[values] = shared
+        return shared
+
+    def _iter_chunks(self, path: str) -> Iterator[list[RawRecord]]:
+        ranges = _chunk_ranges(path, self.chunk_size)
+        if self.workers == 1 or len(ranges) == 1:
+            for start, end in ranges:
+                yield self._collect(_parse_chunk(path, start, end, self.list_separator))
+            return
+
+        with ProcessPoolExecutor(self.workers) as pool:
+            pending: deque[Future[ParsedChunk]] = deque()
+            for start, end in ranges:
+                pending.append(
+                    pool.submit(_parse_chunk, path, start, end, self.list_separator)
+                )
+                if len(pending) >= 2 * self.workers:
+                    yield self._collect(pending.popleft().result())
+            while pending:
+                yield self._collect(pending.popleft().result())
+
+    def _collect(self, chunk: ParsedChunk) -> list[RawRecord]:
+        records, rejected = chunk
+        self.rejected.extend(
+            RejectedRecord(offset, reason) for offset, reason in rejected
+        )
+        return records
@@ -0,0 +1,156 @@
+"""Game recommendations for a game night."""
+
+import heapq
+from collections import OrderedDict
+from collections.abc import Iterable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from boardgame_night.models import Game, Player
+from boardgame_night.services.collection import GameCollection, bit_mask
+
+
+class RecommendationService:
+    """Recommend games from a collection for a group of players.
+
+    Candidates come from the collection's indexes. With players given, each
+    game is scored by how well it suits the group:
+
+    - Feature match: the games x features matrix (categories and mechanics,
+      stored sparse as row/column index arrays) times the group's preference
+      vector. The vector holds, per feature, the share of players who list
+      it among their favourites.
+    - Complexity fit: the share of players whose complexity preference
+      includes the game's complexity. It is counted for all games at once
+      with two binary searches over the sorted preference bounds.
+
+    Both terms are computed for the whole collection in a few NumPy
+    operations. The resulting score vector is cached per group, so repeated
+    queries for the same players only index it. The best `limit`
+    candidates are selected with `argpartition`, so only those are sorted.
+    """
+
+    def __init__(self, collection: GameCollection, cache_size: int = 128) -> None:
+        self.collection = collection
+        self.cache_size = cache_size
+        self._version = -1
+        self._games: list[Game | None] = []
+        self._features: dict[str, int] = {}
+        self._rows: NDArray[np.intp] = np.empty(0, dtype=np.intp)
+        self._columns: NDArray[np.intp] = np.empty(0, dtype=np.intp)
+        self._complexity: NDArray[np.float64] = np.empty(0)
+        self._scores: OrderedDict[frozenset[Player], NDArray[np.float64]] = (
+            OrderedDict()
+        )
+
+    def recommend(
+        self,
+        player_count: int,
+        available_time: int | None = None,
+        players: list[Player] | None = None,
+        max_complexity: float | None = None,
+        limit: int = 5,
+    ) -> list[Game]:
+        """Recommend games for a game night.
+
+        Args:
+            player_count: Number of players
+            available_time: Available time in minutes
+            players: Players whose preferences are matched
+            max_complexity: Maximum complexity
+            limit: Maximum number of recommendations
+
+        Returns:
+            Best-scoring games first (ties by name), or games in alphabetical
+            order if no players are given
+        """
+        if limit <= 0:
+            return []
+        bits = self.collection.match(player_count, available_time, max_complexity)
+        if not players:
+            games = self.collection.games_at(bits)
+            return heapq.nsmallest(limit, games, key=lambda game: game.name)
+
+        all_scores = self.group_scores(players)
+        slots = np.flatnonzero(bit_mask(bits, len(all_scores)))
+        scores = all_scores[slots]
+        if len(slots) > limit:
+            top = np.argpartition(scores, len(scores) - limit)[-limit:]
+            # Keep every candidate tied with the weakest pick, so ties are
+            # broken by name rather than by partition order.
+            keep = scores >= scores[top].min()
+            slots, scores = slots[keep], scores[keep]
+
+        ranked = sorted(
+            zip(scores.tolist(), slots.tolist(), strict=True),
+            key=lambda item: (-item[0], self._game(item[1]).name),
+        )
+        return [self._game(slot) for _, slot in ranked[:limit]]
+
+    def group_scores(self, players: Iterable[Player]) -> NDArray[np.float64]:
+        """Score of every collection slot for a group of players (cached)."""
+        self._refresh()
+        group = frozenset(players)
+        scores = self._scores.get(group)
+        if scores is None:
+            preferences = self._preference_vector(group)
+            matches = np.bincount(
+                self._rows,
+                weights=preferences[self._columns],
+                minlength=len(self._games),
+            )
+            scores = self._complexity_fit(group) + matches
+            self._scores[group] = scores
+            if len(self._scores) > self.cache_size:
+                self._scores.popitem(last=False)
+        else:
+            self._scores.move_to_end(group)
+        return scores
+
+    def _preference_vector(self, group: frozenset[Player]) -> NDArray[np.float64]:
+        preferences = np.zeros(len(self._features))
+        for player in group:
+            for category in player.favorite_categories:
+                feature = self._features.get(category)
+                if feature is not None:
+                    preferences[feature] += 1
+        return preferences / len(group)
+
+    def _complexity_fit(self, group: frozenset[Player]) -> NDArray[np.float64]:
+        lows = np.sort([player.complexity_preference[0] for player in group])
+        highs = np.sort([player.complexity_preference[1] for player in group])
+        # Players with low <= c, minus those with high < c (low <= high).
+        fitting = np.searchsorted(lows, self._complexity, side="right")
+        fitting -= np.searchsorted(highs, self._complexity, side="left")
+        return fitting / len(group)
+
+    def _refresh(self) -> None:
+        """Rebuild the feature matrix after the collection changed."""
+        if self._version == self.collection.version:
+            return
+        games = self.collection.game_slots()
+        features: dict[str, int] = {}
+        rows: list[int] = []
+        columns: list[int] = []
+        complexity = np.zeros(len(games))
+        for slot, game in enumerate(games):
+            if game is None:
+                continue
+            complexity[slot] = game.complexity
+            for feature in game.categories | game.mechanics:
+                rows.append(slot)
+                columns.append(features.setdefault(feature, len(features)))
+
+        self._games = games
+        self._features = features
+        self._rows = np.array(rows, dtype=np.intp)
+        self._columns = np.array(columns, dtype=np.intp)
+        self._complexity = complexity
+        self._scores.clear()
+        self._version = self.collection.version
+
+    def _game(self, slot: int) -> Game:
+        game = self._games[slot]
+        assert game is not None
+        return game
@@ -0,0 +1,239 @@
+"""Plan a whole game night: split players into tables and pick their games."""
+
+import math
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from itertools import combinations
+
+import numpy as np
+from numpy.typing import NDArray
+
+from boardgame_night.models import Game, Player
+from boardgame_night.services.collection import GameCollection, bit_mask
+from boardgame_night.services.recommendations import RecommendationService
+
+
+@dataclass(frozen=True, slots=True)
+class Table:
+    """One table of the evening and the games it plays, in order."""
+
+    players: frozenset[Player]
+    games: tuple[Game, ...]
+    minutes: int
+    score: float
+
+
+@dataclass(frozen=True, slots=True)
+class Schedule:
+    """A planned game night."""
+
+    tables: tuple[Table, ...]
+
+    @property
+    def score(self) -> float:
+        """Total preference score of all tables."""
+        return sum(table.score for table in self.tables)
+
+
+def expected_minutes(game: Game) -> int:
+    """Planned duration of a game: the middle of its playtime range."""
+    return math.ceil((game.min_playtime + game.max_playtime) / 2)
+
+
+class GameNightScheduler:
+    """Split attendees into tables and give each table a sequence of games.
+
+    A game played at a table is worth the sum of its players' preference
+    scores (as computed by `RecommendationService`) times its planned
+    duration in hours. Each table gets the set of games with the highest
+    total value that fits the time budget and supports the table size,
+    found with a 0/1 knapsack DP. Each game has one copy, so a game is
+    played at no more than one table.
+
+    Groups of up to `exact_limit` players are split by branch and bound
+    over all partitions into tables of `min_table_size` to
+    `max_table_size`. The best knapsack value of each table, computed
+    without the one-copy rule, is memoised per set of players and bounds
+    every partition from above. Partitions are evaluated best bound first
+    with the one-copy rule applied, and the search stops once no
+    remaining bound can beat the best schedule found so far.
+
+    Larger groups use a greedy fallback. Players are dealt into tables of
+    about `table_size`: each player joins the open table whose favourite
+    categories overlap theirs the most. Tables then pick games in turn.
+    """
+
+    def __init__(
+        self,
+        collection: GameCollection,
+        time_step: int = 5,
+        table_size: int = 4,
+        min_table_size: int = 2,
+        max_table_size: int = 6,
+        exact_limit: int = 8,
+    ) -> None:
+        self.collection = collection
+        self.time_step = time_step
+        self.table_size = table_size
+        self.min_table_size = min_table_size
+        self.max_table_size = max_table_size
+        self.exact_limit = exact_limit
+        self._recommendations = RecommendationService(collection)
+        self._version = -1
+        self._games: list[Game | None] = []
+        self._hours: NDArray[np.float64] = np.empty(0)
+        self._weights: NDArray[np.intp] = np.empty(0, dtype=np.intp)
+        self._values: dict[frozenset[Player], NDArray[np.float64]] = {}
+        self._bounds: dict[tuple[frozenset[Player], int], float] = {}
+
+    def schedule(self, players: Sequence[Player], available_time: int) -> Schedule:
+        """Plan an evening.
+
+        Args:
+            players: Attendees
+            available_time: Length of the evening in minutes
+
+        Returns:
+            Tables with their games; empty if there are fewer than
+            `min_table_size` players
+        """
+        self._refresh()
+        capacity = available_time // self.time_step
+        unique = list(dict.fromkeys(players))
+        if len(unique) < self.min_table_size:
+            return Schedule(())
+        if len(unique) <= self.exact_limit:
+            groups = self._best_partition(unique, capacity)
+        else:
+            groups = self._greedy_partition(unique)
+        return self._assign(groups, capacity)
+
+    def _refresh(self) -> None:
+        """Drop memoised table values after the collection changed."""
+        if self._version == self.collection.version:
+            return
+        self._games = self.collection.game_slots()
+        minutes = np.array(
+            [expected_minutes(game) if game else 0 for game in self._games],
+            dtype=np.intp,
+        )
+        self._hours = minutes / 60
+        self._weights = -(-minutes // self.time_step)  # whole time steps
+        self._values.clear()
+        self._bounds.clear()
+        self._version = self.collection.version
+
+    def _table_values(self, group: frozenset[Player]) -> NDArray[np.float64]:
+        """Value of every game slot for a table; 0 where it cannot be played."""
+        values = self._values.get(group)
+        if values is None:
+            bits = self.collection.match(player_count=len(group))
+            playable = bit_mask(bits, len(self._games))
+            scores = self._recommendations.group_scores(group) * len(group)
+            values = np.where(playable, scores * self._hours, 0.0)
+            self._values[group] = values
+        return values
+
+    def _knapsack(
+        self, values: NDArray[np.float64], capacity: int
+    ) -> tuple[float, list[int]]:
+        """Best total value within `capacity` steps and the slots achieving it."""
+        weights = self._weights
+        candidates = np.flatnonzero((values > 0) & (weights <= capacity))
+        best = np.zeros(capacity + 1)
+        taken = np.zeros((len(candidates), capacity + 1), dtype=bool)
+        for row, slot in enumerate(candidates):
+            weight = weights[slot]
+            with_item = best[: capacity + 1 - weight] + values[slot]
+            improved = with_item > best[weight:]
+            taken[row, weight:] = improved
+            best[weight:] = np.where(improved, with_item, best[weight:])
+
+        chosen: list[int] = []
+        remaining = capacity
+        for row in range(len(candidates) - 1, -1, -1):
+            if taken[row, remaining]:
+                chosen.append(int(candidates[row]))
+                remaining -= int(weights[candidates[row]])
+        return float(best[capacity]), chosen
+
+    def _bound(self, group: frozenset[Player], capacity: int) -> float:
+        """Best value of a table on its own, ignoring the other tables."""
+        key = (group, capacity)
+        bound = self._bounds.get(key)
+        if bound is None:
+            bound = self._knapsack(self._table_values(group), capacity)[0]
+            self._bounds[key] = bound
+        return bound
+
+    def _partitions(self, players: list[Player]) -> Iterator[list[frozenset[Player]]]:
+        """All splits into tables of allowed sizes."""
+        if not players:
+            yield []
+            return
+        first, rest = players[0], players[1:]
+        for size in range(self.min_table_size, self.max_table_size + 1):
+            for companions in combinations(rest, size - 1):
+                table = frozenset((first, *companions))
+                others = [player for player in rest if player not in table]
+                for tail in self._partitions(others):
+                    yield [table, *tail]
+
+    def _best_partition(
+        self, players: list[Player], capacity: int
+    ) -> list[frozenset[Player]]:
+        bounded = sorted(
+            (
+                (sum(self._bound(table, capacity) for table in tables), tables)
+                for tables in self._partitions(players)
+            ),
+            key=lambda item: -item[0],
+        )
+        best_score = -1.0
+        best_tables: list[frozenset[Player]] = []
+        for bound, tables in bounded:
+            if bound <= best_score:
+                break  # no remaining partition can do better
+            score = self._assign(tables, capacity).score
+            if score > best_score:
+                best_score, best_tables = score, tables
+        return best_tables
+
+    def _greedy_partition(self, players: list[Player]) -> list[frozenset[Player]]:
+        count = max(1, round(len(players) / self.table_size))
+        sizes = [len(players) // count] * count
+        for i in range(len(players) % count):
+            sizes[i] += 1
+
+        tables: list[list[Player]] = [[] for _ in range(count)]
+        tastes: list[set[str]] = [set() for _ in range(count)]
+        # Players with the most specific taste choose first.
+        for player in sorted(players, key=lambda p: -len(p.favorite_categories)):
+            favorites = player.favorite_categories
+            index = max(
+                (i for i in range(count) if len(tables[i]) < sizes[i]),
+                key=lambda i: (len(tastes[i] & favorites), -len(tables[i])),
+            )
+            tables[index].append(player)
+            tastes[index] |= favorites
+        return [frozenset(table) for table in tables]
+
+    def _assign(self, groups: list[frozenset[Player]], capacity: int) -> Schedule:
+        """Pick games table by table, most promising tables first."""
+        used = np.zeros(len(self._games), dtype=bool)
+        tables = []
+        for group in sorted(groups, key=lambda g: -self._bound(g, capacity)):
+            values = np.where(used, 0.0, self._table_values(group))
+            score, slots = self._knapsack(values, capacity)
+            used[slots] = True
+            chosen = [game for slot in slots if (game := self._games[slot])]
+            chosen.sort(key=lambda game: (-expected_minutes(game), game.name))
+            tables.append(
+                Table(
+                    players=group,
+                    games=tuple(chosen),
+                    minutes=sum(expected_minutes(game) for game in chosen),
+                    score=score,
+                )
+            )
+        return Schedule(tuple(tables))
@@ -1,7 +1,14 @@
 """Pytest configuration and shared fixtures."""
 
+import random
+from collections.abc import Callable
+
 import pytest
 
+from boardgame_night.models import Game, Player
+
+CATEGORIES = [f"Category {i}" for i in range(40)]
+
 
 @pytest.fixture
 def sample_game_data() -> dict[str, object]:
@@ -14,3 +21,98 @@ def sample_game_data() -> dict[str, object]:
         "max_playtime": 120,
         "complexity": 2.3,
     }
+
+
+@pytest.fixture
+def sample_game() -> Game:
+    """A valid sample game."""
+    return Game(
+        name="Catan",
+        min_players=3,
+        max_players=4,
+        min_playtime=60,
+        max_playtime=120,
+        complexity=2.3,
+        categories=frozenset({"Negotiation", "Economic"}),
+        mechanics=frozenset({"Dice Rolling", "Trading"}),
+    )
+
+
+@pytest.fixture
+def sample_players() -> list[Player]:
+    """Four players with distinct IDs."""
+    return [
+        Player(name=name, id=name.lower()) for name in ("Alice", "Bob", "Carol", "Dave")
+    ]
+
+
+@pytest.fixture
+def categories() -> list[str]:
+    """Category names used by the random games and players."""
+    return list(CATEGORIES)
+
+
+@pytest.fixture
+def make_game() -> Callable[..., Game]:
+    """Factory for valid games; keyword arguments override the defaults."""
+
+    def make(name: str = "Test", **overrides: object) -> Game:
+        data: dict[str, object] = {
+            "name": name,
+            "min_players": 2,
+            "max_players": 4,
+            "min_playtime": 30,
+            "max_playtime": 60,
+            "complexity": 2.0,
+        }
+        data.update(overrides)
+        return Game(**data)  # type: ignore[arg-type]
+
+    return make
+
+
+@pytest.fixture
+def random_games() -> Callable[..., list[Game]]:
+    """Factory for reproducible random catalogs with distinct complexities."""
+
+    def make(count: int, seed: int = 0) -> list[Game]:
+        rng = random.Random(seed)
+        games = []
+        for i in range(count):
+            min_players = rng.randint(1, 5)
+            min_playtime = rng.choice([10, 15, 20, 30, 45, 60, 90, 120, 180, 240])
+            games.append(
+                Game(
+                    name=f"Game {i:06d}",
+                    min_players=min_players,
+                    max_players=min_players + rng.randint(0, 6),
+                    min_playtime=min_playtime,
+                    max_playtime=min_playtime + rng.randint(0, 60),
+                    complexity=rng.uniform(1.0, 5.0),
+                    categories=frozenset(rng.sample(CATEGORIES, rng.randint(0, 3))),
+                )
+            )
+        return games
+
+    return make
+
+
+@pytest.fixture
+def random_players() -> Callable[..., list[Player]]:
+    """Factory for reproducible random players."""
+
+    def make(count: int, seed: int = 0) -> list[Player]:
+        rng = random.Random(seed)
+        players = []
+        for i in range(count):
+            low = round(rng.uniform(1.0, 4.0), 1)
+            players.append(
+                Player(
+                    name=f"Player {i}",
+                    favorite_categories=frozenset(rng.sample(CATEGORIES, 3)),
+                    complexity_preference=(low, round(rng.uniform(low, 5.0), 1)),
+                )
+            )
+        return players
+
+    return make
@@ -0,0 +1,71 @@
+"""Tests for the Game model."""
+
+import dataclasses
+
+import pytest
+
+from boardgame_night.models import Game
+
+
+def test_create_game_with_valid_data(sample_game_data):
+    game = Game(**sample_game_data)
+    assert game.name == "Catan"
+    assert game.min_players == 3
+    assert game.max_players == 4
+    assert game.categories == frozenset()
+    assert game.mechanics == frozenset()
+
+
+def test_game_is_immutable(sample_game):
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        sample_game.name = "Other"
+
+
+@pytest.mark.parametrize("name", ["", "   "])
+def test_create_game_with_empty_name_raises_error(make_game, name):
+    with pytest.raises(ValueError, match="name"):
+        make_game(name=name)
+
+
+def test_create_game_with_zero_min_players_raises_error(make_game):
+    with pytest.raises(ValueError, match="player"):
+        make_game(min_players=0)
+
+
+def test_create_game_with_invalid_player_range_raises_error(make_game):
+    with pytest.raises(ValueError, match="player"):
+        make_game(min_players=5, max_players=2)
+
+
+def test_create_game_with_invalid_playtime_range_raises_error(make_game):
+    with pytest.raises(ValueError, match="playtime"):
+        make_game(min_playtime=60, max_playtime=30)
+
+
+@pytest.mark.parametrize("complexity", [0.9, 5.1, 6.0])
+def test_create_game_with_invalid_complexity_raises_error(make_game, complexity):
+    with pytest.raises(ValueError, match="complexity"):
+        make_game(complexity=complexity)
+
+
+@pytest.mark.parametrize("complexity", [1.0, 5.0])
+def test_create_game_with_boundary_complexity(make_game, complexity):
+    assert make_game(complexity=complexity).complexity == complexity
+
+
+def test_supports_player_count_within_range(make_game):
+    assert make_game(min_players=2, max_players=4).supports_player_count(3) is True
+
+
+def test_supports_player_count_outside_range(make_game):
+    game = make_game(min_players=2, max_players=4)
+    assert game.supports_player_count(5) is False
+    assert game.supports_player_count(1) is False
+
+
+def test_fits_time_slot_with_sufficient_time(make_game):
+    assert make_game(min_playtime=30, max_playtime=60).fits_time_slot(45) is True
+
+
+def test_fits_time_slot_with_insufficient_time(make_game):
+    assert make_game(min_playtime=60, max_playtime=120).fits_time_slot(30) is False
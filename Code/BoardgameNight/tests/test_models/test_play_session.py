@@ -0,0 +1,74 @@
+"""Tests for the PlaySession model."""
+
+from datetime import datetime
+
+import pytest
+
+from boardgame_night.models import Game, Player, PlaySession
+
+
+def test_create_play_session_with_valid_data(sample_game, sample_players):
+    session = PlaySession(
+        game=sample_game,
+        players=frozenset(sample_players[:3]),
+        date=datetime.now(),
+    )
+    assert session.game == sample_game
+    assert len(session.players) == 3
+    assert session.id
+    assert session.winner is None
+    assert session.notes == ""
+
+
+def test_create_play_session_with_too_few_players_raises_error(sample_players):
+    game = Game(
+        name="Test",
+        min_players=3,
+        max_players=4,
+        min_playtime=30,
+        max_playtime=60,
+        complexity=2.0,
+    )
+    with pytest.raises(ValueError, match="player"):
+        PlaySession(
+            game=game, players=frozenset(sample_players[:2]), date=datetime.now()
+        )
+
+
+def test_create_play_session_with_too_many_players_raises_error(sample_players):
+    game = Game(
+        name="Duel",
+        min_players=2,
+        max_players=2,
+        min_playtime=30,
+        max_playtime=60,
+        complexity=2.0,
+    )
+    with pytest.raises(ValueError, match="player"):
+        PlaySession(
+            game=game, players=frozenset(sample_players[:3]), date=datetime.now()
+        )
+
+
+def test_create_play_session_with_invalid_winner_raises_error(
+    sample_game, sample_players
+):
+    with pytest.raises(ValueError, match="winner"):
+        PlaySession(
+            game=sample_game,
+            players=frozenset(sample_players[:3]),
+            date=datetime.now(),
+            winner=Player(name="Outsider"),
+        )
+
+
+def test_create_play_session_with_non_positive_duration_raises_error(
+    sample_game, sample_players
+):
+    with pytest.raises(ValueError, match="duration"):
+        PlaySession(
+            game=sample_game,
+            players=frozenset(sample_players[:3]),
+            date=datetime.now(),
+            duration_minutes=0,
+        )
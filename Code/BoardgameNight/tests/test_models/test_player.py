@@ -0,0 +1,37 @@
+"""Tests for the Player model."""
+
+import pytest
+
+from boardgame_night.models import Player
+
+
+def test_create_player_with_valid_data():
+    player = Player(name="Alice")
+    assert player.name == "Alice"
+    assert player.id is not None
+    assert player.complexity_preference == (1.0, 5.0)
+
+
+def test_create_players_get_distinct_ids():
+    assert Player(name="Alice").id != Player(name="Alice").id
+
+
+def test_create_player_with_custom_id():
+    player = Player(name="Bob", id="bob-123")
+    assert player.id == "bob-123"
+
+
+def test_create_player_with_empty_name_raises_error():
+    with pytest.raises(ValueError, match="name"):
+        Player(name="")
+
+
+def test_create_player_with_invalid_complexity_range_raises_error():
+    with pytest.raises(ValueError, match="complexity"):
+        Player(name="Test", complexity_preference=(4.0, 2.0))
+
+
+@pytest.mark.parametrize("preference", [(0.5, 2.0), (2.0, 5.5)])
+def test_create_player_with_complexity_out_of_bounds_raises_error(preference):
+    with pytest.raises(ValueError, match="complexity"):
+        Player(name="Test", complexity_preference=preference)
@@ -0,0 +1,214 @@
+"""Tests for the GameCollection service."""
+
+import random
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import pytest
+
+from boardgame_night.models import Game
+from boardgame_night.services import GameCollection
+from boardgame_night.services.collection import bit_positions
+
+
+def brute_force(
+    games: list[Game],
+    player_count: int | None = None,
+    max_playtime: int | None = None,
+    max_complexity: float | None = None,
+    categories: set[str] | None = None,
+) -> list[Game]:
+    return sorted(
+        (
+            game
+            for game in games
+            if (player_count is None or game.supports_player_count(player_count))
+            and (max_playtime is None or game.fits_time_slot(max_playtime))
+            and (max_complexity is None or game.complexity <= max_complexity)
+            and (categories is None or game.categories & categories)
+        ),
+        key=lambda game: game.name,
+    )
+
+
+def test_add_and_get_game(sample_game):
+    collection = GameCollection()
+    collection.add_game(sample_game)
+    assert collection.get_game("Catan") == sample_game
+    assert "Catan" in collection
+    assert len(collection) == 1
+
+
+def test_get_unknown_game_returns_none():
+    assert GameCollection().get_game("Unknown") is None
+
+
+def test_remove_existing_game_returns_true(sample_game):
+    collection = GameCollection([sample_game])
+    assert collection.remove_game("Catan") is True
+    assert collection.get_game("Catan") is None
+    assert collection.find_games(player_count=3) == []
+
+
+def test_remove_nonexistent_game_returns_false():
+    assert GameCollection().remove_game("Unknown") is False
+
+
+def test_add_game_with_same_name_replaces_it(make_game):
+    collection = GameCollection([make_game("Azul", max_players=4)])
+    collection.add_game(make_game("Azul", max_players=2))
+    assert len(collection) == 1
+    assert collection.find_games(player_count=4) == []
+    assert [game.max_players for game in collection.find_games(player_count=2)] == [2]
+
+
+def test_list_games_sorted_by_name(make_game):
+    collection = GameCollection([make_game("Wingspan"), make_game("Azul")])
+    assert [game.name for game in collection.list_games()] == ["Azul", "Wingspan"]
+
+
+def test_find_games_filters_by_player_count(make_game):
+    collection = GameCollection(
+        [
+            make_game("TwoPlayer", min_players=2, max_players=2),
+            make_game("FourPlayer", min_players=3, max_players=4),
+        ]
+    )
+    results = collection.find_games(player_count=2)
+    assert len(results) == 1
+    assert results[0].name == "TwoPlayer"
+
+
+def test_find_games_filters_by_multiple_criteria(make_game):
+    collection = GameCollection(
+        [
+            make_game("Quick", max_players=4, min_playtime=20, max_playtime=40),
+            make_game("Long", max_players=4, min_playtime=90, max_playtime=120),
+            make_game("Small", max_players=3, min_playtime=20, max_playtime=30),
+            make_game("Heavy", max_players=5, complexity=4.5),
+        ]
+    )
+    results = collection.find_games(player_count=4, max_playtime=60)
+    assert [game.name for game in results] == ["Heavy", "Quick"]
+    results = collection.find_games(player_count=4, max_playtime=60, max_complexity=3.0)
+    assert [game.name for game in results] == ["Quick"]
+
+
+def test_find_games_matches_any_category(make_game):
+    collection = GameCollection(
+        [
+            make_game("Coop", categories=frozenset({"Cooperative"})),
+            make_game("War", categories=frozenset({"Wargame"})),
+            make_game("Party", categories=frozenset({"Party"})),
+        ]
+    )
+    results = collection.find_games(categories={"Cooperative", "Party"})
+    assert [game.name for game in results] == ["Coop", "Party"]
+    assert collection.find_games(categories={"Unknown"}) == []
+
+
+def test_find_games_without_criteria_returns_all(random_games):
+    games = random_games(50)
+    assert GameCollection(games).find_games() == sorted(games, key=lambda g: g.name)
+
+
+def test_find_games_matches_brute_force_after_changes(
+    make_game, random_games, categories
+):
+    rng = random.Random(1)
+    games = random_games(2000)
+    collection = GameCollection(games)
+    for game in rng.sample(games, 500):
+        collection.remove_game(game.name)
+        games.remove(game)
+    extra = random_games(300, seed=2)
+    extra = [
+        make_game(f"Extra {i}", categories=g.categories) for i, g in enumerate(extra)
+    ]
+    for game in extra:
+        collection.add_game(game)
+    games.extend(extra)
+
+    for _ in range(200):
+        criteria = {
+            "player_count": rng.choice([None, 1, 2, 3, 4, 6, 9]),
+            "max_playtime": rng.choice([None, 15, 30, 60, 120]),
+            "max_complexity": rng.choice([None, 1.5, 2.5, 4.0]),
+            "categories": rng.choice([None, set(rng.sample(categories, 2))]),
+        }
+        assert collection.find_games(**criteria) == brute_force(games, **criteria)
+
+
+def test_queries_see_changes_between_them(random_games):
+    rng = random.Random(3)
+    games = random_games(300)
+    collection = GameCollection(games[:150])
+    current = games[:150]
+    for game in games[150:]:
+        collection.add_game(game)
+        current.append(game)
+        if rng.random() < 0.3:
+            removed = current.pop(rng.randrange(len(current)))
+            collection.remove_game(removed.name)
+        threshold = rng.uniform(1.0, 5.0)
+        assert collection.find_games(max_complexity=threshold) == brute_force(
+            current, max_complexity=threshold
+        )
+
+
+def test_bit_positions():
+    assert bit_positions(0) == []
+    assert bit_positions(0b1011) == [0, 1, 3]
+    assert bit_positions(1 << 200 | 1 << 64 | 1 << 63) == [63, 64, 200]
+
+
+def median_seconds(func: Callable[[], object], repeat: int = 21) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[repeat // 2]
+
+
+@pytest.mark.slow
+def test_first_query_on_continuous_values_is_cheap(random_games):
+    # Every game has a distinct complexity, as in real catalog weights.
+    collection = GameCollection(random_games(150_000))
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        collection.match(max_complexity=2.5)
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert seconds < 0.2
+    assert peak < 20_000_000
+
+
+@pytest.mark.slow
+def test_find_games_on_large_catalog_is_fast(random_games):
+    collection = GameCollection(random_games(150_000))
+    selective = [
+        {
+            "player_count": 4,
+            "max_playtime": 60,
+            "max_complexity": 2.5,
+            "categories": {"Category 1"},
+        },
+        {
+            "player_count": 2,
+            "max_playtime": 30,
+            "max_complexity": 1.5,
+            "categories": {"Category 3", "Category 7"},
+        },
+    ]
+    broad = [{"player_count": 4}, {"max_playtime": 45, "categories": {"Category 12"}}]
+    for query in selective + broad:
+        collection.find_games(**query)  # build the lazy range unions
+        # The index intersection itself is independent of the result size.
+        assert median_seconds(lambda q=query: collection.match(**q)) < 0.0002
+    for query in selective:
+        assert median_seconds(lambda q=query: collection.find_games(**q)) < 0.001
@@ -0,0 +1,187 @@
+"""Tests for the SessionHistory store."""
+
+import random
+import sqlite3
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from boardgame_night.models import Game, Player, PlaySession
+from boardgame_night.services import SessionHistory
+
+START = datetime(2020, 1, 1, 19, 30)
+
+
+def make_games(count: int) -> list[Game]:
+    return [
+        Game(
+            name=f"Game {i:03d}",
+            min_players=2,
+            max_players=6,
+            min_playtime=30,
+            max_playtime=90,
+            complexity=2.5,
+        )
+        for i in range(count)
+    ]
+
+
+def random_sessions(
+    count: int, games: list[Game], players: list[Player], seed: int = 0
+) -> list[PlaySession]:
+    rng = random.Random(seed)
+    sessions = []
+    for _ in range(count):
+        table = rng.sample(players, rng.randint(2, 6))
+        sessions.append(
+            PlaySession(
+                game=rng.choice(games),
+                players=frozenset(table),
+                date=START + timedelta(days=rng.randrange(4 * 365)),
+                winner=rng.choice(table) if rng.random() < 0.8 else None,
+            )
+        )
+    return sessions
+
+
+def rollups(history: SessionHistory) -> tuple[object, ...]:
+    return (
+        history.plays_per_game(),
+        history.plays_per_player(),
+        history.plays_per_month(),
+        history.win_rates(),
+    )
+
+
+@pytest.fixture
+def history():
+    store = SessionHistory()
+    yield store
+    store.close()
+
+
+def test_add_session_updates_rollups(history, sample_game, sample_players):
+    alice, bob, carol, _ = sample_players
+    history.add_session(
+        PlaySession(
+            game=sample_game,
+            players=frozenset({alice, bob, carol}),
+            date=datetime(2024, 3, 1, 20, 0),
+            winner=alice,
+        )
+    )
+    history.add_session(
+        PlaySession(
+            game=sample_game,
+            players=frozenset({alice, bob, carol}),
+            date=datetime(2024, 4, 5, 20, 0),
+        )
+    )
+    assert history.session_count() == 2
+    assert history.plays_per_game() == {"Catan": 2}
+    assert history.plays_per_player() == {"alice": 2, "bob": 2, "carol": 2}
+    assert history.plays_per_month() == {"2024-03": 1, "2024-04": 1}
+    assert history.win_rates() == {"alice": 1.0, "bob": 0.0, "carol": 0.0}
+    assert history.last_played("Catan") == datetime(2024, 4, 5, 20, 0)
+    assert history.last_played("Unknown") is None
+
+
+def test_plays_per_month_in_range(history):
+    games = make_games(3)
+    players = [Player(name=f"P{i}") for i in range(6)]
+    sessions = random_sessions(500, games, players)
+    history.add_sessions(sessions)
+
+    counts = Counter(session.date.strftime("%Y-%m") for session in sessions)
+    expected = {
+        month: n for month, n in counts.items() if "2021-02" <= month <= "2021-06"
+    }
+    result = history.plays_per_month(date(2021, 2, 14), date(2021, 6, 1))
+    assert result == expected
+    assert list(result) == sorted(expected)
+
+
+def test_not_played_since(history, sample_players):
+    old, recent, never = make_games(3)
+    now = datetime(2024, 6, 1)
+    for game, days_ago in ((old, 100), (old, 45), (recent, 5)):
+        history.add_session(
+            PlaySession(
+                game=game,
+                players=frozenset(sample_players[:2]),
+                date=now - timedelta(days=days_ago),
+            )
+        )
+    assert history.not_played_since(30, now=now) == [old.name]
+    assert history.not_played_since(60, now=now) == []
+    names = [game.name for game in (old, recent, never)]
+    assert history.not_played_since(30, now=now, game_names=names) == [
+        old.name,
+        never.name,
+    ]
+
+
+def test_incremental_rollups_match_rebuild(history):
+    games = make_games(20)
+    players = [Player(name=f"Player {i}") for i in range(15)]
+    sessions = random_sessions(2000, games, players)
+    for start in range(0, len(sessions), 137):
+        history.add_sessions(sessions[start : start + 137])
+    incremental = rollups(history)
+
+    history.rebuild_rollups()
+    assert rollups(history) == incremental
+
+    wins = Counter(s.winner.id for s in sessions if s.winner)
+    decided = Counter(p.id for s in sessions if s.winner for p in s.players)
+    assert incremental[3] == {pid: wins[pid] / n for pid, n in decided.items()}
+
+
+def test_failed_rebuild_keeps_rollups(history):
+    games = make_games(5)
+    players = [Player(name=f"Player {i}") for i in range(6)]
+    history.add_sessions(random_sessions(100, games, players))
+    before = rollups(history)
+    history._db.execute(
+        "CREATE TEMP TRIGGER fail BEFORE INSERT ON player_stats "
+        "BEGIN SELECT RAISE(ABORT, 'rebuild failed'); END"
+    )
+
+    with pytest.raises(sqlite3.IntegrityError):
+        history.rebuild_rollups()
+    assert rollups(history) == before
+
+
+def test_history_persists_to_file(tmp_path, sample_game, sample_players):
+    path = str(tmp_path / "history.sqlite")
+    store = SessionHistory(path)
+    store.add_session(
+        PlaySession(
+            game=sample_game,
+            players=frozenset(sample_players[:3]),
+            date=datetime(2024, 1, 1),
+        )
+    )
+    store.close()
+
+    reopened = SessionHistory(path)
+    assert reopened.plays_per_game() == {"Catan": 1}
+    reopened.close()
+
+
+@pytest.mark.slow
+def test_statistics_do_not_rescan_long_history(history):
+    games = make_games(300)
+    players = [Player(name=f"Member {i}") for i in range(60)]
+    sessions = random_sessions(100_000, games, players)
+    start = time.perf_counter()
+    history.add_sessions(sessions)
+    elapsed = time.perf_counter() - start
+    assert len(sessions) / elapsed > 20_000  # sessions per second
+
+    start = time.perf_counter()
+    rollups(history)
+    history.not_played_since(30, now=START + timedelta(days=4 * 365))
+    assert time.perf_counter() - start < 0.01
@@ -0,0 +1,276 @@
+"""Tests for the CatalogImporter."""
+
+import resource
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from boardgame_night.models import Game
+from boardgame_night.services import CatalogImporter
+from boardgame_night.services.importer import CSV_COLUMNS, RejectedRecord
+
+CATEGORIES = ["Economic", "Fantasy", "Negotiation", "Party", "Wargame"]
+MECHANICS = ["Dice Rolling", "Hand Management", "Trading", "Worker Placement"]
+
+
+def csv_line(i: int) -> str:
+    categories = f"{CATEGORIES[i % 5]},{CATEGORIES[(i + 2) % 5]}"
+    return (
+        f"Game {i},{1 + i % 3},{4 + i % 3},{15 * (1 + i % 4)},{15 * (2 + i % 4)},"
+        f'{1 + i % 41 / 10},"{categories}",{MECHANICS[i % 4]}\n'
+    )
+
+
+def xml_item(i: int) -> str:
+    return (
+        f'<item type="boardgame" id="{i}">'
+        f'<name type="alternate" value="Spiel {i}"/>'
+        f'<name type="primary" sortindex="1" value="Game {i}"/>'
+        f'<minplayers value="{1 + i % 3}"/><maxplayers value="{4 + i % 3}"/>'
+        f'<minplaytime value="{15 * (1 + i % 4)}"/>'
+        f'<maxplaytime value="{15 * (2 + i % 4)}"/>'
+        f'<link type="boardgamecategory" id="1" value="{CATEGORIES[i % 5]}"/>'
+        f'<link type="boardgamecategory" id="2" value="{CATEGORIES[(i + 2) % 5]}"/>'
+        f'<link type="boardgamemechanic" id="3" value="{MECHANICS[i % 4]}"/>'
+        f'<link type="boardgamedesigner" id="4" value="Someone"/>'
+        f'<statistics><ratings><averageweight value="{1 + i % 41 / 10}"/>'
+        f"</ratings></statistics></item>\n"
+    )
+
+
+def expected_game(i: int) -> Game:
+    return Game(
+        name=f"Game {i}",
+        min_players=1 + i % 3,
+        max_players=4 + i % 3,
+        min_playtime=15 * (1 + i % 4),
+        max_playtime=15 * (2 + i % 4),
+        complexity=1 + i % 41 / 10,
+        categories=frozenset({CATEGORIES[i % 5], CATEGORIES[(i + 2) % 5]}),
+        mechanics=frozenset({MECHANICS[i % 4]}),
+    )
+
+
+def write_csv(path: Path, count: int) -> Path:
+    with path.open("w") as f:
+        f.write(",".join(CSV_COLUMNS) + "\n")
+        f.writelines(csv_line(i) for i in range(count))
+    return path
+
+
+def write_xml(path: Path, count: int) -> Path:
+    with path.open("w") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<items total="0">\n')
+        f.writelines(xml_item(i) for i in range(count))
+        f.write("</items>\n")
+    return path
+
+
+@pytest.fixture(params=["csv", "xml"])
+def write_catalog(request: pytest.FixtureRequest) -> Callable[[Path, int], Path]:
+    """Writer for a catalog dump in each supported format."""
+    return write_csv if request.param == "csv" else write_xml
+
+
+def catalog_path(tmp_path: Path, writer: Callable[[Path, int], Path]) -> Path:
+    return tmp_path / ("catalog.csv" if writer is write_csv else "catalog.xml")
+
+
+def test_imports_all_games_in_order(
+    tmp_path: Path, write_catalog: Callable[[Path, int], Path]
+) -> None:
+    path = write_catalog(catalog_path(tmp_path, write_catalog), 200)
+    importer = CatalogImporter(workers=1)
+
+    assert importer.load(path) == [expected_game(i) for i in range(200)]
+    assert importer.rejected == []
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_small_chunks_give_the_same_games(
+    tmp_path: Path, write_catalog: Callable[[Path, int], Path], workers: int
+) -> None:
+    path = write_catalog(catalog_path(tmp_path, write_catalog), 500)
+
+    games = CatalogImporter(workers=workers, chunk_size=1000).load(path)
+
+    assert games == [expected_game(i) for i in range(500)]
+
+
+def test_shares_interned_category_sets(tmp_path: Path) -> None:
+    path = write_csv(tmp_path / "catalog.csv", 100)
+
+    games = CatalogImporter(workers=1).load(path)
+
+    same_categories = [game for game in games if game.categories == games[0].categories]
+    assert len(same_categories) == 20
+    assert all(game.categories is games[0].categories for game in same_categories)
+    assert all(game.mechanics is games[0].mechanics for game in games[::4])
+    for category in games[0].categories:
+        assert category is sys.intern(category)
+
+
+def test_rejects_invalid_csv_rows(tmp_path: Path) -> None:
+    good = csv_line(0)
+    lines = [
+        good,
+        "Too Few,2,4\n",
+        "Bad Number,two,4,30,60,2.0,,\n",
+        ",2,4,30,60,2.0,,\n",
+        "Crowd,5,4,30,60,2.0,,\n",
+        "Heavy,2,4,30,60,5.5,,\n",
+        "Unrated,2,4,30,60,nan,,\n",
+        good,
+    ]
+    path = tmp_path / "catalog.csv"
+    path.write_text("".join(lines))
+    offsets = [sum(len(line) for line in lines[:i]) for i in range(len(lines))]
+
+    importer = CatalogImporter(workers=1)
+    games = importer.load(path)
+
+    assert games == [expected_game(0), expected_game(0)]
+    assert sorted(importer.rejected, key=lambda record: record.offset) == [
+        RejectedRecord(offsets[1], "malformed row"),
+        RejectedRecord(offsets[2], "malformed row"),
+        RejectedRecord(offsets[3], "empty name"),
+        RejectedRecord(offsets[4], "max_players below min_players"),
+        RejectedRecord(offsets[5], "complexity out of range"),
+        RejectedRecord(offsets[6], "complexity out of range"),
+    ]
+
+
+def test_rejects_invalid_xml_items(tmp_path: Path) -> None:
+    path = tmp_path / "catalog.xml"
+    broken = xml_item(1).replace('<minplayers value="2"/>', "")
+    short = xml_item(2).replace('<minplaytime value="45"/>', '<minplaytime value="0"/>')
+    path.write_text(
+        '<?xml version="1.0"?>\n<items>\n' + xml_item(0) + broken + short + "</items>"
+    )
+    content = path.read_bytes()
+
+    importer = CatalogImporter(workers=1)
+
+    assert importer.load(path) == [expected_game(0)]
+    assert importer.rejected == [
+        RejectedRecord(
+            content.index(b'<item type="boardgame" id="1"'), "malformed item"
+        ),
+        RejectedRecord(
+            content.index(b'<item type="boardgame" id="2"'), "min_playtime below 1"
+        ),
+    ]
+
+
+def test_rejects_only_the_broken_xml_item(tmp_path: Path) -> None:
+    path = tmp_path / "catalog.xml"
+    broken = xml_item(1).replace('value="Game 1"', 'value="Games & Puzzles"')
+    path.write_text(
+        '<?xml version="1.0"?>\n<items>\n'
+        + xml_item(0)
+        + broken
+        + xml_item(2)
+        + "</items>"
+    )
+    content = path.read_bytes()
+
+    importer = CatalogImporter(workers=1)
+
+    assert importer.load(path) == [expected_game(0), expected_game(2)]
+    assert importer.rejected == [
+        RejectedRecord(
+            content.index(b'<item type="boardgame" id="1"'), "malformed item"
+        )
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [100, 1000, 1 << 20])
+def test_item_tags_in_comments_and_cdata_are_not_records(
+    tmp_path: Path, chunk_size: int
+) -> None:
+    path = tmp_path / "catalog.xml"
+    items = [
+        xml_item(i).replace(
+            "<statistics>",
+            '<description><![CDATA[<item id="x">]]></description><statistics>',
+        )
+        for i in range(20)
+    ]
+    path.write_text(
+        '<?xml version="1.0"?>\n<!-- one <item> per game -->\n<items>\n'
+        + "<!-- <item> -->\n".join(items)
+        + "</items>"
+    )
+
+    importer = CatalogImporter(workers=1, chunk_size=chunk_size)
+
+    assert importer.load(path) == [expected_game(i) for i in range(20)]
+    assert importer.rejected == []
+
+
+@pytest.mark.parametrize("chunk_size", [50, 1000])
+def test_quoted_csv_fields_may_span_lines(tmp_path: Path, chunk_size: int) -> None:
+    lines = [",".join(CSV_COLUMNS) + "\n"] + [
+        csv_line(i).replace(f",{MECHANICS[i % 4]}", f',"{MECHANICS[i % 4]},\n"')
+        for i in range(20)
+    ]
+    offsets = [sum(len(line) for line in lines[:i]) for i in range(len(lines))]
+    lines.insert(6, 'Bad Row,"two\nlines",4,30,60,2.0,,\n')
+    path = tmp_path / "catalog.csv"
+    path.write_text("".join(lines))
+
+    importer = CatalogImporter(workers=1, chunk_size=chunk_size)
+
+    assert importer.load(path) == [expected_game(i) for i in range(20)]
+    assert importer.rejected == [RejectedRecord(offsets[6], "malformed row")]
+
+
+def test_empty_catalog(tmp_path: Path) -> None:
+    path = tmp_path / "catalog.csv"
+    path.write_text(",".join(CSV_COLUMNS) + "\n")
+
+    assert CatalogImporter(workers=1).load(path) == []
+
+
+def peak_traced_bytes(importer: CatalogImporter, path: Path) -> int:
+    tracemalloc.start()
+    try:
+        for _ in importer.iter_games(path):
+            pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.slow
+def test_import_throughput_and_memory(
+    tmp_path: Path,
+    write_catalog: Callable[[Path, int], Path],
+    record_property: Callable[[str, object], None],
+) -> None:
+    # Dozens of chunks in either dump are enough to show that memory use
+    # does not grow with the dump.
+    count = 16_000
+    small = write_catalog(
+        tmp_path / f"small{catalog_path(tmp_path, write_catalog).suffix}", count // 4
+    )
+    path = write_catalog(catalog_path(tmp_path, write_catalog), count)
+    importer = CatalogImporter(chunk_size=1 << 16)
+
+    start = time.perf_counter()
+    imported = sum(1 for _ in importer.iter_games(path))
+    seconds = time.perf_counter() - start
+    small_peak = peak_traced_bytes(importer, small)
+    peak = peak_traced_bytes(importer, path)
+
+    record_property("rows_per_second", round(count / seconds))
+    record_property("peak_traced_kib", peak // 1024)
+    # ru_maxrss is the process's peak resident set size, in KiB on Linux.
+    record_property("max_rss_kib", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    assert imported + len(importer.rejected) == count
+    # Streaming: memory depends on the chunk size, not on the size of the dump.
+    assert peak < 1.5 * small_peak
@@ -0,0 +1,168 @@
+"""Tests for the RecommendationService."""
+
+import time
+
+import pytest
+
+from boardgame_night.models import Game, Player
+from boardgame_night.services import GameCollection, RecommendationService
+
+
+def reference_score(game: Game, players: list[Player]) -> float:
+    features = game.categories | game.mechanics
+    liked = sum(len(player.favorite_categories & features) for player in players)
+    fitting = sum(
+        low <= game.complexity <= high
+        for low, high in (player.complexity_preference for player in players)
+    )
+    return (liked + fitting) / len(players)
+
+
+def test_recommend_filters_by_player_count(make_game):
+    service = RecommendationService(
+        GameCollection(
+            [
+                make_game("Duel", min_players=2, max_players=2),
+                make_game("Party", min_players=4, max_players=8),
+            ]
+        )
+    )
+    assert [game.name for game in service.recommend(player_count=6)] == ["Party"]
+
+
+def test_recommend_respects_time_constraint(make_game):
+    service = RecommendationService(
+        GameCollection(
+            [
+                make_game("Quick", min_playtime=20, max_playtime=30),
+                make_game("Epic", min_playtime=180, max_playtime=240),
+            ]
+        )
+    )
+    results = service.recommend(player_count=3, available_time=60)
+    assert [game.name for game in results] == ["Quick"]
+
+
+def test_recommend_respects_max_complexity(make_game):
+    service = RecommendationService(
+        GameCollection(
+            [make_game("Light", complexity=1.5), make_game("Heavy", complexity=4.2)]
+        )
+    )
+    results = service.recommend(player_count=3, max_complexity=3.0)
+    assert [game.name for game in results] == ["Light"]
+
+
+def test_recommend_without_players_sorts_alphabetically(make_game):
+    service = RecommendationService(
+        GameCollection([make_game("Wingspan"), make_game("Azul"), make_game("Root")])
+    )
+    results = service.recommend(player_count=3)
+    assert [game.name for game in results] == ["Azul", "Root", "Wingspan"]
+
+
+def test_recommend_considers_player_preferences(make_game):
+    service = RecommendationService(
+        GameCollection(
+            [
+                make_game("Azul", categories=frozenset({"Abstract"})),
+                make_game("Pandemic", categories=frozenset({"Cooperative"})),
+                make_game(
+                    "Spirit Island",
+                    categories=frozenset({"Cooperative"}),
+                    mechanics=frozenset({"Area Control"}),
+                ),
+            ]
+        )
+    )
+    players = [
+        Player(name="Alice", favorite_categories=frozenset({"Cooperative"})),
+        Player(name="Bob", favorite_categories=frozenset({"Area Control"})),
+    ]
+    results = service.recommend(player_count=2, players=players)
+    assert [game.name for game in results] == ["Spirit Island", "Pandemic", "Azul"]
+
+
+def test_recommend_considers_complexity_preference(make_game):
+    service = RecommendationService(
+        GameCollection(
+            [make_game("Light", complexity=1.5), make_game("Heavy", complexity=4.2)]
+        )
+    )
+    players = [Player(name="Alice", complexity_preference=(3.5, 5.0))]
+    results = service.recommend(player_count=2, players=players)
+    assert [game.name for game in results] == ["Heavy", "Light"]
+
+
+def test_recommend_returns_empty_when_no_matches(make_game):
+    service = RecommendationService(GameCollection([make_game("Duel", max_players=2)]))
+    assert service.recommend(player_count=5) == []
+    assert service.recommend(player_count=5, players=[Player(name="Alice")]) == []
+
+
+def test_recommend_respects_limit(make_game):
+    service = RecommendationService(
+        GameCollection([make_game(f"Game {i}") for i in range(10)])
+    )
+    assert len(service.recommend(player_count=3, limit=3)) == 3
+    players = [Player(name="Alice")]
+    assert len(service.recommend(player_count=3, players=players, limit=3)) == 3
+    assert service.recommend(player_count=3, limit=0) == []
+
+
+def test_recommend_breaks_ties_by_name(make_game):
+    service = RecommendationService(
+        GameCollection([make_game(f"Game {i}") for i in range(9, -1, -1)])
+    )
+    results = service.recommend(player_count=3, players=[Player(name="A")], limit=3)
+    assert [game.name for game in results] == ["Game 0", "Game 1", "Game 2"]
+
+
+def test_recommend_matches_reference_scores(random_games, random_players):
+    games = random_games(3000)
+    players = random_players(12)
+    service = RecommendationService(GameCollection(games))
+    results = service.recommend(
+        player_count=4, available_time=90, players=players, limit=20
+    )
+
+    candidates = [
+        g for g in games if g.supports_player_count(4) and g.fits_time_slot(90)
+    ]
+    expected = sorted(candidates, key=lambda g: (-reference_score(g, players), g.name))
+    assert results == expected[:20]
+
+
+def test_recommend_sees_collection_changes(make_game):
+    collection = GameCollection([make_game("Azul", categories=frozenset({"Abstract"}))])
+    service = RecommendationService(collection)
+    players = [Player(name="Alice", favorite_categories=frozenset({"Cooperative"}))]
+    assert [g.name for g in service.recommend(player_count=2, players=players)] == [
+        "Azul"
+    ]
+
+    collection.add_game(make_game("Pandemic", categories=frozenset({"Cooperative"})))
+    results = service.recommend(player_count=2, players=players)
+    assert [game.name for game in results] == ["Pandemic", "Azul"]
+
+
+def test_group_scores_are_cached_per_group(random_games, random_players):
+    service = RecommendationService(GameCollection(random_games(100)), cache_size=2)
+    alice, bob, carol = random_players(3)
+    scores = service.group_scores([alice, bob])
+    assert service.group_scores([bob, alice]) is scores
+    service.group_scores([carol])
+    service.group_scores([alice])
+    assert service.group_scores([alice, bob]) is not scores
+
+
+@pytest.mark.slow
+def test_recommend_latency_is_flat_for_large_groups(random_games, random_players):
+    service = RecommendationService(GameCollection(random_games(150_000)))
+    for size in (4, 50):
+        players = random_players(size, seed=size)
+        service.recommend(player_count=4, players=players)  # fill the cache
+        start = time.perf_counter()
+        for _ in range(10):
+            service.recommend(player_count=4, available_time=60, players=players)
+        assert (time.perf_counter() - start) / 10 < 0.02
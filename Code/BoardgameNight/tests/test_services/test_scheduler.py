@@ -0,0 +1,127 @@
+"""Tests for the GameNightScheduler."""
+
+import itertools
+import time
+from collections.abc import Callable
+
+import pytest
+
+from boardgame_night.models import Game, Player
+from boardgame_night.services import GameCollection, RecommendationService
+from boardgame_night.services.scheduler import (
+    GameNightScheduler,
+    Schedule,
+    expected_minutes,
+)
+
+
+@pytest.fixture
+def timed_game(make_game: Callable[..., Game]) -> Callable[..., Game]:
+    """Factory for games that take exactly `minutes`."""
+
+    def make(name: str, minutes: int, **overrides: object) -> Game:
+        return make_game(name, min_playtime=minutes, max_playtime=minutes, **overrides)
+
+    return make
+
+
+def assert_valid(schedule: Schedule, players: list[Player], available_time: int):
+    seated = [player for table in schedule.tables for player in table.players]
+    assert sorted(p.id for p in seated) == sorted(p.id for p in players)
+    games = [game for table in schedule.tables for game in table.games]
+    assert len(games) == len(set(games)), "a game is played at two tables"
+    for table in schedule.tables:
+        assert table.minutes <= available_time
+        assert table.minutes == sum(expected_minutes(game) for game in table.games)
+        for game in table.games:
+            assert game.supports_player_count(len(table.players))
+
+
+def test_schedule_needs_at_least_two_players(timed_game):
+    scheduler = GameNightScheduler(GameCollection([timed_game("Azul", 30)]))
+    assert scheduler.schedule([Player(name="Alice")], 120).tables == ()
+
+
+def test_schedule_picks_best_games_within_time(timed_game):
+    players = [
+        Player(name="Alice", favorite_categories=frozenset({"Coop"})),
+        Player(name="Bob", favorite_categories=frozenset({"Coop"})),
+    ]
+    games = [
+        timed_game("Epic", 150, categories=frozenset({"Coop"})),
+        timed_game("Short Coop", 45, categories=frozenset({"Coop"})),
+        timed_game("Medium Coop", 60, categories=frozenset({"Coop"})),
+        timed_game("Filler", 30),
+        timed_game("Big Party", 30, min_players=5, max_players=8),
+    ]
+    collection = GameCollection(games)
+    schedule = GameNightScheduler(collection).schedule(players, 180)
+    assert_valid(schedule, players, 180)
+
+    # Brute force over all game subsets for the single possible table.
+    scores = RecommendationService(collection).group_scores(players) * 2
+    slots = {
+        game.name: slot for slot, game in enumerate(collection.game_slots()) if game
+    }
+    best = max(
+        sum(scores[slots[g.name]] * expected_minutes(g) / 60 for g in subset)
+        for size in range(len(games) + 1)
+        for subset in itertools.combinations(games[:4], size)
+        if sum(expected_minutes(g) for g in subset) <= 180
+    )
+    assert schedule.score == pytest.approx(best)
+    # One long favourite beats two shorter ones plus more filler.
+    assert [game.name for game in schedule.tables[0].games] == ["Epic", "Filler"]
+
+
+def test_schedule_splits_players_by_taste(timed_game):
+    coop = frozenset({"Coop"})
+    war = frozenset({"War"})
+    players = [
+        Player(name="A", favorite_categories=coop),
+        Player(name="B", favorite_categories=war),
+        Player(name="C", favorite_categories=coop),
+        Player(name="D", favorite_categories=war),
+    ]
+    games = [timed_game(f"Coop {i}", 60, categories=coop) for i in range(3)] + [
+        timed_game(f"War {i}", 60, categories=war) for i in range(3)
+    ]
+    schedule = GameNightScheduler(GameCollection(games)).schedule(players, 120)
+    assert_valid(schedule, players, 120)
+    for table in schedule.tables:
+        tastes = {category for p in table.players for category in p.favorite_categories}
+        assert len(tastes) == 1
+        assert all(game.categories == tastes for game in table.games)
+
+
+def test_exact_schedule_is_at_least_as_good_as_greedy(random_games, random_players):
+    collection = GameCollection(random_games(200))
+    players = random_players(7)
+    exact = GameNightScheduler(collection).schedule(players, 180)
+    greedy = GameNightScheduler(collection, exact_limit=0).schedule(players, 180)
+    assert_valid(exact, players, 180)
+    assert_valid(greedy, players, 180)
+    assert exact.score >= greedy.score
+
+
+def test_schedule_sees_collection_changes(timed_game):
+    collection = GameCollection([timed_game("Azul", 60)])
+    scheduler = GameNightScheduler(collection)
+    players = [Player(name="Alice"), Player(name="Bob")]
+    assert [g.name for g in scheduler.schedule(players, 60).tables[0].games] == ["Azul"]
+    collection.remove_game("Azul")
+    collection.add_game(timed_game("Root", 60))
+    assert [g.name for g in scheduler.schedule(players, 60).tables[0].games] == ["Root"]
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("attendees", [50, 120])
+def test_schedule_large_event(random_games, random_players, attendees):
+    collection = GameCollection(random_games(500))
+    players = random_players(attendees, seed=attendees)
+    start = time.perf_counter()
+    schedule = GameNightScheduler(collection).schedule(players, 240)
+    elapsed = time.perf_counter() - start
+    assert_valid(schedule, players, 240)
+    assert all(table.games for table in schedule.tables)
+    assert elapsed < 2.0
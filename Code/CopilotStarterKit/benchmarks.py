@@ -0,0 +1,306 @@
+"""
+Benchmarks - CopilotStarterKit
+
+Timings for the algorithms in data_processor.py. Run all benchmarks with
+
+    python benchmarks.py
+
+or only some of them with e.g. `python benchmarks.py lru_cache`.
+"""
+
+import argparse
+import array
+import os
+import random
+import tempfile
+import time
+from typing import Any, Callable
+
+import data_processor as dp
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+def timed(func: Callable[..., Any], *args: Any, repeat: int = 3) -> float:
+    """Return the best wall-clock time of several calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_lru_cache() -> None:
+    """Mixed get/put workload at growing cache capacities."""
+    print(f"{'capacity':>10} {'ops':>10} {'ops/s':>12} {'hit rate':>9}")
+    rng = random.Random(0)
+    for exponent in range(2, 7):
+        capacity = 10**exponent
+        ops = max(200_000, 2 * capacity)
+        keys = [rng.randrange(2 * capacity) for _ in range(ops)]
+
+        cache = dp.LRUCache(capacity)
+
+        def run() -> None:
+            for key in keys:
+                if cache.get(key) is None:
+                    cache.put(key, key)
+
+        seconds = timed(run, repeat=1)
+        rate = cache.stats.hit_rate
+        print(f"{capacity:>10,} {ops:>10,} {ops / seconds:>12,.0f} {rate:>9.1%}")
+
+
+def bench_sorting() -> None:
+    """introsort against sorted() and np.sort on different input shapes."""
+    n = 200_000
+    rng = random.Random(0)
+    inputs = {
+        "random": [rng.random() for _ in range(n)],
+        "sorted": list(range(n)),
+        "reversed": list(range(n, 0, -1)),
+        "few distinct": [rng.randrange(10) for _ in range(n)],
+    }
+    print(f"n = {n:,}")
+    columns = ["introsort", "array", "sorted()", "np.sort"]
+    print(f"{'input':>14}" + "".join(f"{column:>11}" for column in columns))
+    for name, data in inputs.items():
+        as_list = timed(lambda: dp.introsort(list(data)))
+        as_array = timed(lambda: dp.introsort(array.array("d", data)))
+        builtin = timed(sorted, data)
+        numpy = timed(np.sort, np.array(data)) if np is not None else float("nan")
+        print(
+            f"{name:>14} {as_list:>9.3f}s {as_array:>9.3f}s "
+            f"{builtin:>9.3f}s {numpy:>9.4f}s"
+        )
+
+
+def bench_search() -> None:
+    """Batch lookups against a binary_search loop."""
+    rng = random.Random(0)
+    n, m = 1_000_000, 200_000
+    values = sorted(rng.sample(range(4 * n), n))
+    targets = [rng.randrange(4 * n) for _ in range(m)]
+    index = dp.EytzingerIndex(values)
+
+    runs = {
+        "binary_search loop": lambda: [dp.binary_search(values, t) for t in targets],
+        "binary_search_many": lambda: dp.binary_search_many(values, targets),
+        "lower_bounds": lambda: dp.lower_bounds(values, targets),
+        "EytzingerIndex.search_many": lambda: index.search_many(targets),
+    }
+    if np is not None:
+        sorted_array, target_array = np.array(values), np.array(targets)
+        runs["binary_search_many (arrays)"] = lambda: dp.binary_search_many(
+            sorted_array, target_array
+        )
+        runs["Eytzinger (array targets)"] = lambda: index.search_many(target_array)
+    print(f"{m:,} lookups in {n:,} sorted values")
+    for name, run in runs.items():
+        seconds = timed(run)
+        print(f"{name:>28}: {seconds:.4f}s ({m / seconds / 1e6:5.1f}M lookups/s)")
+
+
+def bench_merge() -> None:
+    """k-way merge of sorted shards and external sort of a large stream."""
+    rng = random.Random(0)
+    total = 1_000_000
+    for k in (2, 16, 256):
+        shards = [sorted(rng.random() for _ in range(total // k)) for _ in range(k)]
+        merged = timed(lambda: sum(1 for _ in dp.merge_sorted(*shards)), repeat=1)
+        resorted = timed(lambda: sorted(x for shard in shards for x in shard), repeat=1)
+        print(
+            f"merge {k:>3} shards of {total // k:>7,}: {merged:.2f}s "
+            f"(concatenate + sorted(): {resorted:.2f}s)"
+        )
+
+    data = [rng.random() for _ in range(total)]
+    for max_in_memory in (total, 100_000):
+        seconds = timed(
+            lambda: sum(1 for _ in dp.external_sort(data, max_in_memory=max_in_memory)),
+            repeat=1,
+        )
+        runs = -(-total // max_in_memory)
+        print(f"external_sort {total:,} items in {runs:>2} runs: {seconds:.2f}s")
+
+
+def bench_word_frequency() -> None:
+    """Word counting throughput in MB/s on a generated corpus."""
+    rng = random.Random(0)
+    vocabulary = [f"word{i}" for i in range(50_000)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "corpus.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            for _ in range(200):
+                f.write(" ".join(rng.choices(vocabulary, k=40_000)) + "\n")
+        megabytes = os.path.getsize(path) / 1e6
+
+        def in_memory() -> None:
+            with open(path, encoding="utf-8") as f:
+                dp.word_frequency(f.read())
+
+        runs = {
+            "word_frequency (in memory)": in_memory,
+            "word_frequency_file": lambda: dp.word_frequency_file(path),
+            "word_frequency_parallel": lambda: dp.word_frequency_parallel(
+                [path], chunk_size=4 << 20
+            ),
+            "heavy_hitters (k=10)": lambda: dp.heavy_hitters(dp.iter_words(path), 10),
+        }
+        print(f"corpus: {megabytes:.0f} MB, {os.cpu_count()} CPUs")
+        for name, run in runs.items():
+            seconds = timed(run, repeat=1)
+            print(f"{name:>28}: {megabytes / seconds:6.1f} MB/s")
+
+
+def bench_statistics() -> None:
+    """calculate_statistics on lists and arrays, and streaming updates."""
+    rng = random.Random(0)
+    for n in (10_000, 1_000_000):
+        data = [rng.gauss(0, 1) for _ in range(n)]
+        print(f"n = {n:,}")
+        print(f"  list:              {timed(dp.calculate_statistics, data):.4f}s")
+        if np is not None:
+            values = np.array(data)
+            print(f"  numpy array:       {timed(dp.calculate_statistics, values):.4f}s")
+
+        def stream() -> None:
+            dp.RunningStatistics().update_many(iter(data))
+
+        print(f"  RunningStatistics: {timed(stream):.4f}s")
+
+
+def bench_flatten() -> None:
+    """Flattening deep and wide nested lists."""
+    deep: list = []
+    innermost = deep
+    for i in range(100_000):
+        child = [i]
+        innermost.append(child)
+        innermost = child
+    wide = [[float(j) for j in range(1000)] for _ in range(1000)]
+    nested_wide = [[row[:500], [row[500:]]] for row in wide]
+
+    print(f"deep (100,000 levels):      {timed(dp.flatten_nested_list, deep):.3f}s")
+    print(f"wide (1000 x 1000):         {timed(dp.flatten_nested_list, wide):.3f}s")
+    uneven = timed(dp.flatten_nested_list, nested_wide)
+    print(f"wide, uneven depth:         {uneven:.3f}s")
+    print(f"flatten_numeric (wide):     {timed(dp.flatten_numeric, wide):.3f}s")
+    print(f"flatten_numeric (uneven):   {timed(dp.flatten_numeric, nested_wide):.3f}s")
+    if np is not None:
+        matrix = np.array(wide)
+        print(f"flatten_numeric (ndarray): {timed(dp.flatten_numeric, matrix):.6f}s")
+
+
+def bench_group_by() -> None:
+    """Grouped aggregation over 1M records against group_by_key plus loops."""
+    rng = random.Random(42)
+    n = 1_000_000
+    records = [
+        {"category": f"c{rng.randrange(1000)}", "amount": rng.random() * 100}
+        for _ in range(n)
+    ]
+    columns = {
+        "category": [record["category"] for record in records],
+        "amount": [record["amount"] for record in records],
+    }
+    aggregations = {
+        "count": ("amount", "count"),
+        "total": ("amount", "sum"),
+        "mean": ("amount", "mean"),
+        "lowest": ("amount", "min"),
+        "highest": ("amount", "max"),
+    }
+
+    def baseline() -> list[dict]:
+        result = []
+        for category, group in dp.group_by_key(records, "category").items():
+            amounts = [record["amount"] for record in group]
+            total = sum(amounts)
+            result.append(
+                {
+                    "category": category,
+                    "count": len(amounts),
+                    "total": total,
+                    "mean": total / len(amounts),
+                    "lowest": min(amounts),
+                    "highest": max(amounts),
+                }
+            )
+        return result
+
+    print(f"group_by_key + loops:       {timed(baseline):.3f}s")
+    from_records = timed(dp.group_aggregate, records, "category", aggregations)
+    print(f"group_aggregate (records):  {from_records:.3f}s")
+    from_columns = timed(dp.group_aggregate, columns, "category", aggregations)
+    print(f"group_aggregate (columns):  {from_columns:.3f}s")
+    sorted_columns = timed(
+        dp.group_aggregate, columns, "category", aggregations, "columns", True
+    )
+    print(f"  sorted, columnar output:  {sorted_columns:.3f}s")
+
+
+def bench_emails() -> None:
+    """Address validation and dedup throughput on a generated address list."""
+    rng = random.Random(0)
+    n = 1_000_000
+    emails = [
+        f" User{rng.randrange(n // 2)}@Example{rng.randrange(50)}.com"
+        if rng.random() > 0.01
+        else f"broken{rng.randrange(n)}@"
+        for _ in range(n)
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "emails.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(emails) + "\n")
+
+        def loop_validation() -> None:
+            [dp.normalize_email(e) for e in emails if dp.is_valid_email(e.strip())]
+
+        runs = {
+            "is_valid_email loop": loop_validation,
+            "iter_valid_emails": lambda: list(dp.iter_valid_emails(emails)),
+            "dedupe_emails (exact set)": lambda: list(dp.dedupe_emails(emails)),
+            "dedupe_email_file (Bloom)": lambda: list(
+                dp.dedupe_email_file(path, capacity=n)
+            ),
+            "find_duplicate_emails": lambda: dp.find_duplicate_emails(
+                path, capacity=n
+            ),
+        }
+        bloom = dp.BloomFilter(n, 0.001)
+        print(f"{n:,} addresses, Bloom filter {len(bloom.bits) / 1e6:.1f} MB")
+        for name, run in runs.items():
+            seconds = timed(run, repeat=1)
+            print(f"{name:>28}: {n / seconds / 1e3:7.0f}k addresses/s")
+
+
+BENCHMARKS: dict[str, Callable[[], None]] = {
+    "lru_cache": bench_lru_cache,
+    "sorting": bench_sorting,
+    "search": bench_search,
+    "merge": bench_merge,
+    "word_frequency": bench_word_frequency,
+    "statistics": bench_statistics,
+    "flatten": bench_flatten,
+    "group_by": bench_group_by,
+    "emails": bench_emails,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("names", nargs="*", help=", ".join(BENCHMARKS))
+    args = parser.parse_args()
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name}")
+    for name in args.names or BENCHMARKS:
+        print(f"== {name} ==")
+        BENCHMARKS[name]()
+        print()
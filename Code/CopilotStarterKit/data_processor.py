@@ -12,20 +12,152 @@ that you can use to practice with GitHub Copilot:
 Try these exercises with Copilot Chat!
 """
 
-from typing import Any
-from collections import defaultdict
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableSequence,
+    Sequence,
+)
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import array
+import bisect
+import copy
+import functools
+import hashlib
+import heapq
+import math
+import operator
+import os
+import pickle
 import re
+import tempfile
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+_INSERTION_SORT_THRESHOLD = 16
 
 
 def quicksort(arr: list[int]) -> list[int]:
-    """Sort a list using the quicksort algorithm."""
-    if len(arr) <= 1:
-        return arr
-    pivot = arr[len(arr) // 2]
-    left = [x for x in arr if x < pivot]
-    middle = [x for x in arr if x == pivot]
-    right = [x for x in arr if x > pivot]
-    return quicksort(left) + middle + quicksort(right)
+    """Sort a list using the quicksort algorithm.
+
+    Returns a sorted copy; see `introsort` for sorting in place.
+    """
+    result = list(arr)
+    introsort(result)
+    return result
+
+
+def introsort(arr: MutableSequence[Any], lo: int = 0, hi: int | None = None) -> None:
+    """Sort arr[lo:hi] in place.
+
+    Quicksort with median-of-three pivots and a Hoare partition that splits
+    runs of equal keys evenly. Ranges shorter than 16 elements are
+    insertion-sorted, and ranges that recurse deeper than 2*log2(n) levels
+    fall back to heapsort, which bounds the worst case at O(n log n). An
+    explicit stack replaces recursion and, by always deferring the larger
+    side, stays O(log n) deep.
+
+    Works on lists, `array.array` and other mutable sequences. NumPy
+    arrays are handed to `ndarray.sort`, which is an introsort in C.
+    """
+    if hi is None:
+        hi = len(arr)
+    if np is not None and isinstance(arr, np.ndarray):
+        arr[lo:hi].sort(kind="quicksort")
+        return
+
+    stack = [(lo, hi, 2 * max(hi - lo, 1).bit_length())]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while hi - lo > _INSERTION_SORT_THRESHOLD:
+            if depth == 0:
+                _heapsort(arr, lo, hi)
+                break
+            depth -= 1
+            split = _partition(arr, lo, hi)
+            # Continue with the smaller side, defer the larger one.
+            if split - lo < hi - split:
+                stack.append((split, hi, depth))
+                hi = split
+            else:
+                stack.append((lo, split, depth))
+                lo = split
+        else:
+            _insertion_sort(arr, lo, hi)
+
+
+def _partition(arr: MutableSequence[Any], lo: int, hi: int) -> int:
+    """Hoare-partition arr[lo:hi] around a median-of-three pivot.
+
+    Returns a split index so that arr[lo:split] <= pivot <= arr[split:hi],
+    with both sides non-empty. Both scans stop at keys equal to the pivot,
+    which splits runs of duplicates evenly.
+    """
+    mid = (lo + hi - 1) // 2
+    if arr[mid] < arr[lo]:
+        arr[lo], arr[mid] = arr[mid], arr[lo]
+    if arr[hi - 1] < arr[mid]:
+        arr[mid], arr[hi - 1] = arr[hi - 1], arr[mid]
+        if arr[mid] < arr[lo]:
+            arr[lo], arr[mid] = arr[mid], arr[lo]
+    pivot = arr[mid]
+
+    # arr[lo] <= pivot <= arr[hi - 1] act as sentinels for the scans.
+    i, j = lo, hi - 1
+    while True:
+        i += 1
+        while arr[i] < pivot:
+            i += 1
+        j -= 1
+        while pivot < arr[j]:
+            j -= 1
+        if i >= j:
+            return i
+        arr[i], arr[j] = arr[j], arr[i]
+
+
+def _insertion_sort(arr: MutableSequence[Any], lo: int, hi: int) -> None:
+    for i in range(lo + 1, hi):
+        x = arr[i]
+        j = i - 1
+        while j >= lo and x < arr[j]:
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = x
+
+
+def _heapsort(arr: MutableSequence[Any], lo: int, hi: int) -> None:
+    n = hi - lo
+
+    def sift_down(root: int, end: int) -> None:
+        x = arr[lo + root]
+        child = 2 * root + 1
+        while child < end:
+            if child + 1 < end and arr[lo + child] < arr[lo + child + 1]:
+                child += 1
+            if not x < arr[lo + child]:
+                break
+            arr[lo + root] = arr[lo + child]
+            root = child
+            child = 2 * root + 1
+        arr[lo + root] = x
+
+    for root in range(n // 2 - 1, -1, -1):
+        sift_down(root, n)
+    for end in range(n - 1, 0, -1):
+        arr[lo], arr[lo + end] = arr[lo + end], arr[lo]
+        sift_down(0, end)
 
 
 def binary_search(arr: list[int], target: int) -> int:
@@ -42,6 +174,128 @@ def binary_search(arr: list[int], target: int) -> int:
     return -1
 
 
+def lower_bounds(arr: Sequence[Any], targets: Iterable[Any]) -> list[int]:
+    """For each target, the first index i with arr[i] >= target.
+
+    `arr` must be sorted. Like `np.searchsorted(arr, targets, "left")`, which
+    is used when NumPy is available; the result is a list either way.
+    """
+    if np is not None:
+        return np.searchsorted(arr, np.asarray(targets), side="left").tolist()
+    return [bisect.bisect_left(arr, target) for target in targets]
+
+
+def upper_bounds(arr: Sequence[Any], targets: Iterable[Any]) -> list[int]:
+    """For each target, the first index i with arr[i] > target."""
+    if np is not None:
+        return np.searchsorted(arr, np.asarray(targets), side="right").tolist()
+    return [bisect.bisect_right(arr, target) for target in targets]
+
+
+def binary_search_many(arr: Sequence[Any], targets: Iterable[Any]) -> list[int]:
+    """`binary_search` for many targets at once.
+
+    Returns the index of the first occurrence of each target in the sorted
+    `arr`, or -1 where it is missing.
+    """
+    if np is not None:
+        values = np.asarray(arr)
+        targets = np.asarray(targets)
+        if not len(values):
+            return [-1] * len(targets)
+        indexes = np.searchsorted(values, targets, side="left")
+        clipped = np.minimum(indexes, len(values) - 1)
+        found = (indexes < len(values)) & (values[clipped] == targets)
+        return np.where(found, indexes, -1).tolist()
+    n = len(arr)
+    result = []
+    for target in targets:
+        i = bisect.bisect_left(arr, target)
+        result.append(i if i < n and arr[i] == target else -1)
+    return result
+
+
+class EytzingerIndex:
+    """Sorted values in Eytzinger (BFS heap) order for repeated lookups.
+
+    Node k has children 2k and 2k + 1, so the first levels of the implicit
+    search tree share a few cache lines and each step down touches memory
+    the hardware can prefetch. Build it once for a sorted array, then look
+    up many targets; with NumPy all targets descend the tree together, one
+    vectorized step per level.
+    """
+
+    def __init__(self, sorted_values: Sequence[Any]):
+        n = len(sorted_values)
+        self.size = n
+        # Slot 0 is unused; positions maps a slot back to its sorted index
+        # (slot 0 stands for "past the end").
+        tree: list[Any] = [None] * (n + 1)
+        positions = [n] * (n + 1)
+        stack: list[int] = []
+        k, i = 1, 0
+        while stack or k <= n:
+            while k <= n:  # in-order walk of the implicit tree
+                stack.append(k)
+                k *= 2
+            k = stack.pop()
+            tree[k] = sorted_values[i]
+            positions[k] = i
+            i += 1
+            k = 2 * k + 1
+        self._tree = tree
+        self._positions = positions
+        self._np_tree = self._np_positions = None
+        if np is not None and n:
+            values = np.asarray(sorted_values)
+            if values.dtype.kind in "biuf":
+                self._np_tree = np.concatenate([values[:1], values[positions[1:]]])
+                self._np_positions = np.asarray(positions, dtype=np.intp)
+
+    def _slot(self, target: Any) -> int:
+        """Tree slot of the first value >= target, 0 if there is none."""
+        tree, n = self._tree, self.size
+        k = 1
+        while k <= n:
+            k = 2 * k + (tree[k] < target)
+        # Undo the trailing right turns and the final left turn.
+        return k >> ((~k) & (k + 1)).bit_length()
+
+    def _slots(self, targets: Any) -> Any:
+        """Vectorized `_slot`: all targets descend one level per step."""
+        tree, n = self._np_tree, self.size
+        k = np.ones(len(targets), dtype=np.intp)
+        for _ in range(n.bit_length()):
+            step = 2 * k + (tree[np.minimum(k, n)] < targets)
+            k = np.where(k <= n, step, k)
+        lowest_zero = (~k) & (k + 1)
+        return k >> np.frexp(lowest_zero.astype(float))[1]
+
+    def lower_bound(self, target: Any) -> int:
+        """First sorted index whose value is >= target (size if none)."""
+        return self._positions[self._slot(target)]
+
+    def search(self, target: Any) -> int:
+        """Sorted index of the first occurrence of target, or -1."""
+        k = self._slot(target)
+        return self._positions[k] if k and self._tree[k] == target else -1
+
+    def lower_bounds(self, targets: Iterable[Any]) -> list[int]:
+        """`lower_bound` for many targets."""
+        if self._np_tree is None:
+            return [self.lower_bound(target) for target in targets]
+        return self._np_positions[self._slots(np.asarray(targets))].tolist()
+
+    def search_many(self, targets: Iterable[Any]) -> list[int]:
+        """`search` for many targets; -1 where a target is missing."""
+        if self._np_tree is None:
+            return [self.search(target) for target in targets]
+        targets = np.asarray(targets)
+        k = self._slots(targets)
+        found = (k > 0) & (self._np_tree[k] == targets)
+        return np.where(found, self._np_positions[k], -1).tolist()
+
+
 def merge_sorted_lists(list1: list[int], list2: list[int]) -> list[int]:
     """Merge two sorted lists into one sorted list."""
     result = []
@@ -58,6 +312,102 @@ def merge_sorted_lists(list1: list[int], list2: list[int]) -> list[int]:
     return result
 
 
+def merge_sorted(
+    *iterables: Iterable[Any],
+    key: Callable[[Any], Any] | None = None,
+) -> Iterator[Any]:
+    """Lazily merge any number of sorted iterables into one sorted stream.
+
+    Keeps only the current head of each input in a heap of size k, so the
+    merge takes O(n log k) time and O(k) memory. Items with equal keys come
+    out in the order of the iterables they came from.
+    """
+    heap = []
+    for index, iterable in enumerate(iterables):
+        iterator = iter(iterable)
+        for item in iterator:
+            heap.append((item if key is None else key(item), index, item, iterator))
+            break
+    heapq.heapify(heap)
+
+    while len(heap) > 1:
+        _, index, item, iterator = heap[0]
+        yield item
+        for item in iterator:
+            heapq.heapreplace(
+                heap, (item if key is None else key(item), index, item, iterator)
+            )
+            break
+        else:
+            heapq.heappop(heap)
+
+    if heap:
+        _, _, item, iterator = heap[0]
+        yield item
+        yield from iterator
+
+
+def read_lines(path: str) -> Iterator[str]:
+    """Yield the lines of a text file without their line endings."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+
+def merge_sorted_files(
+    paths: Iterable[str],
+    key: Callable[[str], Any] | None = None,
+) -> Iterator[str]:
+    """Merge sorted text files line by line without loading them."""
+    return merge_sorted(*(read_lines(path) for path in paths), key=key)
+
+
+def _write_run(items: list[Any], directory: str) -> str:
+    with tempfile.NamedTemporaryFile("wb", dir=directory, delete=False) as f:
+        for start in range(0, len(items), 1024):
+            pickle.dump(items[start : start + 1024], f, pickle.HIGHEST_PROTOCOL)
+        return f.name
+
+
+def _read_run(path: str) -> Iterator[Any]:
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield from pickle.load(f)
+            except EOFError:
+                return
+
+
+def external_sort(
+    items: Iterable[Any],
+    key: Callable[[Any], Any] | None = None,
+    max_in_memory: int = 100_000,
+    tmp_dir: str | None = None,
+) -> Iterator[Any]:
+    """Sort a stream that may not fit into memory.
+
+    Items are collected into runs of at most `max_in_memory`, each run is
+    sorted and spilled to a temporary file, and the runs are then combined
+    with `merge_sorted`. Items must be picklable. The temporary files are
+    removed once the returned iterator is exhausted or closed.
+    """
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as directory:
+        runs = []
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= max_in_memory:
+                chunk.sort(key=key)
+                runs.append(_write_run(chunk, directory))
+                chunk = []
+        chunk.sort(key=key)
+
+        if not runs:
+            yield from chunk
+            return
+        yield from merge_sorted(*(_read_run(run) for run in runs), chunk, key=key)
+
+
 def find_duplicates(items: list[Any]) -> list[Any]:
     """Find all duplicate items in a list."""
     seen = set()
@@ -69,30 +419,335 @@ def find_duplicates(items: list[Any]) -> list[Any]:
     return list(duplicates)
 
 
+_WORD_RE = re.compile(r'\b\w+\b')
+_SPACE_RE = re.compile(rb'\s')
+
+
 def word_frequency(text: str) -> dict[str, int]:
     """Count frequency of each word in text."""
-    words = re.findall(r'\b\w+\b', text.lower())
-    frequency = defaultdict(int)
+    return dict(Counter(_WORD_RE.findall(text.lower())))
+
+
+def _read_range(path: str, start: int, end: int) -> str:
+    """Read the words that start in bytes [start, end) of a UTF-8 file.
+
+    Ranges are cut at ASCII whitespace, which never occurs inside a
+    multi-byte UTF-8 sequence: a word straddling `start` belongs to the
+    previous range, and a word straddling `end` is read to its end.
+    """
+    with open(path, "rb") as f:
+        if start > 0:
+            f.seek(start - 1)
+            data = f.read(end - start + 1)
+            match = _SPACE_RE.search(data)
+            data = data[match.start() :] if match else b""
+        else:
+            data = f.read(end)
+        if data and not data[-1:].isspace():
+            tail = []
+            while block := f.read(1 << 16):
+                match = _SPACE_RE.search(block)
+                if match:
+                    tail.append(block[: match.start()])
+                    break
+                tail.append(block)
+            data += b"".join(tail)
+    return data.decode("utf-8", errors="replace")
+
+
+def _file_ranges(path: str, chunk_size: int) -> list[tuple[str, int, int]]:
+    size = os.path.getsize(path)
+    return [
+        (path, start, min(start + chunk_size, size))
+        for start in range(0, size, chunk_size)
+    ]
+
+
+def _count_range(task: tuple[str, int, int]) -> Counter[str]:
+    return Counter(_WORD_RE.findall(_read_range(*task).lower()))
+
+
+def iter_words(path: str, chunk_size: int = 8 << 20) -> Iterator[str]:
+    """Yield the lower-cased words of a text file, reading it in chunks."""
+    for task in _file_ranges(path, chunk_size):
+        yield from _WORD_RE.findall(_read_range(*task).lower())
+
+
+def word_frequency_file(path: str, chunk_size: int = 8 << 20) -> Counter[str]:
+    """Count words in a text file while holding only one chunk in memory."""
+    counts: Counter[str] = Counter()
+    for task in _file_ranges(path, chunk_size):
+        counts.update(_count_range(task))
+    return counts
+
+
+def word_frequency_parallel(
+    paths: Iterable[str],
+    processes: int | None = None,
+    chunk_size: int = 8 << 20,
+) -> Counter[str]:
+    """Count words in many (or large) files across worker processes.
+
+    Every file is split into chunks that are counted independently (map)
+    and the partial counts are summed as they arrive (reduce).
+    """
+    tasks = [task for path in paths for task in _file_ranges(path, chunk_size)]
+    counts: Counter[str] = Counter()
+    with ProcessPoolExecutor(processes) as executor:
+        for partial in executor.map(_count_range, tasks):
+            counts.update(partial)
+    return counts
+
+
+def top_k_words(counts: dict[str, int], k: int) -> list[tuple[str, int]]:
+    """Return the k most frequent words in O(n log k)."""
+    return heapq.nlargest(k, counts.items(), key=lambda item: item[1])
+
+
+class CountMinSketch:
+    """Approximate counter with fixed memory.
+
+    Estimates never undercount; they overcount by at most about
+    e / width * (total count) with probability 1 - exp(-depth). Sketches
+    with the same width and depth can be merged, e.g. after counting in
+    separate processes.
+    """
+
+    def __init__(self, width: int = 1 << 16, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.tables = [array.array("q", bytes(8 * width)) for _ in range(depth)]
+
+    def _indexes(self, item: str) -> list[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, item: str, count: int = 1) -> int:
+        """Add to an item's count and return its new estimate."""
+        estimate = None
+        for table, index in zip(self.tables, self._indexes(item)):
+            table[index] += count
+            if estimate is None or table[index] < estimate:
+                estimate = table[index]
+        return estimate or 0
+
+    def estimate(self, item: str) -> int:
+        return min(
+            table[index] for table, index in zip(self.tables, self._indexes(item))
+        )
+
+    def merge(self, other: "CountMinSketch") -> None:
+        for table, other_table in zip(self.tables, other.tables):
+            for i, value in enumerate(other_table):
+                table[i] += value
+
+
+def heavy_hitters(
+    words: Iterable[str],
+    k: int,
+    width: int = 1 << 16,
+    depth: int = 4,
+) -> list[tuple[str, int]]:
+    """Approximate the k most frequent words of a stream in bounded memory.
+
+    Counts go into a count-min sketch; only the k words with the highest
+    estimates are kept as candidates. Returns (word, estimate) pairs.
+    """
+    sketch = CountMinSketch(width, depth)
+    candidates: dict[str, int] = {}
+    threshold = 0
     for word in words:
-        frequency[word] += 1
-    return dict(frequency)
+        estimate = sketch.add(word)
+        if word in candidates:
+            candidates[word] = estimate
+        elif len(candidates) < k:
+            candidates[word] = estimate
+            threshold = min(candidates.values())
+        elif estimate > threshold:
+            # The threshold may be stale, since candidates' counts only grow.
+            weakest = min(candidates, key=candidates.__getitem__)
+            if estimate > candidates[weakest]:
+                del candidates[weakest]
+                candidates[word] = estimate
+            threshold = min(candidates.values())
+    return sorted(candidates.items(), key=lambda item: item[1], reverse=True)
 
 
-def flatten_nested_list(nested: list) -> list:
-    """Flatten a nested list structure."""
-    result = []
-    for item in nested:
-        if isinstance(item, list):
-            result.extend(flatten_nested_list(item))
+# Checked before the (slow) Iterable ABC test; numbers are common leaves.
+_LEAF_TYPES = (int, float, complex, str, bytes, bytearray)
+
+
+def iter_flatten(
+    nested: Iterable[Any],
+    max_depth: int | None = None,
+    container_types: type | tuple[type, ...] | None = None,
+) -> Iterator[Any]:
+    """Lazily yield the leaves of a nested structure.
+
+    Uses an explicit stack of iterators, so arbitrarily deep nesting works
+    without recursion and nothing is copied. By default every iterable
+    except strings, bytes and mappings is unpacked; pass `container_types`
+    to unpack only those types. `max_depth` limits how many levels are
+    unpacked (1 flattens a single level).
+    """
+    stack = [iter(nested)]
+    while stack:
+        for item in stack[-1]:
+            if max_depth is not None and len(stack) > max_depth:
+                yield item
+            elif container_types is not None:
+                if isinstance(item, container_types):
+                    stack.append(iter(item))
+                    break
+                yield item
+            elif isinstance(item, (list, tuple)):
+                stack.append(iter(item))
+                break
+            elif isinstance(item, _LEAF_TYPES) or isinstance(item, Mapping):
+                yield item
+            elif isinstance(item, Iterable):
+                stack.append(iter(item))
+                break
+            else:
+                yield item
         else:
-            result.append(item)
-    return result
+            stack.pop()
+
+
+def flatten_nested_list(nested: list, max_depth: int | None = None) -> list:
+    """Flatten a nested list structure."""
+    return list(iter_flatten(nested, max_depth, container_types=list))
+
+
+def flatten_numeric(nested: Iterable[Any], typecode: str = "d") -> Any:
+    """Flatten nested numbers into a compact array.
+
+    NumPy arrays are raveled directly. With NumPy installed, rectangular
+    nested lists are converted in C as well; anything else is collected
+    into an `array.array` of the given typecode.
+    """
+    if np is not None:
+        if isinstance(nested, np.ndarray):
+            return nested.ravel()
+        try:
+            values = np.asarray(nested)
+        except ValueError:  # ragged nesting
+            values = None
+        if values is not None and values.dtype.kind in "biuf":
+            return values.ravel()
+    return array.array(typecode, iter_flatten(nested))
+
+
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
 
 def is_valid_email(email: str) -> bool:
     """Check if email address has valid format."""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return _EMAIL_RE.match(email) is not None
+
+
+def normalize_email(email: str) -> str:
+    """Strip surrounding whitespace and lower-case an address for comparison."""
+    return email.strip().lower()
+
+
+def iter_valid_emails(emails: Iterable[str]) -> Iterator[str]:
+    """Yield the normalized form of every valid address in a stream."""
+    match = _EMAIL_RE.match
+    for email in map(normalize_email, emails):
+        if match(email):
+            yield email
+
+
+def dedupe_emails(emails: Iterable[str]) -> Iterator[str]:
+    """Yield each valid address once, normalized, in order of first occurrence."""
+    seen: set[str] = set()
+    for email in iter_valid_emails(emails):
+        if email not in seen:
+            seen.add(email)
+            yield email
+
+
+class BloomFilter:
+    """Set membership test with fixed memory and no false negatives.
+
+    Sized for `capacity` items at a false positive rate of about
+    `error_rate`; adding more items than that raises the rate.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_bits = num_bits
+        self.num_hashes = max(1, round(num_bits / max(capacity, 1) * math.log(2)))
+        self.bits = bytearray((num_bits + 7) // 8)
+
+    def _indexes(self, item: str) -> list[int]:
+        # The filter never leaves the process, so the built-in (per-process
+        # salted) hash is enough; its two 32-bit halves drive double hashing.
+        h = hash(item) & 0xFFFFFFFFFFFFFFFF
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item: str) -> bool:
+        """Add an item; return True if it may have been present already."""
+        bits = self.bits
+        present = True
+        for index in self._indexes(item):
+            byte, mask = index >> 3, 1 << (index & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+        return present
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[i >> 3] & (1 << (i & 7)) for i in self._indexes(item))
+
+
+def _duplicate_candidates(path: str, capacity: int, error_rate: float) -> set[str]:
+    """First pass: addresses the Bloom filter has (probably) seen before."""
+    bloom = BloomFilter(capacity, error_rate)
+    return {email for email in iter_valid_emails(read_lines(path)) if bloom.add(email)}
+
+
+def find_duplicate_emails(
+    path: str, capacity: int = 10_000_000, error_rate: float = 0.001
+) -> dict[str, int]:
+    """Find the addresses occurring more than once in a one-per-line file.
+
+    The file is read twice. The first pass runs every normalized address
+    through a Bloom filter and keeps only those it reports as already seen,
+    a small superset of the true duplicates; the second pass counts the
+    candidates exactly, which drops the false positives. Memory is the
+    filter plus the candidates, independent of the number of distinct
+    addresses. Returns {address: count}.
+    """
+    candidates = _duplicate_candidates(path, capacity, error_rate)
+    counts = Counter(
+        email for email in iter_valid_emails(read_lines(path)) if email in candidates
+    )
+    return {email: count for email, count in counts.items() if count > 1}
+
+
+def dedupe_email_file(
+    path: str, capacity: int = 10_000_000, error_rate: float = 0.001
+) -> Iterator[str]:
+    """Like `dedupe_emails` for a one-per-line file, in bounded memory.
+
+    Uses the same two passes as `find_duplicate_emails`: addresses the
+    Bloom filter never flagged are unique and are yielded directly; only
+    flagged ones are tracked exactly.
+    """
+    candidates = _duplicate_candidates(path, capacity, error_rate)
+    emitted: set[str] = set()
+    for email in iter_valid_emails(read_lines(path)):
+        if email not in candidates:
+            yield email
+        elif email not in emitted:
+            emitted.add(email)
+            yield email
 
 
 def group_by_key(items: list[dict], key: str) -> dict[Any, list[dict]]:
@@ -104,59 +759,572 @@ def group_by_key(items: list[dict], key: str) -> dict[Any, list[dict]]:
     return dict(grouped)
 
 
-def calculate_statistics(numbers: list[float]) -> dict[str, float]:
-    """Calculate basic statistics for a list of numbers."""
-    if not numbers:
+def factorize(values: Iterable[Any], sort: bool = False) -> tuple[list[int], list[Any]]:
+    """Encode values as integer group codes.
+
+    Returns (codes, uniques) with uniques[codes[i]] == values[i]. Hash-based
+    by default, so groups appear in order of first occurrence; with
+    `sort=True` the groups are ordered by value.
+    """
+    if not isinstance(values, Sequence):
+        values = list(values)
+    # Both passes run in C: dict.fromkeys keeps first-occurrence order.
+    uniques = list(dict.fromkeys(values))
+    if sort:
+        uniques.sort()
+    index = {value: code for code, value in enumerate(uniques)}
+    return list(map(index.__getitem__, values)), uniques
+
+
+def _to_columns(
+    data: Iterable[dict] | Mapping[str, Sequence[Any]], key: str, fields: list[str]
+) -> dict[str, Sequence[Any]]:
+    if isinstance(data, Mapping):
+        return {name: data[name] for name in (key, *fields)}
+    records = [record for record in data if key in record]
+    columns = {name: [record.get(name) for record in records] for name in fields}
+    return {key: [record[key] for record in records], **columns}
+
+
+def _aggregate_python(
+    codes: list[int], num_groups: int, values: Sequence[Any], how: str
+) -> list[Any]:
+    # None and NaN (the only value unequal to itself) are missing, as in
+    # `_numeric_column`.
+    if how == "count":
+        counts = [0] * num_groups
+        for code, value in zip(codes, values):
+            if value is not None and value == value:
+                counts[code] += 1
+        return counts
+    if how in ("sum", "mean"):
+        counts = [0] * num_groups
+        sums: list[Any] = [0] * num_groups
+        for code, value in zip(codes, values):
+            if value is not None and value == value:
+                counts[code] += 1
+                sums[code] += value
+        if how == "sum":
+            return sums
+        return [total / n if n else None for total, n in zip(sums, counts)]
+
+    result: list[Any] = [None] * num_groups
+    better = operator.lt if how == "min" else operator.gt
+    for code, value in zip(codes, values):
+        if value is None or value != value:
+            continue
+        if result[code] is None or better(value, result[code]):
+            result[code] = value
+    return result
+
+
+_NUMERIC_TYPES = {bool, int, float, type(None)}
+
+
+def _numeric_column(values: Sequence[Any]) -> Any:
+    """Convert a bool, int or float column to (array, valid mask).
+
+    Int and bool columns keep an integer or bool dtype, so sums stay exact;
+    None (and NaN in float columns) is masked out. Returns None for other
+    columns and for int columns whose sums could overflow int64; those are
+    aggregated in Python.
+    """
+    valid = None
+    if isinstance(values, np.ndarray):
+        if values.dtype.kind not in "biuf":
+            return None
+        array = values
+    else:
+        types = set(map(type, values))
+        if not types <= _NUMERIC_TYPES:
+            return None
+        if float in types:
+            array = np.array(values, dtype=float)
+        else:
+            if type(None) in types:
+                valid = np.array([v is not None for v in values], dtype=bool)
+                values = [0 if v is None else v for v in values]
+            try:
+                array = np.array(values, dtype=np.int64 if int in types else bool)
+            except OverflowError:
+                return None
+
+    if array.dtype.kind == "f":
+        return array, ~np.isnan(array)
+    if array.dtype.kind in "iu" and array.size:
+        bound = max(abs(int(array.min())), abs(int(array.max())))
+        if bound * array.size >= 2**63:
+            return None
+        array = array.astype(np.int64, copy=False)
+    return array, valid
+
+
+def _aggregate_numpy(
+    codes: Any, num_groups: int, values: Any, valid: Any, how: str
+) -> Any:
+    if valid is not None and not valid.all():
+        codes, values = codes[valid], values[valid]
+    counts = np.bincount(codes, minlength=num_groups)
+    if how == "count":
+        return counts
+    if how in ("sum", "mean"):
+        if values.dtype.kind == "f":
+            sums = np.bincount(codes, weights=values, minlength=num_groups)
+        else:
+            sums = np.zeros(num_groups, dtype=np.int64)
+            np.add.at(sums, codes, values)
+        if how == "sum":
+            return sums
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result = sums / counts
+    else:
+        ufunc = np.minimum if how == "min" else np.maximum
+        # Seed each group with one of its own values, which keeps the dtype.
+        result = np.zeros(num_groups, dtype=values.dtype)
+        result[codes] = values
+        ufunc.at(result, codes, values)
+    empty = counts == 0
+    if empty.any():
+        # Empty groups are None, as in the Python aggregation.
+        result = result.astype(object)
+        result[empty] = None
+    return result
+
+
+def group_aggregate(
+    data: Iterable[dict] | Mapping[str, Sequence[Any]],
+    key: str,
+    aggregations: dict[str, tuple[str, str]],
+    output: str = "dicts",
+    sort: bool = False,
+) -> Any:
+    """Group records by a key column and aggregate other columns per group.
+
+    `data` is either an iterable of dicts (records without `key` are
+    skipped, as in `group_by_key`) or a dict of equal-length columns.
+    `aggregations` maps output names to (column, how) pairs, where how is
+    one of "count", "sum", "mean", "min" or "max"; None and NaN values are
+    ignored.
+
+    The key column is factorized into group codes once, and every
+    aggregation then runs over whole columns (with NumPy, as bincount and
+    ufunc reductions). Returns a list of dicts, one per group, or with
+    `output="columns"` a dict of columns with the key first. Groups are in
+    order of first occurrence, or sorted by key with `sort=True`.
+    """
+    for column, how in aggregations.values():
+        if how not in ("count", "sum", "mean", "min", "max"):
+            raise ValueError(f"Unknown aggregation {how!r} for column {column!r}")
+    fields = list(dict.fromkeys(column for column, _ in aggregations.values()))
+    columns = _to_columns(data, key, fields)
+    codes, uniques = factorize(columns[key], sort=sort)
+    num_groups = len(uniques)
+
+    numeric: dict[str, Any] = {}
+    if np is not None:
+        code_array = np.fromiter(codes, dtype=np.intp, count=len(codes))
+        numeric = {name: _numeric_column(columns[name]) for name in fields}
+    result: dict[str, Any] = {key: uniques}
+    for name, (column, how) in aggregations.items():
+        if numeric.get(column) is not None:
+            array, valid = numeric[column]
+            values = _aggregate_numpy(code_array, num_groups, array, valid, how)
+        else:
+            values = _aggregate_python(codes, num_groups, columns[column], how)
+        result[name] = values
+
+    if output == "columns":
+        return result
+    if output != "dicts":
+        raise ValueError(f"Unknown output format {output!r}")
+    lists = [
+        column.tolist() if np is not None and isinstance(column, np.ndarray) else column
+        for column in result.values()
+    ]
+    return [dict(zip(result, row)) for row in zip(*lists)]
+
+
+def quickselect(arr: MutableSequence[Any], k: int) -> Any:
+    """Return the k-th smallest element (0-based), reordering arr in place.
+
+    Afterwards arr[:k] <= arr[k] <= arr[k + 1:]. Uses the same partition
+    as `introsort` and falls back to heapsort on degenerate pivots, so it
+    runs in expected O(n) and never worse than O(n log n).
+    """
+    lo, hi = 0, len(arr)
+    depth = 2 * max(hi, 1).bit_length()
+    while hi - lo > _INSERTION_SORT_THRESHOLD:
+        if depth == 0:
+            _heapsort(arr, lo, hi)
+            return arr[k]
+        depth -= 1
+        split = _partition(arr, lo, hi)
+        if k < split:
+            hi = split
+        else:
+            lo = split
+    _insertion_sort(arr, lo, hi)
+    return arr[k]
+
+
+class _QuantileSketch:
+    """Mergeable quantile estimate from KLL compactors.
+
+    Level h holds items that stand for 2**h inputs each. When the sketch is
+    full, the lowest level over its capacity is sorted and every other item
+    moves up a level. Capacities shrink by 2/3 per level below the top, so
+    about 3 * k items are kept, and the rank error is roughly n / k. Two
+    sketches merge by concatenating their levels and compacting again. Until
+    the first compaction the sketch holds every input, so small streams get
+    exact quantiles.
+    """
+
+    def __init__(self, k: int = 200) -> None:
+        self.k = k
+        self.levels: list[list[float]] = []
+        self._capacities: list[int] = []
+        self._max_size = 0
+        self._size = 0
+        self._offset = 0
+        self._add_level()
+
+    def _add_level(self) -> None:
+        self.levels.append([])
+        height = len(self.levels)
+        self._capacities = [
+            max(2, math.ceil(self.k * (2 / 3) ** (height - level - 1)))
+            for level in range(height)
+        ]
+        self._max_size = sum(self._capacities)
+
+    def update(self, x: float) -> None:
+        self.levels[0].append(x)
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def merge(self, other: "_QuantileSketch") -> None:
+        while len(self.levels) < len(other.levels):
+            self._add_level()
+        for items, other_items in zip(self.levels, other.levels):
+            items.extend(other_items)
+        self._size += other._size
+        self._compress()
+
+    def _compress(self) -> None:
+        while self._size >= self._max_size:
+            for level, items in enumerate(self.levels):
+                if len(items) >= self._capacities[level]:
+                    break
+            if level + 1 == len(self.levels):
+                self._add_level()
+            items.sort()
+            odd = items.pop() if len(items) % 2 else None
+            # Alternate which half moves up, so the errors cancel out.
+            self._offset ^= 1
+            self.levels[level + 1].extend(items[self._offset :: 2])
+            self._size -= len(items) // 2
+            items.clear()
+            if odd is not None:
+                items.append(odd)
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile q, interpolated between neighbouring ranks."""
+        weighted = sorted(
+            (x, 1 << level) for level, items in enumerate(self.levels) for x in items
+        )
+        total = sum(weight for _, weight in weighted)
+        rank = q * (total - 1)
+        lower, upper = math.floor(rank), math.ceil(rank)
+        values = []
+        seen = 0
+        for x, weight in weighted:
+            seen += weight
+            while len(values) < 2 and seen > (lower, upper)[len(values)]:
+                values.append(x)
+            if len(values) == 2:
+                break
+        return values[0] + (values[1] - values[0]) * (rank - lower)
+
+    @property
+    def value(self) -> float:
+        return self.quantile(0.5)
+
+
+class RunningStatistics:
+    """Single-pass statistics for streams of numbers.
+
+    Mean and variance use Welford's update, which avoids the cancellation
+    of the sum-of-squares formula. Accumulators for finished partitions of
+    the data can be combined with `merge`. The median comes from a
+    mergeable quantile sketch: exact for the first few hundred values,
+    then an approximation within about 1% of the ranks, also after merges.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum = 0.0
+        self.mean = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._m2 = 0.0
+        self._median = _QuantileSketch()
+
+    def update(self, x: float) -> None:
+        self.count += 1
+        self.sum += x
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+        self._median.update(x)
+
+    def update_many(self, numbers: Iterable[float]) -> None:
+        for x in numbers:
+            self.update(x)
+
+    def merge(self, other: "RunningStatistics") -> None:
+        if not other.count:
+            return
+        if not self.count:
+            self.__dict__.update(copy.deepcopy(other.__dict__))
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._median.merge(other._median)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std_dev(self) -> float:
+        return self.variance**0.5
+
+    @property
+    def median(self) -> float:
+        return self._median.value if self.count else 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        if not self.count:
+            return {"count": 0, "sum": 0, "mean": 0, "min": 0, "max": 0}
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.mean,
+            "median": self.median,
+            "min": self.min,
+            "max": self.max,
+            "std_dev": self.std_dev,
+        }
+
+
+def calculate_statistics(numbers: Iterable[float]) -> dict[str, float]:
+    """Calculate basic statistics for a list of numbers.
+
+    One pass computes count, sum, mean, min, max and standard deviation;
+    the exact median comes from `quickselect` on a copy of the data.
+    NumPy arrays are handled by NumPy directly.
+    """
+    if np is not None and isinstance(numbers, np.ndarray):
+        if not numbers.size:
+            return {"count": 0, "sum": 0, "mean": 0, "min": 0, "max": 0}
+        return {
+            "count": int(numbers.size),
+            "sum": float(numbers.sum()),
+            "mean": float(numbers.mean()),
+            "median": float(np.median(numbers)),
+            "min": float(numbers.min()),
+            "max": float(numbers.max()),
+            "std_dev": float(numbers.std()),
+        }
+
+    values = list(numbers)
+    if not values:
         return {"count": 0, "sum": 0, "mean": 0, "min": 0, "max": 0}
 
-    n = len(numbers)
-    total = sum(numbers)
-    mean = total / n
-    sorted_nums = sorted(numbers)
+    n = len(values)
+    count = total = 0
+    mean = m2 = 0.0
+    smallest = largest = values[0]
+    for x in values:
+        count += 1
+        total += x
+        delta = x - mean
+        mean += delta / count
+        m2 += delta * (x - mean)
+        if x < smallest:
+            smallest = x
+        elif x > largest:
+            largest = x
 
+    upper = quickselect(values, n // 2)
     if n % 2 == 0:
-        median = (sorted_nums[n // 2 - 1] + sorted_nums[n // 2]) / 2
+        median = (max(values[: n // 2]) + upper) / 2
     else:
-        median = sorted_nums[n // 2]
-
-    variance = sum((x - mean) ** 2 for x in numbers) / n
-    std_dev = variance ** 0.5
+        median = upper
 
     return {
         "count": n,
         "sum": total,
         "mean": mean,
         "median": median,
-        "min": min(numbers),
-        "max": max(numbers),
-        "std_dev": std_dev,
+        "min": smallest,
+        "max": largest,
+        "std_dev": (m2 / n) ** 0.5,
     }
 
 
+@dataclass
+class CacheStats:
+    """Hit, miss and eviction counters of a cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+_MISSING = object()
+_KWARGS = object()  # separates positional from keyword arguments in keys
+
+
 class LRUCache:
-    """Least Recently Used (LRU) Cache implementation."""
+    """Least Recently Used (LRU) Cache implementation.
+
+    Entries are kept in an OrderedDict from least to most recently used, so
+    get and put are O(1). Optionally, entries expire `ttl` seconds after
+    they were stored, and the total weight of the entries (as computed by
+    `weigher`, one per entry by default) is limited to `max_weight`.
+    """
 
-    def __init__(self, capacity: int):
+    def __init__(
+        self,
+        capacity: int,
+        ttl: float | None = None,
+        max_weight: float | None = None,
+        weigher: Callable[[Any], float] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         self.capacity = capacity
-        self.cache: dict[Any, Any] = {}
-        self.order: list[Any] = []
+        self.ttl = ttl
+        self.max_weight = max_weight
+        self.weigher = weigher
+        self.clock = clock
+        self.weight = 0.0
+        self.stats = CacheStats()
+        # key -> (value, expiry time or None, weight)
+        self.cache: OrderedDict[Any, tuple[Any, float | None, float]] = OrderedDict()
 
-    def get(self, key: Any) -> Any | None:
-        if key in self.cache:
-            self.order.remove(key)
-            self.order.append(key)
-            return self.cache[key]
-        return None
+    def get(self, key: Any, default: Any = None) -> Any:
+        entry = self.cache.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return default
+        value, expires, _ = entry
+        if expires is not None and self.clock() >= expires:
+            self._remove(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return default
+        self.cache.move_to_end(key)
+        self.stats.hits += 1
+        return value
 
     def put(self, key: Any, value: Any) -> None:
+        weight = self.weigher(value) if self.weigher else 1
         if key in self.cache:
-            self.order.remove(key)
-        elif len(self.cache) >= self.capacity:
-            oldest = self.order.pop(0)
-            del self.cache[oldest]
+            self._remove(key)
+        if self.max_weight is not None and weight > self.max_weight:
+            # Too heavy to cache; the old value is dropped, as it is stale.
+            return
+        expires = self.clock() + self.ttl if self.ttl is not None else None
+        self.cache[key] = (value, expires, weight)
+        self.weight += weight
+
+        while len(self.cache) > self.capacity or (
+            self.max_weight is not None and self.weight > self.max_weight
+        ):
+            oldest = next(iter(self.cache))
+            self._remove(oldest)
+            self.stats.evictions += 1
+
+    def _remove(self, key: Any) -> None:
+        self.weight -= self.cache.pop(key)[2]
+
+    def clear(self) -> None:
+        self.cache.clear()
+        self.weight = 0.0
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.cache
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+
+class ThreadSafeLRUCache(LRUCache):
+    """LRU cache that can be shared between threads."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            return super().get(key, default)
+
+    def put(self, key: Any, value: Any) -> None:
+        with self._lock:
+            super().put(key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+
+
+def cached(
+    capacity: int = 128,
+    ttl: float | None = None,
+    thread_safe: bool = False,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator that memoizes a function with an LRU cache.
+
+    The arguments must be hashable. The cache is available as the `cache`
+    attribute of the decorated function.
+    """
+    cache_class = ThreadSafeLRUCache if thread_safe else LRUCache
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        cache = cache_class(capacity, ttl=ttl)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = (*args, _KWARGS, *sorted(kwargs.items())) if kwargs else args
+            result = cache.get(key, _MISSING)
+            if result is _MISSING:
+                result = func(*args, **kwargs)
+                cache.put(key, result)
+            return result
+
+        wrapper.cache = cache  # type: ignore[attr-defined]
+        return wrapper
 
-        self.cache[key] = value
-        self.order.append(key)
+    return decorator
 
 
 if __name__ == "__main__":
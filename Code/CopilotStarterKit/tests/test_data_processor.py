@@ -0,0 +1,446 @@
+"""Tests for the data processing helpers."""
+
+import bisect
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+import data_processor
+from data_processor import (
+    EytzingerIndex,
+    LRUCache,
+    RunningStatistics,
+    _aggregate_python,
+    _duplicate_candidates,
+    _heapsort,
+    _partition,
+    _read_range,
+    binary_search_many,
+    cached,
+    dedupe_email_file,
+    dedupe_emails,
+    external_sort,
+    factorize,
+    find_duplicate_emails,
+    group_aggregate,
+    introsort,
+    iter_flatten,
+    lower_bounds,
+    merge_sorted,
+    quickselect,
+    upper_bounds,
+    word_frequency,
+    word_frequency_file,
+    word_frequency_parallel,
+)
+
+AGGREGATIONS = {
+    "count": ("value", "count"),
+    "total": ("value", "sum"),
+    "mean": ("value", "mean"),
+    "lowest": ("value", "min"),
+    "highest": ("value", "max"),
+}
+
+
+def aggregate_in_python(records: list[dict], aggregations: dict) -> list[dict]:
+    """Aggregate records with the pure Python path only."""
+    keys = [record["key"] for record in records]
+    values = [record["value"] for record in records]
+    codes, uniques = factorize(keys)
+    columns = {"key": uniques}
+    for name, (_, how) in aggregations.items():
+        columns[name] = _aggregate_python(codes, len(uniques), values, how)
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def test_group_aggregate_matches_python_path():
+    """Test that NumPy and Python aggregation agree for every column type."""
+    ordering = {name: AGGREGATIONS[name] for name in ("count", "lowest", "highest")}
+    columns = [
+        (["10", "9", None], ordering),
+        ([2**53 + 1, 2, None], AGGREGATIONS),
+        ([1.5, None, 2.5], AGGREGATIONS),
+        ([True, False, None], AGGREGATIONS),
+    ]
+    for values, aggregations in columns:
+        records = [
+            {"key": key, "value": value} for key, value in zip(["a", "a", "b"], values)
+        ]
+        expected = aggregate_in_python(records, aggregations)
+        assert group_aggregate(records, "key", aggregations) == expected
+
+
+def test_group_aggregate_ignores_nan_like_none():
+    """Test that both paths leave NaN out of every aggregation."""
+    nan = float("nan")
+    records = [
+        {"key": "a", "value": 1.0},
+        {"key": "a", "value": nan},
+        {"key": "a", "value": 3.0},
+        {"key": "b", "value": nan},
+        {"key": "b", "value": None},
+    ]
+    expected = [
+        {
+            "key": "a",
+            "count": 2,
+            "total": 4.0,
+            "mean": 2.0,
+            "lowest": 1.0,
+            "highest": 3.0,
+        },
+        {
+            "key": "b",
+            "count": 0,
+            "total": 0,
+            "mean": None,
+            "lowest": None,
+            "highest": None,
+        },
+    ]
+
+    assert group_aggregate(records, "key", AGGREGATIONS) == expected
+    assert aggregate_in_python(records, AGGREGATIONS) == expected
+
+
+def test_group_aggregate_keeps_ints_exact():
+    """Test that int sums stay ints and empty groups are None."""
+    records = [
+        {"key": "a", "value": 2**53 + 1},
+        {"key": "a", "value": 2},
+        {"key": "b", "value": None},
+    ]
+    rows = group_aggregate(records, "key", AGGREGATIONS)
+
+    assert rows[0]["total"] == 2**53 + 3
+    assert isinstance(rows[0]["total"], int)
+    assert rows[1] == {
+        "key": "b",
+        "count": 0,
+        "total": 0,
+        "mean": None,
+        "lowest": None,
+        "highest": None,
+    }
+
+
+def test_group_aggregate_columns_from_arrays():
+    """Test columnar input and output with NumPy arrays."""
+    data = {"key": np.array([1, 1, 2]), "value": np.array([4, 2, 7])}
+    result = group_aggregate(data, "key", AGGREGATIONS, output="columns")
+
+    assert result["total"].tolist() == [6, 7]
+    assert result["lowest"].dtype == data["value"].dtype
+    assert result["mean"].tolist() == [3.0, 7.0]
+
+
+def test_merged_median_weighs_values_not_partitions():
+    """Test the median of merged accumulators of very different sizes."""
+    ones = RunningStatistics()
+    ones.update_many([1.0] * 99)
+    thousands = RunningStatistics()
+    thousands.update_many([1000.0] * 101)
+    ones.merge(thousands)
+
+    assert ones.median == 1000.0
+    ones.update_many([1.0] * 20)
+    assert ones.median == 1.0
+
+
+def test_merged_median_is_close_to_exact():
+    """Test the median of many merged partitions against the exact rank."""
+    rng = random.Random(0)
+    values = [rng.lognormvariate(0, 1) for _ in range(100_000)]
+    total = RunningStatistics()
+    for start in range(0, len(values), 12_500):
+        part = RunningStatistics()
+        part.update_many(values[start : start + 12_500])
+        total.merge(part)
+
+    median = total.median
+    rank = sum(value < median for value in values) / len(values)
+    assert abs(rank - 0.5) < 0.01
+    assert total.count == len(values)
+
+
+def test_oversized_put_drops_the_old_value():
+    """Test that a value too heavy to cache does not leave a stale entry."""
+    cache = LRUCache(10, max_weight=5, weigher=len)
+    cache.put("key", "old")
+    cache.put("key", "much too long")
+
+    assert "key" not in cache
+    assert cache.get("key") is None
+    assert cache.weight == 0
+
+
+def test_cached_keys_separate_args_from_kwargs():
+    """Test that keyword arguments cannot collide with positional ones."""
+    calls = []
+
+    @cached()
+    def echo(*args, **kwargs):
+        calls.append((args, kwargs))
+        return args, kwargs
+
+    assert echo(1, a=1) == ((1,), {"a": 1})
+    assert echo((1,), (("a", 1),)) == (((1,), (("a", 1),)), {})
+    assert echo(1, a=1) == ((1,), {"a": 1})
+    assert len(calls) == 2
+
+
+SORT_INPUTS = {
+    "duplicates": [random.Random(1).randrange(3) for _ in range(1000)],
+    "all equal": [7] * 1000,
+    "sorted": list(range(1000)),
+    "reverse sorted": list(range(1000, 0, -1)),
+}
+
+
+@pytest.mark.parametrize("name", SORT_INPUTS)
+def test_introsort_sorts_adversarial_inputs(name):
+    """Test duplicates and presorted inputs, which break naive quicksorts."""
+    values = list(SORT_INPUTS[name])
+    introsort(values)
+
+    assert values == sorted(SORT_INPUTS[name])
+
+
+def test_partition_splits_equal_keys_evenly():
+    """Test that a run of equal keys is split in the middle, not at one end."""
+    values = [5] * 100
+    split = _partition(values, 0, len(values))
+
+    assert 40 <= split <= 60
+
+
+def min_first_partition(arr, lo, hi):
+    """A valid but worst-case partition that splits off one element."""
+    smallest = min(range(lo, hi), key=arr.__getitem__)
+    arr[lo], arr[smallest] = arr[smallest], arr[lo]
+    return lo + 1
+
+
+def test_degenerate_pivots_fall_back_to_heapsort(monkeypatch):
+    """Test that introsort and quickselect switch to heapsort at the depth limit."""
+    heapsorted = []
+
+    def heapsort(arr, lo, hi):
+        heapsorted.append(hi - lo)
+        _heapsort(arr, lo, hi)
+
+    monkeypatch.setattr(data_processor, "_partition", min_first_partition)
+    monkeypatch.setattr(data_processor, "_heapsort", heapsort)
+    values = [random.Random(2).random() for _ in range(500)]
+
+    shuffled = list(values)
+    introsort(shuffled)
+    assert shuffled == sorted(values)
+    # 500 elements give a depth limit of 2 * 9 levels.
+    assert heapsorted == [500 - 18]
+
+    heapsorted.clear()
+    assert quickselect(list(values), 250) == sorted(values)[250]
+    assert heapsorted == [500 - 18]
+
+
+@pytest.mark.parametrize("k", [0, 499])
+def test_quickselect_at_the_ends(k):
+    """Test selecting the smallest and largest element."""
+    rng = random.Random(k)
+    values = [rng.randrange(50) for _ in range(500)]
+    selected = list(values)
+
+    assert quickselect(selected, k) == sorted(values)[k]
+    assert all(x <= selected[k] for x in selected[:k])
+    assert all(selected[k] <= x for x in selected[k + 1 :])
+
+
+def test_merge_sorted_skips_empty_inputs():
+    """Test that empty inputs anywhere in the argument list are ignored."""
+    assert list(merge_sorted()) == []
+    assert list(merge_sorted([], [])) == []
+    assert list(merge_sorted([], [1, 4], [], [2, 3], [])) == [1, 2, 3, 4]
+
+
+def test_merge_sorted_is_stable_across_inputs():
+    """Test that equal keys keep the order of the inputs they came from."""
+    first = [(1, "a"), (2, "a")]
+    second = [(1, "b"), (2, "b")]
+    third = [(0, "c"), (2, "c")]
+    merged = list(merge_sorted(first, second, third, key=lambda item: item[0]))
+
+    assert merged == [(0, "c"), (1, "a"), (1, "b"), (2, "a"), (2, "b"), (2, "c")]
+
+
+def test_external_sort_matches_sorted_with_key(tmp_path):
+    """Test a stable keyed sort over many spilled runs."""
+    rng = random.Random(3)
+    items = [(rng.randrange(10), i) for i in range(1000)]
+    result = external_sort(
+        items, key=lambda item: item[0], max_in_memory=64, tmp_dir=tmp_path
+    )
+
+    assert list(result) == sorted(items, key=lambda item: item[0])
+
+
+def test_external_sort_removes_its_temporary_files(tmp_path):
+    """Test cleanup after the result is exhausted and after it is closed early."""
+    done = external_sort(range(100, 0, -1), max_in_memory=10, tmp_dir=tmp_path)
+    assert list(done) == list(range(1, 101))
+    assert list(tmp_path.iterdir()) == []
+
+    stopped = external_sort(range(100, 0, -1), max_in_memory=10, tmp_dir=tmp_path)
+    assert next(stopped) == 1
+    assert list(tmp_path.iterdir()) != []
+    stopped.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+WORDS_TEXT = "Größe straße über\nÜBER  naïve café\tcafé größe Straße\n"
+
+
+@pytest.mark.parametrize("chunk_size", range(1, 12))
+def test_word_frequency_file_across_chunk_boundaries(tmp_path, chunk_size):
+    """Test chunks that cut words and multi-byte characters in half."""
+    path = tmp_path / "words.txt"
+    path.write_text(WORDS_TEXT, encoding="utf-8")
+
+    counts = word_frequency_file(str(path), chunk_size=chunk_size)
+    assert counts == word_frequency(WORDS_TEXT)
+
+
+def test_read_range_keeps_a_split_word_in_the_first_range(tmp_path):
+    """Test that a split word belongs to the range it starts in."""
+    path = tmp_path / "words.txt"
+    path.write_bytes("ab größe cd".encode())
+    boundary = len("ab grö".encode()) - 1  # inside the two bytes of "ö"
+
+    assert _read_range(str(path), 0, boundary) == "ab größe"
+    assert _read_range(str(path), boundary, path.stat().st_size) == " cd"
+
+
+def test_word_frequency_parallel_matches_serial(tmp_path):
+    """Test that counting chunks in worker processes gives the serial result."""
+    rng = random.Random(4)
+    vocabulary = ["alpha", "beta", "gamma", "dëlta", "épsilon"]
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"part{i}.txt"
+        path.write_text(
+            " ".join(rng.choice(vocabulary) for _ in range(2000)), encoding="utf-8"
+        )
+        paths.append(str(path))
+
+    expected = sum(
+        (word_frequency_file(path, chunk_size=1000) for path in paths), Counter()
+    )
+    assert word_frequency_parallel(paths, processes=2, chunk_size=1000) == expected
+
+
+def test_iter_flatten_handles_deep_nesting():
+    """Test nesting far beyond the recursion limit."""
+    nested: list = [0]
+    for i in range(1, 100_000):
+        nested = [nested, i]
+
+    assert list(iter_flatten(nested)) == list(range(100_000))
+
+
+def test_iter_flatten_stops_at_max_depth():
+    """Test that levels below `max_depth` are yielded unchanged."""
+    nested = [1, [2, [3, [4]]], (5, [6])]
+
+    assert list(iter_flatten(nested, max_depth=0)) == nested
+    assert list(iter_flatten(nested, max_depth=1)) == [1, 2, [3, [4]], 5, [6]]
+    assert list(iter_flatten(nested, max_depth=2)) == [1, 2, 3, [4], 5, 6]
+    assert list(iter_flatten(nested)) == [1, 2, 3, 4, 5, 6]
+
+
+def test_iter_flatten_keeps_strings_bytes_and_mappings_whole():
+    """Test that text, bytes and dicts are leaves, other iterables are not."""
+    nested = ["ab", [b"cd", bytearray(b"ef")], {"g": 1}, (x for x in "hi"), {3}]
+
+    assert list(iter_flatten(nested)) == [
+        "ab",
+        b"cd",
+        bytearray(b"ef"),
+        {"g": 1},
+        "h",
+        "i",
+        3,
+    ]
+
+
+EMAILS = [
+    "Alice@Example.com",
+    "bob@example.com",
+    "not an address",
+    " alice@example.COM ",
+    "carol@example.org",
+    "BOB@EXAMPLE.COM",
+    "alice@example.com",
+] + [f"user{i}@example.net" for i in range(200)]
+
+
+def test_duplicate_emails_are_case_folded(tmp_path):
+    """Test that addresses differing only in case and spacing are duplicates."""
+    path = tmp_path / "emails.txt"
+    path.write_text("\n".join(EMAILS) + "\n", encoding="utf-8")
+
+    assert find_duplicate_emails(str(path)) == {
+        "alice@example.com": 3,
+        "bob@example.com": 2,
+    }
+    assert list(dedupe_email_file(str(path))) == list(dedupe_emails(EMAILS))
+
+
+def test_bloom_filter_false_positives_are_confirmed(tmp_path):
+    """Test that a saturated filter still gives exact results."""
+    path = tmp_path / "emails.txt"
+    path.write_text("\n".join(EMAILS) + "\n", encoding="utf-8")
+    # An 8-bit filter flags almost every address as seen before.
+    tiny = {"capacity": 1, "error_rate": 0.5}
+
+    candidates = _duplicate_candidates(str(path), **tiny)
+    assert len(candidates) > 100
+    assert find_duplicate_emails(str(path), **tiny) == {
+        "alice@example.com": 3,
+        "bob@example.com": 2,
+    }
+    assert list(dedupe_email_file(str(path), **tiny)) == list(dedupe_emails(EMAILS))
+
+
+@pytest.fixture(params=["numpy", "python"])
+def numpy_or_not(request, monkeypatch):
+    """Run a test with NumPy and again with the pure Python fallback."""
+    if request.param == "python":
+        monkeypatch.setattr(data_processor, "np", None)
+    return request.param
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 7, 100])
+def test_batch_searches_match_bisect(numpy_or_not, size):
+    """Test present, missing and out-of-range keys against `bisect`."""
+    rng = random.Random(size)
+    values = sorted(rng.randrange(0, 3 * size + 1, 2) for _ in range(size))
+    targets = list(range(-2, 3 * size + 3))
+    lower = [bisect.bisect_left(values, t) for t in targets]
+    upper = [bisect.bisect_right(values, t) for t in targets]
+    first = [
+        i if i < len(values) and values[i] == t else -1 for t, i in zip(targets, lower)
+    ]
+    index = EytzingerIndex(values)
+
+    for result, expected in [
+        (lower_bounds(values, targets), lower),
+        (upper_bounds(values, targets), upper),
+        (binary_search_many(values, targets), first),
+        (index.lower_bounds(targets), lower),
+        (index.search_many(targets), first),
+    ]:
+        assert type(result) is list
+        assert result == expected
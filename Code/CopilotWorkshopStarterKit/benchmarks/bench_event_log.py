@@ -0,0 +1,67 @@
+"""Benchmark replay throughput of the library event log.
+
+Run from the project root with:
+
+    python -m benchmarks.bench_event_log
+"""
+
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from src.book_api import Book
+from src.config import Config
+from src.event_log import Journal
+from src.library import Library
+from src.member_manager import Member
+
+NUM_BOOKS = 20_000
+NUM_MEMBERS = 5_000
+NUM_ROUNDS = 10
+
+
+def record_events(journal: Journal) -> int:
+    """Fill a journaled library with transactions and return the event count."""
+    library = Library(Config(max_books_per_member=100), journal)
+    start = date(2024, 1, 1)
+    for i in range(NUM_BOOKS):
+        book = Book(f"isbn-{i}", f"Title {i}", f"Author {i % 500}", 2000, "Fiction")
+        library.add_book(book)
+    for i in range(NUM_MEMBERS):
+        library.register_member(Member(f"M{i}", f"Member {i}", f"m{i}@x.org", start))
+    for r in range(NUM_ROUNDS):
+        day = start + timedelta(days=r)
+        for i in range(NUM_BOOKS):
+            library.borrow_book(f"isbn-{i}", f"M{(i + r) % NUM_MEMBERS}", day)
+        for i in range(NUM_BOOKS):
+            library.return_book(f"isbn-{i}", f"M{(i + r) % NUM_MEMBERS}", day)
+    return NUM_BOOKS + NUM_MEMBERS + 2 * NUM_ROUNDS * NUM_BOOKS
+
+
+def main():
+    """Record a log, then time a full replay from an empty state."""
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "events.log")
+        snapshot_path = os.path.join(tmp, "snapshot.json")
+
+        journal = Journal(log_path, snapshot_path, snapshot_interval=10**9)
+        num_events = record_events(journal)
+        journal.close()
+        size = os.path.getsize(log_path)
+
+        journal = Journal(log_path, snapshot_path, snapshot_interval=10**9)
+        t0 = time.perf_counter()
+        library = Library.recover(Config(max_books_per_member=100), journal)
+        elapsed = time.perf_counter() - t0
+        journal.close()
+
+        assert library.verify_statistics()
+        print(f"Events:      {num_events:,}")
+        print(f"Log size:    {size / 1e6:.1f} MB ({size / num_events:.1f} B/event)")
+        print(f"Replay time: {elapsed:.2f} s")
+        print(f"Throughput:  {num_events / elapsed:,.0f} events/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark batch recomputation of recommendations.
+
+Generates a catalog and a clustered loan history, then times loading the
+history and recomputing the top-k list of every member. Run from the
+project root with:
+
+    python -m benchmarks.bench_recommender --members 100000
+"""
+
+import argparse
+import random
+import time
+
+from src.book_api import Book, BookCatalog
+from src.recommender import Recommender
+
+
+def main():
+    """Build a synthetic history and time a full refresh."""
+    parser = argparse.ArgumentParser(description="Benchmark the recommender.")
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--books", type=int, default=20_000)
+    parser.add_argument("--loans", type=int, default=10, help="loans per member")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    catalog = BookCatalog()
+    for i in range(args.books):
+        catalog.add_book(
+            Book(f"isbn-{i}", f"Title {i}", f"Author {i % 2000}", 2000, f"G{i % 50}")
+        )
+
+    # Members read mostly within one of 200 taste clusters.
+    cluster_size = args.books // 200
+    history = []
+    for m in range(args.members):
+        base = rng.randrange(200) * cluster_size
+        for _ in range(args.loans):
+            if rng.random() < 0.8:
+                isbn = base + rng.randrange(cluster_size)
+            else:
+                isbn = rng.randrange(args.books)
+            history.append((f"M{m}", f"isbn-{isbn}"))
+
+    recommender = Recommender(catalog)
+    t0 = time.perf_counter()
+    recommender.load_history(history)
+    t1 = time.perf_counter()
+    recomputed = recommender.refresh()
+    t2 = time.perf_counter()
+
+    print(f"Members:         {args.members:,}")
+    print(f"Books:           {args.books:,}")
+    print(f"Loans:           {len(history):,}")
+    print(f"Load history:    {t1 - t0:.1f} s")
+    print(f"Full refresh:    {t2 - t1:.1f} s for {recomputed:,} members")
+    print(f"Per member:      {(t2 - t1) / recomputed * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
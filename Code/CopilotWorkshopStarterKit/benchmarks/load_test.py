@@ -0,0 +1,116 @@
+"""Load test for the library HTTP API.
+
+Starts a local instance of `src.server` (unless --port points at one that
+is already running), keeps a number of keep-alive connections busy with a
+mix of catalog reads for a fixed duration and reports requests per second
+and latency percentiles. Run from the project root with:
+
+    python -m benchmarks.load_test --connections 50 --duration 10
+"""
+
+import argparse
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+from typing import List
+
+TARGETS = [
+    "/books?title=generated&page=1",
+    "/books?title=generated&page=2",
+    "/books?author=author%207",
+    "/books/978-0-13-110362-7",
+    "/stats",
+]
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    """Read one HTTP response and return its status code."""
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.partition(b":")
+        if name.lower() == b"content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def worker(
+    host: str, port: int, offset: int, deadline: float, latencies: List[float]
+) -> int:
+    """Send requests over one connection until the deadline, return errors."""
+    reader, writer = await asyncio.open_connection(host, port)
+    errors = 0
+    i = offset
+    while time.perf_counter() < deadline:
+        target = TARGETS[i % len(TARGETS)]
+        i += 1
+        request = f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode()
+        start = time.perf_counter()
+        writer.write(request)
+        await writer.drain()
+        if await read_response(reader) != 200:
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+    return errors
+
+
+async def run(host: str, port: int, connections: int, duration: float) -> None:
+    """Run the load test and print the results."""
+    latencies: List[float] = []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    errors = await asyncio.gather(
+        *(worker(host, port, i, deadline, latencies) for i in range(connections))
+    )
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    count = len(latencies)
+    print(f"Connections: {connections}")
+    print(f"Requests:    {count:,} ({sum(errors)} errors)")
+    print(f"RPS:         {count / elapsed:,.0f}")
+    print(f"p50 latency: {latencies[count // 2] * 1000:.2f} ms")
+    print(f"p99 latency: {latencies[int(count * 0.99)] * 1000:.2f} ms")
+
+
+def free_port() -> int:
+    """Find a free TCP port on the loopback interface."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main():
+    """Command line entry point for the load test."""
+    parser = argparse.ArgumentParser(description="Load test the library API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="port of a running instance")
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--books", type=int, default=10_000)
+    args = parser.parse_args()
+
+    process = None
+    port = args.port
+    if port is None:
+        port = free_port()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "src.server", "--port", str(port)]
+            + ["--books", str(args.books)],
+            stdout=subprocess.PIPE,
+        )
+        process.stdout.readline()  # wait for the "Serving ..." line
+    try:
+        asyncio.run(run(args.host, port, args.connections, args.duration))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 """Book data models and API for the library."""
 
+from collections import Counter
 from dataclasses import dataclass
-from typing import Optional, Dict, List
+from typing import Optional, Dict, Iterable, List
 from datetime import datetime, date
 from enum import Enum
 
@@ -40,13 +41,45 @@ class Book:
             "due_date": self.due_date.isoformat() if self.due_date else None,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Book":
+        """Create a book from the output of `to_dict`."""
+        return cls(
+            isbn=data["isbn"],
+            title=data["title"],
+            author=data["author"],
+            year=data["year"],
+            genre=data["genre"],
+            status=BookStatus(data["status"]),
+            borrowed_by=data["borrowed_by"],
+            due_date=(
+                date.fromisoformat(data["due_date"]) if data["due_date"] else None
+            ),
+        )
+
 
 class BookCatalog:
-    """Manages the book inventory."""
+    """
+    Manages the book inventory.
+
+    Per-status counts and the number of borrowed books due on each date are
+    kept up to date on every mutation. Updates and status counts are O(1);
+    counting overdue books costs one step per distinct due date, which is
+    bounded by the loan period rather than by the size of the catalog.
+    Status changes must therefore go through `update_book_status`.
+    Every mutation also increments a version number that callers can use to
+    validate cached results.
+    """
 
     def __init__(self):
         self._books: Dict[str, Book] = {}
         self._cache: Dict[str, tuple] = {}
+        self._status_counts: Dict[BookStatus, int] = {
+            status: 0 for status in BookStatus
+        }
+        self._due_dates: Dict[str, date] = {}
+        self._due_counts: Counter = Counter()
+        self._version = 0
 
     def add_book(self, book: Book) -> bool:
         """
@@ -61,6 +94,9 @@ class BookCatalog:
         if book.isbn in self._books:
             return False
         self._books[book.isbn] = book
+        self._version += 1
+        self._status_counts[book.status] += 1
+        self._track_due_date(book)
         return True
 
     def get_book(self, isbn: str) -> Optional[Book]:
@@ -75,6 +111,19 @@ class BookCatalog:
         """
         return self._books.get(isbn)
 
+    def get_books(self, isbns: Iterable[str]) -> List[Book]:
+        """
+        Get several books by ISBN in one call.
+
+        Args:
+            isbns: ISBNs of the books to look up
+
+        Returns:
+            List of the books found, unknown ISBNs are skipped
+        """
+        books = self._books
+        return [books[isbn] for isbn in isbns if isbn in books]
+
     def search_by_title(self, title: str) -> List[Book]:
         """
         Search books by title (partial match).
@@ -125,6 +174,9 @@ class BookCatalog:
         """
         Update the status of a book.
 
+        A book's due date is counted as of the last call while it is
+        BORROWED, so set `due_date` before marking a book as borrowed.
+
         Args:
             isbn: ISBN of the book
             status: New status
@@ -134,10 +186,60 @@ class BookCatalog:
         """
         book = self._books.get(isbn)
         if book:
+            self._version += 1
+            self._status_counts[book.status] -= 1
             book.status = status
+            self._status_counts[status] += 1
+            self._track_due_date(book)
             return True
         return False
 
+    def _track_due_date(self, book: Book) -> None:
+        """Replace the due date counted for a book with its current one."""
+        # The stored date is removed, as the book's may have changed since.
+        old = self._due_dates.pop(book.isbn, None)
+        if old is not None:
+            self._due_counts[old] -= 1
+            if not self._due_counts[old]:
+                del self._due_counts[old]
+        if book.status == BookStatus.BORROWED and book.due_date:
+            self._due_dates[book.isbn] = book.due_date
+            self._due_counts[book.due_date] += 1
+
+    def get_version(self) -> int:
+        """Get a number that changes whenever the catalog is modified."""
+        return self._version
+
+    def count_books(self) -> int:
+        """Get the total number of books in the catalog."""
+        return len(self._books)
+
+    def count_by_status(self, status: BookStatus) -> int:
+        """
+        Get the number of books with a given status.
+
+        Args:
+            status: Status to count
+
+        Returns:
+            Number of books currently in that status
+        """
+        return self._status_counts[status]
+
+    def count_overdue(self, today: date) -> int:
+        """
+        Get the number of borrowed books that are overdue.
+
+        Args:
+            today: Reference date; books due before it are overdue
+
+        Returns:
+            Number of overdue books
+        """
+        return sum(
+            count for due_date, count in self._due_counts.items() if due_date < today
+        )
+
 
 def create_sample_catalog() -> BookCatalog:
     """Create a catalog with sample books for testing."""
@@ -10,6 +10,7 @@ class Config:
     max_books_per_member: int = 3
     loan_period_days: int = 14
     late_fee_per_day: float = 0.50
+    hold_period_days: int = 3
     cache_ttl: int = 300  # seconds
 
 
@@ -0,0 +1,294 @@
+"""Append-only event log and snapshots for library transactions."""
+
+import json
+import os
+import struct
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterator, List, Tuple
+
+from .book_api import Book
+from .member_manager import Member
+
+# Record header: event type (1 byte) and payload length (4 bytes).
+_HEADER = struct.Struct("<BI")
+_STR_LEN = struct.Struct("<H")
+_INT = struct.Struct("<i")
+
+
+class EventType(Enum):
+    """Kinds of recorded library transactions."""
+
+    ADD_BOOK = 1
+    BORROW = 2
+    RETURN = 3
+    UPDATE_STATUS = 4
+    REGISTER_MEMBER = 5
+    DEACTIVATE_MEMBER = 6
+    RESERVE = 7
+    CANCEL_RESERVATION = 8
+    EXPIRE_HOLDS = 9
+
+
+# Field layout per event type: "s" is a UTF-8 string, "i" a 32-bit integer
+# (dates are stored as proleptic Gregorian ordinals, a missing date as 0).
+_LAYOUTS = {
+    EventType.ADD_BOOK: "sssisssi",
+    EventType.BORROW: "ssii",
+    EventType.RETURN: "ssi",
+    EventType.UPDATE_STATUS: "ssi",
+    EventType.REGISTER_MEMBER: "sssii",
+    EventType.DEACTIVATE_MEMBER: "s",
+    EventType.RESERVE: "ssi",
+    EventType.CANCEL_RESERVATION: "ssi",
+    EventType.EXPIRE_HOLDS: "i",
+}
+
+
+@dataclass(frozen=True)
+class Event:
+    """
+    A single recorded transaction.
+
+    Events carry the effective outcome of a transaction (such as the due
+    date of a loan), so replaying them does not depend on the `Config` in
+    use at recovery time. The meaning of `args` depends on `kind`:
+
+    - ADD_BOOK: (isbn, title, author, year, genre, status value,
+      borrowed_by or "", due date ordinal or 0)
+    - BORROW: (isbn, member_id, date ordinal, due date ordinal)
+    - RETURN: (isbn, member_id, date ordinal)
+    - UPDATE_STATUS: (isbn, status value, date ordinal)
+    - REGISTER_MEMBER: (member_id, name, email, join date ordinal, active)
+    - DEACTIVATE_MEMBER: (member_id,)
+    - RESERVE: (isbn, member_id, priority)
+    - CANCEL_RESERVATION: (isbn, member_id, date ordinal)
+    - EXPIRE_HOLDS: (date ordinal,)
+    """
+
+    kind: EventType
+    args: tuple
+
+
+def _encode(event: Event) -> bytes:
+    parts = []
+    for code, value in zip(_LAYOUTS[event.kind], event.args):
+        if code == "s":
+            data = value.encode("utf-8")
+            parts.append(_STR_LEN.pack(len(data)))
+            parts.append(data)
+        else:
+            parts.append(_INT.pack(value))
+    payload = b"".join(parts)
+    return _HEADER.pack(event.kind.value, len(payload)) + payload
+
+
+def _decode(kind: EventType, payload: bytes) -> Event:
+    args = []
+    pos = 0
+    for code in _LAYOUTS[kind]:
+        if code == "s":
+            (length,) = _STR_LEN.unpack_from(payload, pos)
+            pos += _STR_LEN.size
+            args.append(payload[pos : pos + length].decode("utf-8"))
+            pos += length
+        else:
+            args.append(_INT.unpack_from(payload, pos)[0])
+            pos += _INT.size
+    return Event(kind, tuple(args))
+
+
+class EventLog:
+    """
+    Append-only binary log of library events.
+
+    Each record is a 5-byte header followed by length-prefixed fields. A
+    record cut short by a crash is ignored when reading, so the log can
+    always be replayed up to the last complete event.
+    """
+
+    def __init__(self, path: str, sync: bool = False):
+        """
+        Open (or create) an event log.
+
+        Args:
+            path: File path of the log
+            sync: If True, fsync after every append for durability
+        """
+        self.path = path
+        self.sync = sync
+        self._file = open(path, "ab")
+
+    def append(self, event: Event) -> int:
+        """
+        Append an event to the log.
+
+        Args:
+            event: Event to record
+
+        Returns:
+            Offset of the end of the log after the append
+        """
+        self._file.write(_encode(event))
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def size(self) -> int:
+        """Get the current size of the log in bytes."""
+        return self._file.tell()
+
+    def read_events(self, offset: int = 0) -> Iterator[Tuple[Event, int]]:
+        """
+        Read events from the log.
+
+        Args:
+            offset: Byte offset to start reading from
+
+        Yields:
+            Tuples of (event, offset after the event)
+        """
+        with open(self.path, "rb") as f:
+            data = f.read()
+        end = len(data)
+        pos = offset
+        while pos + _HEADER.size <= end:
+            kind, length = _HEADER.unpack_from(data, pos)
+            start = pos + _HEADER.size
+            if start + length > end:
+                break
+            pos = start + length
+            yield _decode(EventType(kind), data[start:pos]), pos
+
+    def truncate(self, offset: int) -> None:
+        """
+        Cut the log at a byte offset, dropping everything after it.
+
+        Args:
+            offset: New size of the log
+        """
+        self._file.truncate(offset)
+        self._file.seek(offset)
+
+    def close(self) -> None:
+        """Close the log file."""
+        self._file.close()
+
+
+def save_snapshot(library, path: str, log_offset: int) -> None:
+    """
+    Write the state of a library to a snapshot file.
+
+    The file is written to a temporary name and then renamed, so an
+    interrupted snapshot never replaces a good one.
+
+    Args:
+        library: Library whose catalog, members and reservations are saved
+        path: File path of the snapshot
+        log_offset: Log offset up to which the snapshot includes events
+    """
+    state = {
+        "log_offset": log_offset,
+        "books": [book.to_dict() for book in library.catalog._books.values()],
+        "members": [
+            member.to_dict() for member in library.members._members.values()
+        ],
+        "reservations": library.reservations.to_dict(),
+    }
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(library, path: str) -> int:
+    """
+    Restore a library's catalog, members, loans and reservations from a
+    snapshot file.
+
+    Args:
+        library: Empty library to fill
+        path: File path of the snapshot
+
+    Returns:
+        Log offset to resume replay from, 0 if there is no snapshot
+    """
+    if not os.path.exists(path):
+        return 0
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+
+    for data in state["members"]:
+        library.members.register_member(Member.from_dict(data))
+    for data in state["books"]:
+        book = Book.from_dict(data)
+        library.catalog.add_book(book)
+        if book.borrowed_by:
+            library.loans.add_loan(book.isbn, book.borrowed_by)
+    library.reservations.load_dict(state["reservations"])
+    return state["log_offset"]
+
+
+class Journal:
+    """
+    Event log with periodic snapshots of a library.
+
+    After every `snapshot_interval` recorded events the full library state
+    is written to the snapshot file, so recovery only replays the events
+    recorded since the last snapshot.
+    """
+
+    def __init__(
+        self, log_path: str, snapshot_path: str, snapshot_interval: int = 1000
+    ):
+        self.log = EventLog(log_path)
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self._events_since_snapshot = 0
+
+    def record(self, library, event: Event) -> None:
+        """
+        Record an event, taking a snapshot when the interval is reached.
+
+        Args:
+            library: Library the event was applied to
+            event: Event to record
+        """
+        offset = self.log.append(event)
+        self._events_since_snapshot += 1
+        if self._events_since_snapshot >= self.snapshot_interval:
+            save_snapshot(library, self.snapshot_path, offset)
+            self._events_since_snapshot = 0
+
+    def snapshot(self, library) -> None:
+        """Write a snapshot of the library at the current end of the log."""
+        save_snapshot(library, self.snapshot_path, self.log.size())
+        self._events_since_snapshot = 0
+
+    def pending_events(self, offset: int) -> List[Event]:
+        """
+        Get the events recorded after a log offset.
+
+        A partially written record at the end of the log is cut off, so new
+        events are appended right after the last complete one.
+
+        Args:
+            offset: Log offset stored in the last snapshot
+
+        Returns:
+            Events to replay, in recording order
+        """
+        events = []
+        end = offset
+        for event, end in self.log.read_events(offset):
+            events.append(event)
+        if end < self.log.size():
+            self.log.truncate(end)
+        self._events_since_snapshot = len(events)
+        return events
+
+    def close(self) -> None:
+        """Close the underlying log."""
+        self.log.close()
+
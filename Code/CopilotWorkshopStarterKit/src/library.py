@@ -1,65 +1,294 @@
 """Main library management system."""
 
-from typing import Optional, List
+from typing import Callable, Optional, List
 from datetime import date, timedelta
 from .book_api import BookCatalog, Book, BookStatus, create_sample_catalog
 from .member_manager import MemberRegistry, Member
+from .loan_table import LoanTable
+from .reservations import ReservationManager
+from .event_log import Event, EventType, Journal, load_snapshot
 from .config import Config
 
 
 class Library:
-    """Main library management class."""
+    """
+    Main library management class.
 
-    def __init__(self, config: Config):
+    Every successful transaction made through the library (adding books,
+    status updates, borrowing, returning, member registration and
+    deactivation, reservations) is passed as an `Event` to the registered
+    listeners and, if a journal is given, recorded to its event log.
+
+    Members can reserve books that are not available. When such a book
+    becomes free it is set to RESERVED and held for the next member in its
+    queue, who can borrow it until the hold expires.
+    """
+
+    def __init__(self, config: Config, journal: Optional[Journal] = None):
         self.config = config
         self.catalog = BookCatalog()
         self.members = MemberRegistry()
+        self.loans = LoanTable()
+        self.reservations = ReservationManager(config.hold_period_days)
+        self.journal = journal
+        self._listeners: List[Callable[[Event], None]] = []
+
+    def add_listener(self, listener: Callable[[Event], None]) -> None:
+        """
+        Register a callback for every successful transaction.
+
+        Args:
+            listener: Called with the transaction's `Event`
+        """
+        self._listeners.append(listener)
+
+    @classmethod
+    def recover(cls, config: Config, journal: Journal) -> "Library":
+        """
+        Rebuild a library from a journal's last snapshot and event log.
+
+        Args:
+            config: Library configuration
+            journal: Journal to restore from and to record to afterwards
+
+        Returns:
+            Library in the state of the last recorded event
+        """
+        library = cls(config)
+        offset = load_snapshot(library, journal.snapshot_path)
+        for event in journal.pending_events(offset):
+            library.apply_event(event)
+        library.journal = journal
+        return library
+
+    def apply_event(self, event: Event) -> None:
+        """
+        Apply a recorded event to the library.
+
+        The recorded outcome is applied as is: loan limits, member status
+        and availability are not checked again, and due dates come from the
+        event rather than from the current `Config`.
+
+        Args:
+            event: Event read from an event log
+        """
+        kind, args = event.kind, event.args
+        if kind == EventType.ADD_BOOK:
+            isbn, title, author, year, genre, status, borrowed_by, due = args
+            self._add_book(
+                Book(
+                    isbn,
+                    title,
+                    author,
+                    year,
+                    genre,
+                    BookStatus(status),
+                    borrowed_by or None,
+                    date.fromordinal(due) if due else None,
+                )
+            )
+        elif kind == EventType.BORROW:
+            self._lend(args[0], args[1], date.fromordinal(args[3]))
+        elif kind == EventType.RETURN:
+            self._take_back(args[0], args[1], date.fromordinal(args[2]))
+        elif kind == EventType.UPDATE_STATUS:
+            self.update_book_status(
+                args[0], BookStatus(args[1]), date.fromordinal(args[2])
+            )
+        elif kind == EventType.REGISTER_MEMBER:
+            member_id, name, email, join_date, active = args
+            self.members.register_member(
+                Member(
+                    member_id, name, email, date.fromordinal(join_date), bool(active)
+                )
+            )
+        elif kind == EventType.DEACTIVATE_MEMBER:
+            self.members.deactivate_member(args[0])
+        elif kind == EventType.RESERVE:
+            self.reservations.reserve(args[0], args[1], bool(args[2]))
+        elif kind == EventType.CANCEL_RESERVATION:
+            self.cancel_reservation(args[0], args[1], date.fromordinal(args[2]))
+        elif kind == EventType.EXPIRE_HOLDS:
+            self.expire_holds(date.fromordinal(args[0]))
+
+    def _record(self, kind: EventType, *args) -> None:
+        if not self.journal and not self._listeners:
+            return
+        event = Event(kind, args)
+        if self.journal:
+            self.journal.record(self, event)
+        for listener in self._listeners:
+            listener(event)
+
+    def add_book(self, book: Book) -> bool:
+        """
+        Add a book to the catalog.
+
+        Args:
+            book: Book object to add
+
+        Returns:
+            True if book was added, False if ISBN already exists
+        """
+        if not self._add_book(book):
+            return False
+        self._record(
+            EventType.ADD_BOOK,
+            book.isbn,
+            book.title,
+            book.author,
+            book.year,
+            book.genre,
+            book.status.value,
+            book.borrowed_by or "",
+            book.due_date.toordinal() if book.due_date else 0,
+        )
+        return True
+
+    def _add_book(self, book: Book) -> bool:
+        """Add a book to the catalog and its loan, if any, to the loan table."""
+        if not self.catalog.add_book(book):
+            return False
+        if book.borrowed_by:
+            self.loans.add_loan(book.isbn, book.borrowed_by)
+        return True
 
-    def borrow_book(self, isbn: str, member_id: str) -> bool:
+    def update_book_status(
+        self, isbn: str, status: BookStatus, today: Optional[date] = None
+    ) -> bool:
+        """
+        Update the status of a book.
+
+        Setting any status other than RESERVED releases a pending hold. A
+        book made available while members are waiting for it is put on hold
+        for the next member instead.
+
+        Args:
+            isbn: ISBN of the book
+            status: New status
+            today: Date of the transaction, defaults to the current date
+
+        Returns:
+            True if updated, False if book not found
+        """
+        today = today or date.today()
+        if not self.catalog.update_book_status(isbn, status):
+            return False
+        if status != BookStatus.RESERVED:
+            self.reservations.clear_hold(isbn)
+        if status == BookStatus.AVAILABLE:
+            self._serve_next_reservation(isbn, today)
+        self._record(EventType.UPDATE_STATUS, isbn, status.value, today.toordinal())
+        return True
+
+    def register_member(self, member: Member) -> bool:
+        """
+        Register a new member.
+
+        Args:
+            member: Member object to register
+
+        Returns:
+            True if registered, False if member_id already exists
+        """
+        if not self.members.register_member(member):
+            return False
+        self._record(
+            EventType.REGISTER_MEMBER,
+            member.member_id,
+            member.name,
+            member.email,
+            member.join_date.toordinal(),
+            int(member.active),
+        )
+        return True
+
+    def deactivate_member(self, member_id: str) -> bool:
+        """
+        Deactivate a member account.
+
+        Args:
+            member_id: The member's ID
+
+        Returns:
+            True if deactivated, False if member not found
+        """
+        if not self.members.deactivate_member(member_id):
+            return False
+        self._record(EventType.DEACTIVATE_MEMBER, member_id)
+        return True
+
+    def borrow_book(
+        self, isbn: str, member_id: str, today: Optional[date] = None
+    ) -> bool:
         """
         Process a book borrowing transaction.
 
         Args:
             isbn: ISBN of the book to borrow
             member_id: ID of the member borrowing the book
+            today: Date of the transaction, defaults to the current date
 
         Returns:
             True if successful, False otherwise
         """
+        today = today or date.today()
+        # A hold that ran out must not let its member borrow the book.
+        self.expire_holds(today)
         book = self.catalog.get_book(isbn)
         member = self.members.get_member(member_id)
 
         if not book or not member:
             return False
 
-        if book.status != BookStatus.AVAILABLE:
+        if book.status == BookStatus.RESERVED:
+            if self.reservations.get_hold(isbn) != member_id:
+                return False
+        elif book.status != BookStatus.AVAILABLE:
             return False
 
         if not member.active:
             return False
 
-        if len(member.borrowed_books) >= self.config.max_books_per_member:
+        if self.loans.count_loans(member_id) >= self.config.max_books_per_member:
             return False
 
-        # Process the borrowing
-        book.status = BookStatus.BORROWED
-        book.borrowed_by = member_id
-        book.due_date = date.today() + timedelta(days=self.config.loan_period_days)
-        member.borrowed_books.append(isbn)
+        due_date = today + timedelta(days=self.config.loan_period_days)
+        self._lend(isbn, member_id, due_date)
+        self._record(
+            EventType.BORROW,
+            isbn,
+            member_id,
+            today.toordinal(),
+            due_date.toordinal(),
+        )
 
         return True
 
-    def return_book(self, isbn: str, member_id: str) -> Optional[float]:
+    def _lend(self, isbn: str, member_id: str, due_date: date) -> None:
+        """Mark a book as borrowed by a member until a due date."""
+        book = self.catalog.get_book(isbn)
+        self.reservations.clear_hold(isbn)
+        book.borrowed_by = member_id
+        book.due_date = due_date
+        self.catalog.update_book_status(isbn, BookStatus.BORROWED)
+        self.loans.add_loan(isbn, member_id)
+
+    def return_book(
+        self, isbn: str, member_id: str, today: Optional[date] = None
+    ) -> Optional[float]:
         """
         Process a book return transaction.
 
         Args:
             isbn: ISBN of the book to return
             member_id: ID of the member returning the book
+            today: Date of the transaction, defaults to the current date
 
         Returns:
             Late fee amount if applicable, 0.0 if on time, None if error
         """
+        today = today or date.today()
         book = self.catalog.get_book(isbn)
         member = self.members.get_member(member_id)
 
@@ -69,22 +298,113 @@ class Library:
         if book.status != BookStatus.BORROWED or book.borrowed_by != member_id:
             return None
 
-        if isbn not in member.borrowed_books:
+        if not self.loans.has_loan(isbn, member_id):
             return None
 
         # Calculate late fee
         late_fee = 0.0
-        if book.due_date and date.today() > book.due_date:
-            days_late = (date.today() - book.due_date).days
+        if book.due_date and today > book.due_date:
+            days_late = (today - book.due_date).days
             late_fee = days_late * self.config.late_fee_per_day
 
-        # Process the return
-        book.status = BookStatus.AVAILABLE
+        self._take_back(isbn, member_id, today)
+        self._record(EventType.RETURN, isbn, member_id, today.toordinal())
+
+        return late_fee
+
+    def _take_back(self, isbn: str, member_id: str, today: date) -> None:
+        """Mark a borrowed book as returned and serve its reservations."""
+        book = self.catalog.get_book(isbn)
+        self.catalog.update_book_status(isbn, BookStatus.AVAILABLE)
         book.borrowed_by = None
         book.due_date = None
-        member.borrowed_books.remove(isbn)
+        self.loans.remove_loan(isbn, member_id)
+        self._serve_next_reservation(isbn, today)
 
-        return late_fee
+    def reserve_book(self, isbn: str, member_id: str, priority: bool = False) -> bool:
+        """
+        Put a member on the waiting list for a book that is not available.
+
+        Args:
+            isbn: ISBN of the book to reserve
+            member_id: ID of the member reserving the book
+            priority: True to queue ahead of non-priority members
+
+        Returns:
+            True if queued, False otherwise
+        """
+        book = self.catalog.get_book(isbn)
+        member = self.members.get_member(member_id)
+
+        if not book or not member or not member.active:
+            return False
+
+        if book.status == BookStatus.AVAILABLE:
+            return False
+
+        if self.loans.has_loan(isbn, member_id):
+            return False
+
+        if not self.reservations.reserve(isbn, member_id, priority):
+            return False
+
+        self._record(EventType.RESERVE, isbn, member_id, int(priority))
+        return True
+
+    def cancel_reservation(
+        self, isbn: str, member_id: str, today: Optional[date] = None
+    ) -> bool:
+        """
+        Cancel a reservation or give up a hold on a book.
+
+        Args:
+            isbn: ISBN of the reserved book
+            member_id: ID of the member
+            today: Date of the transaction, defaults to the current date
+
+        Returns:
+            True if cancelled, False if the member had no reservation
+        """
+        today = today or date.today()
+        if self.reservations.get_hold(isbn) == member_id:
+            self.reservations.clear_hold(isbn)
+            self._serve_next_reservation(isbn, today)
+        elif not self.reservations.cancel(isbn, member_id):
+            return False
+
+        self._record(EventType.CANCEL_RESERVATION, isbn, member_id, today.toordinal())
+        return True
+
+    def expire_holds(self, today: Optional[date] = None) -> List[str]:
+        """
+        Release holds that were not picked up in time.
+
+        Each expired book is held for the next member in its queue, or made
+        available if nobody else is waiting.
+
+        Args:
+            today: Reference date, defaults to the current date
+
+        Returns:
+            ISBNs of the books whose hold expired
+        """
+        today = today or date.today()
+        expired = self.reservations.expire_holds(today)
+        for isbn in expired:
+            self._serve_next_reservation(isbn, today)
+        if expired:
+            self._record(EventType.EXPIRE_HOLDS, today.toordinal())
+        return expired
+
+    def _serve_next_reservation(self, isbn: str, today: date) -> None:
+        """Hold a free book for the next waiting member, or make it available."""
+        book = self.catalog.get_book(isbn)
+        if self.reservations.queue_length(isbn):
+            if book.status != BookStatus.RESERVED:
+                self.catalog.update_book_status(isbn, BookStatus.RESERVED)
+            self.reservations.next_hold(isbn, today)
+        elif book.status == BookStatus.RESERVED:
+            self.catalog.update_book_status(isbn, BookStatus.AVAILABLE)
 
     def get_overdue_books(self) -> List[Book]:
         """Get all books that are overdue."""
@@ -107,20 +427,29 @@ class Library:
         Returns:
             List of books borrowed by the member
         """
-        member = self.members.get_member(member_id)
-        if not member:
+        if not self.members.get_member(member_id):
             return []
 
-        books = []
-        for isbn in member.borrowed_books:
-            book = self.catalog.get_book(isbn)
-            if book:
-                books.append(book)
-
-        return books
+        return self.catalog.get_books(self.loans.get_loans(member_id))
 
     def get_library_statistics(self) -> dict:
-        """Get statistics about the library."""
+        """
+        Get statistics about the library.
+
+        Uses the counters maintained by the catalog and the member registry,
+        so the cost does not depend on the number of books or members.
+        """
+        return {
+            "total_books": self.catalog.count_books(),
+            "available_books": self.catalog.count_by_status(BookStatus.AVAILABLE),
+            "borrowed_books": self.catalog.count_by_status(BookStatus.BORROWED),
+            "total_members": self.members.count_members(),
+            "active_members": self.members.count_active_members(),
+            "overdue_books": self.catalog.count_overdue(date.today()),
+        }
+
+    def recompute_library_statistics(self) -> dict:
+        """Get statistics about the library by scanning all books and members."""
         all_books = len(self.catalog._books)
         available = len(self.catalog.get_available_books())
         borrowed = len(self.catalog.get_borrowed_books())
@@ -137,6 +466,15 @@ class Library:
             "overdue_books": overdue,
         }
 
+    def verify_statistics(self) -> bool:
+        """
+        Check the maintained counters against a full recomputation.
+
+        Returns:
+            True if the counters are consistent, False otherwise
+        """
+        return self.get_library_statistics() == self.recompute_library_statistics()
+
 
 def main():
     """Main entry point for the library system."""
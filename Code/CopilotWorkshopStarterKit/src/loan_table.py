@@ -0,0 +1,91 @@
+"""Loan index linking members and borrowed books."""
+
+from typing import Dict, List, Optional
+
+
+class LoanTable:
+    """
+    Bidirectional index of active loans.
+
+    Each borrowed book maps to exactly one member, and each member maps to
+    the ISBNs they currently hold, so adding, removing and checking a loan
+    are O(1) regardless of how many books a member has borrowed. The
+    per-member ISBNs are stored as dict keys, which gives set semantics
+    while keeping them in borrowing order.
+    """
+
+    def __init__(self):
+        self._member_by_isbn: Dict[str, str] = {}
+        self._isbns_by_member: Dict[str, Dict[str, None]] = {}
+
+    def add_loan(self, isbn: str, member_id: str) -> bool:
+        """
+        Record that a member has borrowed a book.
+
+        Args:
+            isbn: ISBN of the borrowed book
+            member_id: ID of the borrowing member
+
+        Returns:
+            True if recorded, False if the book is already on loan
+        """
+        if isbn in self._member_by_isbn:
+            return False
+        self._member_by_isbn[isbn] = member_id
+        self._isbns_by_member.setdefault(member_id, {})[isbn] = None
+        return True
+
+    def remove_loan(self, isbn: str, member_id: str) -> bool:
+        """
+        Remove a loan when a book is returned.
+
+        Args:
+            isbn: ISBN of the returned book
+            member_id: ID of the returning member
+
+        Returns:
+            True if removed, False if the member does not hold the book
+        """
+        if self._member_by_isbn.get(isbn) != member_id:
+            return False
+        del self._member_by_isbn[isbn]
+        isbns = self._isbns_by_member[member_id]
+        del isbns[isbn]
+        if not isbns:
+            del self._isbns_by_member[member_id]
+        return True
+
+    def get_borrower(self, isbn: str) -> Optional[str]:
+        """
+        Get the member currently holding a book.
+
+        Args:
+            isbn: ISBN of the book
+
+        Returns:
+            Member ID if the book is on loan, None otherwise
+        """
+        return self._member_by_isbn.get(isbn)
+
+    def get_loans(self, member_id: str) -> List[str]:
+        """
+        Get the ISBNs a member currently holds.
+
+        Args:
+            member_id: ID of the member
+
+        Returns:
+            List of ISBNs in borrowing order, empty if the member has no loans
+        """
+        return list(self._isbns_by_member.get(member_id, ()))
+
+    def count_loans(self, member_id: str) -> int:
+        """Get the number of books a member currently holds."""
+        return len(self._isbns_by_member.get(member_id, ()))
+
+    def has_loan(self, isbn: str, member_id: str) -> bool:
+        """Check whether a member currently holds a book."""
+        return self._member_by_isbn.get(isbn) == member_id
+
+    def __len__(self) -> int:
+        return len(self._member_by_isbn)
@@ -1,6 +1,6 @@
 """Member management for the library system."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import Dict, List, Optional
 from datetime import date
 
@@ -13,7 +13,6 @@ class Member:
     name: str
     email: str
     join_date: date
-    borrowed_books: List[str] = field(default_factory=list)
     active: bool = True
 
     def to_dict(self) -> Dict:
@@ -22,16 +21,27 @@ class Member:
             "name": self.name,
             "email": self.email,
             "join_date": self.join_date.isoformat(),
-            "borrowed_books": self.borrowed_books,
             "active": self.active,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Member":
+        """Create a member from the output of `to_dict`."""
+        return cls(
+            member_id=data["member_id"],
+            name=data["name"],
+            email=data["email"],
+            join_date=date.fromisoformat(data["join_date"]),
+            active=data["active"],
+        )
+
 
 class MemberRegistry:
     """Manages library members."""
 
     def __init__(self):
         self._members: Dict[str, Member] = {}
+        self._active_count = 0
 
     def register_member(self, member: Member) -> bool:
         """
@@ -46,6 +56,8 @@ class MemberRegistry:
         if member.member_id in self._members:
             return False
         self._members[member.member_id] = member
+        if member.active:
+            self._active_count += 1
         return True
 
     def get_member(self, member_id: str) -> Optional[Member]:
@@ -72,10 +84,20 @@ class MemberRegistry:
         """
         member = self._members.get(member_id)
         if member:
+            if member.active:
+                self._active_count -= 1
             member.active = False
             return True
         return False
 
+    def count_members(self) -> int:
+        """Get the total number of registered members."""
+        return len(self._members)
+
+    def count_active_members(self) -> int:
+        """Get the number of active members."""
+        return self._active_count
+
     def get_active_members(self) -> List[Member]:
         """Get all active members."""
         return [member for member in self._members.values() if member.active]
@@ -0,0 +1,309 @@
+"""Book recommendations from members' loan history."""
+
+import heapq
+import math
+from collections import Counter
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .book_api import Book, BookCatalog
+from .event_log import Event, EventType
+
+# Sparse matrices are stored as dict-of-dicts: row key -> {column key: value}.
+SparseMatrix = Dict[str, Dict[str, float]]
+
+
+@dataclass
+class _CachedTopK:
+    """A member's top-k list and what it was computed from."""
+
+    isbns: List[str]
+    computed_at: int
+    top_k: int
+    used_favourites: bool
+    used_popular: bool
+
+
+class Recommender:
+    """
+    Item-item collaborative filtering over loan history.
+
+    The member x book loan matrix B is kept as sparse rows, and the book x
+    book co-borrowing matrix C = B^T B is updated in place with every loan.
+    Book similarity is the cosine C[i][j] / sqrt(C[i][i] * C[j][j]), and
+    only the `max_neighbors` most similar books are kept per book, which
+    keeps the similarity matrix S sparse. A member's scores are the sparse
+    product of their loan row with S.
+
+    Members without enough co-borrowing signal get books by their favourite
+    authors and genres; members without any history get the most borrowed
+    books.
+
+    The top-k list for each member is cached and invalidated lazily. Every
+    change advances a clock: a loan stamps the borrowed book and every book
+    borrowed together with it, whose similarity rows changed, and a new
+    catalog entry stamps its author and genre. A cached list is reused while
+    no book in the member's history (and, if the list used the fallbacks,
+    none of their authors and genres, nor the most borrowed books) changed
+    after it was computed, so a loan costs the same however many members
+    are affected. `refresh()` recomputes all outdated members in one batch.
+    """
+
+    def __init__(
+        self, catalog: BookCatalog, top_k: int = 10, max_neighbors: int = 50
+    ):
+        self.catalog = catalog
+        self.top_k = top_k
+        self.max_neighbors = max_neighbors
+        self._history: Dict[str, Dict[str, None]] = {}
+        self._borrowers: Dict[str, Set[str]] = {}
+        self._cooccurrence: SparseMatrix = {}
+        self._neighbors: SparseMatrix = {}
+        self._stale_books: Set[str] = set()
+        self._by_author: Dict[str, List[str]] = {}
+        self._by_genre: Dict[str, List[str]] = {}
+        self._clock = 0
+        self._book_changed: Dict[str, int] = {}
+        self._author_changed: Dict[str, int] = {}
+        self._genre_changed: Dict[str, int] = {}
+        self._cache: Dict[str, _CachedTopK] = {}
+        self._popular: List[str] = []
+        self._popular_stale = True
+        self._popular_changed = 0
+        for book in catalog._books.values():
+            self._index_book(book)
+
+    def handle_event(self, event: Event) -> None:
+        """
+        Update the model from a library transaction.
+
+        Register this method with `Library.add_listener` to keep the
+        recommender in sync with borrowing and catalog changes.
+
+        Args:
+            event: Transaction event from the library
+        """
+        if event.kind == EventType.BORROW:
+            self.record_loan(event.args[1], event.args[0])
+        elif event.kind == EventType.ADD_BOOK:
+            book = self.catalog.get_book(event.args[0])
+            if book:
+                self.add_book(book)
+
+    def load_history(self, history: Iterable[Tuple[str, str]]) -> None:
+        """
+        Add past loans in bulk.
+
+        Args:
+            history: (member_id, isbn) pairs in loan order
+        """
+        # Similarity rows are marked once per book, not once per loan.
+        borrowed = {
+            isbn for member_id, isbn in history if self._add_loan(member_id, isbn)
+        }
+        self._mark_changed(borrowed)
+
+    def record_loan(self, member_id: str, isbn: str) -> None:
+        """
+        Add a loan to the member's history and the co-borrowing counts.
+
+        Args:
+            member_id: ID of the borrowing member
+            isbn: ISBN of the borrowed book
+        """
+        if self._add_loan(member_id, isbn):
+            self._mark_changed((isbn,))
+
+    def _add_loan(self, member_id: str, isbn: str) -> bool:
+        """Update the counts for a loan, False if the member had the book."""
+        history = self._history.setdefault(member_id, {})
+        if isbn in history:
+            return False
+
+        row = self._cooccurrence.setdefault(isbn, {})
+        row[isbn] = row.get(isbn, 0) + 1
+        for other in history:
+            row[other] = row.get(other, 0) + 1
+            other_row = self._cooccurrence[other]
+            other_row[isbn] = other_row.get(isbn, 0) + 1
+        history[isbn] = None
+        self._borrowers.setdefault(isbn, set()).add(member_id)
+        self._popular_stale = True
+        return True
+
+    def _mark_changed(self, isbns: Iterable[str]) -> None:
+        """Stamp the similarity rows that loans of these books changed."""
+        # C[isbn][isbn] changed, so every book borrowed together with a
+        # borrowed book has a new similarity to it.
+        self._clock += 1
+        for isbn in isbns:
+            row = self._cooccurrence[isbn]
+            self._stale_books.update(row)
+            self._book_changed.update(dict.fromkeys(row, self._clock))
+
+    def add_book(self, book: Book) -> None:
+        """
+        Make a new catalog entry available for recommendation.
+
+        Args:
+            book: Book that was added to the catalog
+        """
+        self._index_book(book)
+        self._clock += 1
+        self._author_changed[book.author] = self._clock
+        self._genre_changed[book.genre] = self._clock
+
+    def recommend(self, member_id: str) -> List[Book]:
+        """
+        Get the top-k recommendations for a member.
+
+        Args:
+            member_id: ID of the member
+
+        Returns:
+            Recommended books, best first
+        """
+        cached = self._cache.get(member_id)
+        if cached is None or self._is_outdated(member_id, cached):
+            cached = self._cache[member_id] = self._compute(member_id)
+        return self.catalog.get_books(cached.isbns)
+
+    def refresh(self) -> int:
+        """
+        Recompute the recommendations of all members without an up-to-date list.
+
+        Returns:
+            Number of members recomputed
+        """
+        recomputed = 0
+        for member_id in self._history.keys() | self._cache.keys():
+            cached = self._cache.get(member_id)
+            if cached is None or self._is_outdated(member_id, cached):
+                self._cache[member_id] = self._compute(member_id)
+                recomputed += 1
+        return recomputed
+
+    def similar_books(self, isbn: str) -> List[Tuple[str, float]]:
+        """
+        Get the books most often borrowed together with a book.
+
+        Args:
+            isbn: ISBN of the book
+
+        Returns:
+            (isbn, cosine similarity) pairs, most similar first
+        """
+        self._update_neighbors()
+        neighbors = self._neighbors.get(isbn, {})
+        return sorted(neighbors.items(), key=lambda item: item[1], reverse=True)
+
+    def _index_book(self, book: Book) -> None:
+        self._by_author.setdefault(book.author, []).append(book.isbn)
+        self._by_genre.setdefault(book.genre, []).append(book.isbn)
+
+    def _update_neighbors(self) -> None:
+        """Rebuild the similarity rows of books whose co-borrowing changed."""
+        cooccurrence = self._cooccurrence
+        for isbn in self._stale_books:
+            row = cooccurrence[isbn]
+            norm = row[isbn]
+            similarities = (
+                (other, count / math.sqrt(norm * cooccurrence[other][other]))
+                for other, count in row.items()
+                if other != isbn
+            )
+            self._neighbors[isbn] = dict(
+                heapq.nlargest(
+                    self.max_neighbors, similarities, key=lambda item: item[1]
+                )
+            )
+        self._stale_books.clear()
+
+    def _is_outdated(self, member_id: str, cached: _CachedTopK) -> bool:
+        """Check whether anything a cached list was computed from changed."""
+        computed_at = cached.computed_at
+        if cached.top_k != self.top_k:
+            return True
+        history = self._history.get(member_id, {})
+        book_changed = self._book_changed
+        if any(book_changed.get(isbn, 0) > computed_at for isbn in history):
+            return True
+        if cached.used_favourites and any(
+            self._author_changed.get(book.author, 0) > computed_at
+            or self._genre_changed.get(book.genre, 0) > computed_at
+            for book in self.catalog.get_books(history)
+        ):
+            return True
+        if cached.used_popular:
+            self._popular_books()
+            return self._popular_changed > computed_at
+        return False
+
+    def _compute(self, member_id: str) -> _CachedTopK:
+        """Compute a member's top-k ISBNs."""
+        self._update_neighbors()
+        history = self._history.get(member_id, {})
+
+        # Sparse row-vector x sparse-matrix product: loans x similarities.
+        scores: Dict[str, float] = {}
+        for isbn in history:
+            for other, similarity in self._neighbors.get(isbn, {}).items():
+                if other not in history:
+                    scores[other] = scores.get(other, 0.0) + similarity
+        top = [
+            isbn
+            for isbn, _ in heapq.nlargest(
+                self.top_k, scores.items(), key=lambda item: item[1]
+            )
+        ]
+        used_favourites = used_popular = False
+        if len(top) < self.top_k:
+            used_favourites = True
+            used_popular = self._fill_from_fallback(history, top)
+        return _CachedTopK(top, self._clock, self.top_k, used_favourites, used_popular)
+
+    def _fill_from_fallback(self, history: Dict[str, None], top: List[str]) -> bool:
+        """
+        Pad a recommendation list with favourite authors, genres, then hits.
+
+        Returns:
+            True if the most borrowed books were needed
+        """
+        chosen = set(top)
+        authors: Counter = Counter()
+        genres: Counter = Counter()
+        for book in self.catalog.get_books(history):
+            authors[book.author] += 1
+            genres[book.genre] += 1
+
+        def add(candidates: Iterable[str]) -> bool:
+            for isbn in candidates:
+                if len(top) >= self.top_k:
+                    return True
+                if isbn not in history and isbn not in chosen:
+                    top.append(isbn)
+                    chosen.add(isbn)
+            return len(top) >= self.top_k
+
+        favourites = chain(
+            *(self._by_author[author] for author, _ in authors.most_common()),
+            *(self._by_genre[genre] for genre, _ in genres.most_common()),
+        )
+        if add(favourites):
+            return False
+        add(self._popular_books())
+        return True
+
+    def _popular_books(self) -> List[str]:
+        if self._popular_stale:
+            popular = heapq.nlargest(
+                self.top_k * 4,
+                self._borrowers,
+                key=lambda isbn: len(self._borrowers[isbn]),
+            )
+            if popular != self._popular:
+                self._popular = popular
+                self._popular_changed = self._clock
+            self._popular_stale = False
+        return self._popular
@@ -0,0 +1,244 @@
+"""Reservation queues and pickup holds for borrowed books."""
+
+import heapq
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Called with (isbn, member_id, hold expiry date) when a hold becomes ready.
+HoldListener = Callable[[str, str, date], None]
+
+
+class ReservationQueue:
+    """
+    Waiting list for a single book.
+
+    Members are served first-come, first-served, with priority members ahead
+    of everyone else. Entries live in a binary heap ordered by (priority
+    rank, arrival number), so adding and taking the next member are
+    O(log n). Cancellation marks the entry as removed in O(1); removed
+    entries are skipped when they reach the top and the heap is rebuilt once
+    they make up more than half of it.
+    """
+
+    def __init__(self):
+        self._heap: List[list] = []
+        self._entries: Dict[str, list] = {}
+        self._counter = 0
+
+    def push(self, member_id: str, priority: bool = False) -> bool:
+        """
+        Add a member to the end of the queue (or of the priority section).
+
+        Args:
+            member_id: ID of the waiting member
+            priority: True to queue ahead of all non-priority members
+
+        Returns:
+            True if queued, False if the member is already waiting
+        """
+        if member_id in self._entries:
+            return False
+        entry = [0 if priority else 1, self._counter, member_id]
+        self._counter += 1
+        self._entries[member_id] = entry
+        heapq.heappush(self._heap, entry)
+        return True
+
+    def pop(self) -> Optional[str]:
+        """
+        Remove and return the next member in line.
+
+        Returns:
+            Member ID, or None if nobody is waiting
+        """
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if entry[2] is not None:
+                del self._entries[entry[2]]
+                return entry[2]
+        return None
+
+    def cancel(self, member_id: str) -> bool:
+        """
+        Remove a member from the queue.
+
+        Args:
+            member_id: ID of the waiting member
+
+        Returns:
+            True if removed, False if the member was not waiting
+        """
+        entry = self._entries.pop(member_id, None)
+        if entry is None:
+            return False
+        entry[2] = None
+        if len(self._heap) > 2 * len(self._entries):
+            self._heap = list(self._entries.values())
+            heapq.heapify(self._heap)
+        return True
+
+    def waiting(self) -> List[Tuple[str, bool]]:
+        """Get the waiting members and their priority flags in serving order."""
+        return [
+            (entry[2], entry[0] == 0) for entry in sorted(self._entries.values())
+        ]
+
+    def __contains__(self, member_id: str) -> bool:
+        return member_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ReservationManager:
+    """
+    Reservation queues and pickup holds for all books.
+
+    When a reserved book comes back, the next member in its queue gets a
+    hold that expires after `hold_period_days`; registered listeners are
+    notified. Hold expiry dates are kept in a heap, so expiring holds costs
+    O(log n) per expired hold rather than a scan over all books.
+
+    The manager only tracks who is waiting and who holds which book; the
+    `Library` keeps the book statuses in sync.
+    """
+
+    def __init__(self, hold_period_days: int = 3):
+        self.hold_period_days = hold_period_days
+        self._queues: Dict[str, ReservationQueue] = {}
+        self._holds: Dict[str, Tuple[str, date]] = {}
+        self._expiries: List[Tuple[date, str, str]] = []
+        self._listeners: List[HoldListener] = []
+
+    def add_listener(self, listener: HoldListener) -> None:
+        """
+        Register a callback for holds that become ready for pickup.
+
+        Args:
+            listener: Called with (isbn, member_id, expiry date)
+        """
+        self._listeners.append(listener)
+
+    def reserve(self, isbn: str, member_id: str, priority: bool = False) -> bool:
+        """
+        Put a member on the waiting list for a book.
+
+        Args:
+            isbn: ISBN of the book
+            member_id: ID of the member
+            priority: True to queue ahead of non-priority members
+
+        Returns:
+            True if queued, False if the member already waits for or holds it
+        """
+        if self.get_hold(isbn) == member_id:
+            return False
+        queue = self._queues.setdefault(isbn, ReservationQueue())
+        return queue.push(member_id, priority)
+
+    def cancel(self, isbn: str, member_id: str) -> bool:
+        """
+        Remove a member from the waiting list for a book.
+
+        Args:
+            isbn: ISBN of the book
+            member_id: ID of the member
+
+        Returns:
+            True if removed, False if the member was not waiting
+        """
+        queue = self._queues.get(isbn)
+        if not queue or not queue.cancel(member_id):
+            return False
+        if not queue:
+            del self._queues[isbn]
+        return True
+
+    def queue_length(self, isbn: str) -> int:
+        """Get the number of members waiting for a book."""
+        queue = self._queues.get(isbn)
+        return len(queue) if queue else 0
+
+    def get_hold(self, isbn: str) -> Optional[str]:
+        """
+        Get the member a book is held for.
+
+        Args:
+            isbn: ISBN of the book
+
+        Returns:
+            Member ID if the book is on hold, None otherwise
+        """
+        hold = self._holds.get(isbn)
+        return hold[0] if hold else None
+
+    def next_hold(self, isbn: str, today: date) -> Optional[str]:
+        """
+        Hold a book for the next member in its queue.
+
+        Args:
+            isbn: ISBN of the book that became free
+            today: Date the hold starts
+
+        Returns:
+            Member ID the book is now held for, None if nobody is waiting
+        """
+        self._holds.pop(isbn, None)
+        queue = self._queues.get(isbn)
+        member_id = queue.pop() if queue else None
+        if queue is not None and not queue:
+            del self._queues[isbn]
+        if member_id is None:
+            return None
+
+        expires = today + timedelta(days=self.hold_period_days)
+        self._set_hold(isbn, member_id, expires)
+        for listener in self._listeners:
+            listener(isbn, member_id, expires)
+        return member_id
+
+    def clear_hold(self, isbn: str) -> None:
+        """Remove the hold on a book, e.g. once it has been picked up."""
+        self._holds.pop(isbn, None)
+
+    def expire_holds(self, today: date) -> List[str]:
+        """
+        Remove all holds whose pickup period ended before a date.
+
+        Args:
+            today: Reference date
+
+        Returns:
+            ISBNs of the books whose hold expired
+        """
+        expired = []
+        while self._expiries and self._expiries[0][0] < today:
+            expires, isbn, member_id = heapq.heappop(self._expiries)
+            if self._holds.get(isbn) == (member_id, expires):
+                del self._holds[isbn]
+                expired.append(isbn)
+        return expired
+
+    def _set_hold(self, isbn: str, member_id: str, expires: date) -> None:
+        self._holds[isbn] = (member_id, expires)
+        heapq.heappush(self._expiries, (expires, isbn, member_id))
+
+    def to_dict(self) -> Dict:
+        """Get the queues and holds as JSON-serializable data for `load_dict`."""
+        return {
+            "queues": {
+                isbn: queue.waiting() for isbn, queue in self._queues.items()
+            },
+            "holds": {
+                isbn: [member_id, expires.isoformat()]
+                for isbn, (member_id, expires) in self._holds.items()
+            },
+        }
+
+    def load_dict(self, data: Dict) -> None:
+        """Restore queues and holds from the output of `to_dict`."""
+        for isbn, waiting in data["queues"].items():
+            for member_id, priority in waiting:
+                self.reserve(isbn, member_id, priority)
+        for isbn, (member_id, expires) in data["holds"].items():
+            self._set_hold(isbn, member_id, date.fromisoformat(expires))
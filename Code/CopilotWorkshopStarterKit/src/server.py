@@ -0,0 +1,372 @@
+"""Asynchronous HTTP/JSON API for the library system."""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .book_api import Book, create_sample_catalog
+from .config import DEFAULT_CONFIG
+from .library import Library
+from .member_manager import Member
+
+MAX_PAGE_SIZE = 100
+
+_REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+}
+
+
+@dataclass
+class Response:
+    """An HTTP response produced by the API."""
+
+    status: int
+    body: bytes = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    def to_bytes(self, keep_alive: bool) -> bytes:
+        """Serialize the response as HTTP/1.1."""
+        lines = [f"HTTP/1.1 {self.status} {_REASONS[self.status]}"]
+        headers = dict(self.headers)
+        if self.body:
+            headers.setdefault("Content-Type", "application/json")
+        headers["Content-Length"] = str(len(self.body))
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        head = "\r\n".join(lines) + "\r\n\r\n"
+        return head.encode("latin-1") + self.body
+
+
+def _json_response(status: int, data, etag: Optional[str] = None) -> Response:
+    headers = {"ETag": etag} if etag else {}
+    return Response(status, json.dumps(data).encode("utf-8"), headers)
+
+
+def _error(status: int, message: str) -> Response:
+    return _json_response(status, {"error": message})
+
+
+def _paginate(items: List[Book], query: Dict[str, str]) -> Optional[dict]:
+    """Cut one page out of a list of books, None if the parameters are invalid."""
+    try:
+        page = int(query.get("page", "1"))
+        per_page = int(query.get("per_page", "20"))
+    except ValueError:
+        return None
+    if page < 1 or not 1 <= per_page <= MAX_PAGE_SIZE:
+        return None
+    start = (page - 1) * per_page
+    return {
+        "items": [book.to_dict() for book in items[start : start + per_page]],
+        "page": page,
+        "per_page": per_page,
+        "total": len(items),
+    }
+
+
+class ResponseCache:
+    """
+    Bounded cache of serialized catalog responses.
+
+    Entries are tagged with the catalog version they were built from and
+    are discarded once the catalog changes or `ttl` seconds have passed.
+    The least recently used entry is evicted when the cache is full.
+    """
+
+    def __init__(self, max_size: int = 256, ttl: float = 300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[int, float, Response]]" = OrderedDict()
+
+    def get(self, key: str, version: int) -> Optional[Response]:
+        """
+        Get a cached response.
+
+        Args:
+            key: Request target (path and query string)
+            version: Current catalog version
+
+        Returns:
+            Cached response if present and still valid, None otherwise
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        cached_version, expires, response = entry
+        if cached_version != version or time.monotonic() > expires:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def put(self, key: str, version: int, response: Response) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Request target (path and query string)
+            version: Catalog version the response was built from
+            response: Response to cache
+        """
+        self._entries[key] = (version, time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LibraryServer:
+    """
+    HTTP API around a `Library`.
+
+    Routes:
+
+    - GET /books?title=&author=&page=&per_page= - search the catalog
+    - GET /books/{isbn} - get a single book
+    - POST /books/{isbn}/borrow - borrow a book, body {"member_id": ...}
+    - POST /books/{isbn}/return - return a book, body {"member_id": ...}
+    - GET /members/{member_id} - get a member and their borrowed books
+    - GET /stats - library statistics
+    - GET /overdue?page=&per_page= - overdue books
+
+    Catalog reads carry an ETag derived from the catalog version and answer
+    `If-None-Match` with 304 Not Modified. Search responses are cached until
+    the catalog changes.
+    """
+
+    def __init__(self, library: Library, cache_size: int = 256):
+        self.library = library
+        self.cache = ResponseCache(cache_size, library.config.cache_ttl)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8000):
+        """
+        Start listening for connections.
+
+        Args:
+            host: Interface to bind to
+            port: Port to bind to, 0 picks a free port
+
+        Returns:
+            The running `asyncio.Server`
+        """
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", "0"))
+                body = await reader.readexactly(length) if length else b""
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" or (
+                    version == "HTTP/1.1" and connection != "close"
+                )
+                response = self.handle_request(method, target, headers, body)
+                writer.write(response.to_bytes(keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def handle_request(
+        self, method: str, target: str, headers: Dict[str, str], body: bytes = b""
+    ) -> Response:
+        """
+        Dispatch a single request.
+
+        Args:
+            method: HTTP method
+            target: Request target (path and query string)
+            headers: Request headers with lower-case names
+            body: Request body
+
+        Returns:
+            Response to send back
+        """
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split("/") if part]
+
+        if method == "GET":
+            if parts == ["books"]:
+                response = self._search_books(target, query)
+            elif len(parts) == 2 and parts[0] == "books":
+                response = self._get_book(parts[1])
+            elif len(parts) == 2 and parts[0] == "members":
+                return self._get_member(parts[1])
+            elif parts == ["stats"]:
+                return _json_response(200, self.library.get_library_statistics())
+            elif parts == ["overdue"]:
+                return self._get_overdue(query)
+            else:
+                return _error(404, "not found")
+            return self._conditional(response, headers)
+
+        if method == "POST" and len(parts) == 3 and parts[0] == "books":
+            if parts[2] == "borrow":
+                return self._borrow(parts[1], body)
+            if parts[2] == "return":
+                return self._return(parts[1], body)
+            return _error(404, "not found")
+
+        return _error(405, "method not allowed")
+
+    def _etag(self) -> str:
+        return f'W/"{self.library.catalog.get_version()}"'
+
+    @staticmethod
+    def _conditional(response: Response, headers: Dict[str, str]) -> Response:
+        etag = response.headers.get("ETag")
+        if etag and etag in headers.get("if-none-match", ""):
+            return Response(304, headers={"ETag": etag})
+        return response
+
+    def _search_books(self, target: str, query: Dict[str, str]) -> Response:
+        version = self.library.catalog.get_version()
+        cached = self.cache.get(target, version)
+        if cached:
+            return cached
+
+        catalog = self.library.catalog
+        books = list(catalog._books.values())
+        if "title" in query:
+            books = catalog.search_by_title(query["title"])
+        if "author" in query:
+            author = query["author"].lower()
+            books = [book for book in books if author in book.author.lower()]
+
+        page = _paginate(books, query)
+        if page is None:
+            return _error(400, "invalid pagination parameters")
+        response = _json_response(200, page, self._etag())
+        self.cache.put(target, version, response)
+        return response
+
+    def _get_book(self, isbn: str) -> Response:
+        book = self.library.catalog.get_book(isbn)
+        if not book:
+            return _error(404, "book not found")
+        return _json_response(200, book.to_dict(), self._etag())
+
+    def _get_member(self, member_id: str) -> Response:
+        member = self.library.members.get_member(member_id)
+        if not member:
+            return _error(404, "member not found")
+        data = member.to_dict()
+        data["borrowed_books"] = [
+            book.to_dict() for book in self.library.get_member_borrowed_books(member_id)
+        ]
+        return _json_response(200, data)
+
+    def _get_overdue(self, query: Dict[str, str]) -> Response:
+        page = _paginate(self.library.get_overdue_books(), query)
+        if page is None:
+            return _error(400, "invalid pagination parameters")
+        return _json_response(200, page)
+
+    @staticmethod
+    def _member_id(body: bytes) -> Optional[str]:
+        try:
+            member_id = json.loads(body or b"{}").get("member_id")
+        except (ValueError, AttributeError):
+            return None
+        return member_id if isinstance(member_id, str) else None
+
+    def _borrow(self, isbn: str, body: bytes) -> Response:
+        member_id = self._member_id(body)
+        if member_id is None:
+            return _error(400, "member_id is required")
+        if not self.library.borrow_book(isbn, member_id):
+            return _error(409, "book cannot be borrowed")
+        book = self.library.catalog.get_book(isbn)
+        return _json_response(200, book.to_dict())
+
+    def _return(self, isbn: str, body: bytes) -> Response:
+        member_id = self._member_id(body)
+        if member_id is None:
+            return _error(400, "member_id is required")
+        late_fee = self.library.return_book(isbn, member_id)
+        if late_fee is None:
+            return _error(409, "book cannot be returned")
+        return _json_response(200, {"isbn": isbn, "late_fee": late_fee})
+
+
+def create_sample_library(num_extra_books: int = 0) -> Library:
+    """
+    Create a library with the sample catalog and a few members.
+
+    Args:
+        num_extra_books: Number of generated books to add to the catalog
+
+    Returns:
+        Populated library
+    """
+    library = Library(DEFAULT_CONFIG)
+    library.catalog = create_sample_catalog()
+    for i in range(num_extra_books):
+        library.catalog.add_book(
+            Book(f"isbn-{i:07d}", f"Generated Book {i}", f"Author {i % 100}", 2000, "")
+        )
+    for i in range(1, 11):
+        library.members.register_member(
+            Member(f"M{i:03d}", f"Member {i}", f"m{i}@example.com", date(2024, 1, 1))
+        )
+    return library
+
+
+async def serve(host: str, port: int, num_extra_books: int = 0) -> None:
+    """Run the API with a sample library until cancelled."""
+    server = await LibraryServer(create_sample_library(num_extra_books)).start(
+        host, port
+    )
+    async with server:
+        print(f"Serving library API on http://{host}:{port}", flush=True)
+        await server.serve_forever()
+
+
+def main():
+    """Command line entry point for the library API."""
+    parser = argparse.ArgumentParser(description="Run the library HTTP API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--books", type=int, default=0, help="number of generated books to add"
+    )
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.books))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -63,3 +63,22 @@ def test_get_available_books():
     assert len(available) == 5
     for book in available:
         assert book.status == BookStatus.AVAILABLE
+
+
+def test_count_overdue_after_due_date_changes():
+    """Test that overdue counts follow books whose due date changed in place."""
+    catalog = create_sample_catalog()
+    first, second = list(catalog._books)[:2]
+    for isbn, due in ((first, date(2024, 3, 1)), (second, date(2024, 3, 20))):
+        catalog.get_book(isbn).due_date = due
+        catalog.update_book_status(isbn, BookStatus.BORROWED)
+    assert catalog.count_overdue(date(2024, 3, 10)) == 1
+
+    # Renewing a loan replaces the due date counted for the book.
+    catalog.get_book(first).due_date = date(2024, 4, 1)
+    catalog.update_book_status(first, BookStatus.BORROWED)
+    assert catalog.count_overdue(date(2024, 3, 25)) == 1
+
+    catalog.get_book(second).due_date = None
+    catalog.update_book_status(second, BookStatus.AVAILABLE)
+    assert catalog.count_overdue(date(2024, 5, 1)) == 1
@@ -0,0 +1,137 @@
+"""Tests for the event log, snapshots and replay."""
+
+from datetime import date
+from src.book_api import Book, BookStatus, create_sample_catalog
+from src.config import Config
+from src.event_log import Event, EventLog, EventType, Journal
+from src.library import Library
+from src.member_manager import Member
+
+
+def populate(library: Library) -> None:
+    """Run a mix of transactions through the library."""
+    for book in create_sample_catalog()._books.values():
+        library.add_book(book)
+    library.register_member(
+        Member("M001", "Alice Smith", "alice@example.com", date(2024, 1, 15))
+    )
+    library.register_member(
+        Member("M002", "Bob Johnson", "bob@example.com", date(2024, 2, 20))
+    )
+    library.borrow_book("978-0-13-110362-7", "M001", date(2024, 3, 1))
+    library.borrow_book("978-0-201-61622-4", "M002", date(2024, 3, 2))
+    library.return_book("978-0-13-110362-7", "M001", date(2024, 3, 10))
+    library.update_book_status("978-0-132-35088-4", BookStatus.MAINTENANCE)
+    library.reserve_book("978-0-201-61622-4", "M001")
+    library.deactivate_member("M001")
+
+
+def state(library: Library) -> tuple:
+    """Summarise a library's books, members and loans for comparison."""
+    return (
+        [book.to_dict() for book in library.catalog._books.values()],
+        [member.to_dict() for member in library.members._members.values()],
+        library.loans.get_loans("M002"),
+        library.reservations.to_dict(),
+        library.get_library_statistics(),
+    )
+
+
+def test_event_log_roundtrip(tmp_path):
+    """Test that events are read back exactly as written."""
+    log = EventLog(str(tmp_path / "events.log"))
+    events = [
+        Event(EventType.BORROW, ("978-0-13-110362-7", "M001", 738000, 738014)),
+        Event(EventType.UPDATE_STATUS, ("isbn-ü", "maintenance", 738001)),
+    ]
+    for event in events:
+        log.append(event)
+
+    assert [event for event, _ in log.read_events()] == events
+    log.close()
+
+
+def test_torn_record_is_ignored(tmp_path):
+    """Test that a partially written record at the end is dropped on recovery."""
+    path = tmp_path / "events.log"
+    log = EventLog(str(path))
+    log.append(Event(EventType.DEACTIVATE_MEMBER, ("M001",)))
+    good_size = log.size()
+    log.append(Event(EventType.DEACTIVATE_MEMBER, ("M002",)))
+    log.close()
+    path.write_bytes(path.read_bytes()[:-2])
+
+    journal = Journal(str(path), str(tmp_path / "snapshot.json"))
+    assert journal.pending_events(0) == [
+        Event(EventType.DEACTIVATE_MEMBER, ("M001",))
+    ]
+    assert journal.log.size() == good_size
+    journal.close()
+
+
+def test_recover_from_log(tmp_path):
+    """Test that replaying the log rebuilds the same library state."""
+    log_path, snapshot_path = str(tmp_path / "events.log"), str(tmp_path / "s.json")
+    journal = Journal(log_path, snapshot_path)
+    library = Library(Config(), journal)
+    populate(library)
+    journal.close()
+
+    recovered = Library.recover(Config(), Journal(log_path, snapshot_path))
+
+    assert state(recovered) == state(library)
+    assert recovered.verify_statistics()
+    recovered.journal.close()
+
+
+def test_recover_from_snapshot_and_log(tmp_path):
+    """Test recovery from a periodic snapshot plus the events after it."""
+    log_path, snapshot_path = str(tmp_path / "events.log"), str(tmp_path / "s.json")
+    journal = Journal(log_path, snapshot_path, snapshot_interval=5)
+    library = Library(Config(), journal)
+    populate(library)
+    journal.close()
+
+    journal = Journal(log_path, snapshot_path)
+    recovered = Library.recover(Config(), journal)
+
+    assert (tmp_path / "s.json").exists()
+    assert state(recovered) == state(library)
+    recovered.borrow_book("978-0-596-52068-7", "M002", date(2024, 4, 1))
+    recovered.return_book("978-0-201-61622-4", "M002", date(2024, 4, 1))
+    journal.close()
+
+    again = Library.recover(Config(), Journal(log_path, snapshot_path))
+    assert again.loans.get_borrower("978-0-596-52068-7") == "M002"
+    assert again.reservations.get_hold("978-0-201-61622-4") == "M001"
+    again.journal.close()
+
+
+def test_replay_keeps_recorded_outcomes(tmp_path):
+    """Test that replay applies the logged due dates and loans, not new policy."""
+    log_path, snapshot_path = str(tmp_path / "events.log"), str(tmp_path / "s.json")
+    journal = Journal(log_path, snapshot_path)
+    library = Library(Config(), journal)
+    populate(library)
+    library.add_book(
+        Book(
+            "978-0-00-000000-0",
+            "Lent Elsewhere",
+            "Someone",
+            2020,
+            "Fiction",
+            BookStatus.BORROWED,
+            borrowed_by="M002",
+            due_date=date(2024, 5, 1),
+        )
+    )
+    journal.close()
+
+    stricter = Config(max_books_per_member=1, loan_period_days=7)
+    recovered = Library.recover(stricter, Journal(log_path, snapshot_path))
+
+    assert state(recovered) == state(library)
+    book = recovered.catalog.get_book("978-0-201-61622-4")
+    assert book.due_date == date(2024, 3, 16)
+    assert recovered.loans.get_borrower("978-0-00-000000-0") == "M002"
+    recovered.journal.close()
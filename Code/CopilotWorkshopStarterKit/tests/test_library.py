@@ -0,0 +1,87 @@
+"""Tests for the library transactions and statistics."""
+
+from datetime import date, timedelta
+from src.book_api import BookStatus, create_sample_catalog
+from src.config import Config
+from src.library import Library
+from src.member_manager import Member
+
+
+def make_library() -> Library:
+    """Create a library with the sample catalog and two members."""
+    library = Library(Config())
+    library.catalog = create_sample_catalog()
+    library.members.register_member(
+        Member("M001", "Alice Smith", "alice@example.com", date(2024, 1, 15))
+    )
+    library.members.register_member(
+        Member("M002", "Bob Johnson", "bob@example.com", date(2024, 2, 20))
+    )
+    return library
+
+
+def test_statistics_after_borrow_and_return():
+    """Test that the counters follow borrow and return transactions."""
+    library = make_library()
+
+    assert library.borrow_book("978-0-13-110362-7", "M001") is True
+    assert library.borrow_book("978-0-201-61622-4", "M002") is True
+    stats = library.get_library_statistics()
+    assert stats["available_books"] == 3
+    assert stats["borrowed_books"] == 2
+    assert library.verify_statistics()
+
+    assert library.return_book("978-0-13-110362-7", "M001") == 0.0
+    stats = library.get_library_statistics()
+    assert stats["available_books"] == 4
+    assert stats["borrowed_books"] == 1
+    assert library.verify_statistics()
+
+
+def test_statistics_after_status_change_and_deactivate():
+    """Test that the counters follow status updates and deactivation."""
+    library = make_library()
+
+    library.catalog.update_book_status("978-0-132-35088-4", BookStatus.MAINTENANCE)
+    library.members.deactivate_member("M002")
+    library.members.deactivate_member("M002")
+
+    stats = library.get_library_statistics()
+    assert stats["total_books"] == 5
+    assert stats["available_books"] == 4
+    assert stats["total_members"] == 2
+    assert stats["active_members"] == 1
+    assert library.verify_statistics()
+
+
+def test_overdue_statistics():
+    """Test that overdue books are counted from the maintained due dates."""
+    library = make_library()
+    library.borrow_book("978-0-13-110362-7", "M001")
+    library.borrow_book("978-0-201-61622-4", "M001")
+
+    # Move one loan into the past; due dates change only via a status update.
+    book = library.catalog.get_book("978-0-13-110362-7")
+    library.catalog.update_book_status(book.isbn, BookStatus.AVAILABLE)
+    book.due_date = date.today() - timedelta(days=3)
+    library.catalog.update_book_status(book.isbn, BookStatus.BORROWED)
+
+    assert library.get_library_statistics()["overdue_books"] == 1
+    assert library.verify_statistics()
+
+    assert library.return_book(book.isbn, "M001") == 1.5
+    assert library.get_library_statistics()["overdue_books"] == 0
+    assert library.verify_statistics()
+
+
+def test_member_borrowed_books_uses_loan_table():
+    """Test retrieving a member's books and the per-member loan limit."""
+    library = make_library()
+    isbns = ["978-0-13-110362-7", "978-0-201-61622-4", "978-0-132-35088-4"]
+    for isbn in isbns:
+        assert library.borrow_book(isbn, "M001") is True
+
+    assert library.borrow_book("978-0-596-52068-7", "M001") is False
+    assert [b.isbn for b in library.get_member_borrowed_books("M001")] == isbns
+    assert library.return_book(isbns[0], "M002") is None
+    assert library.get_member_borrowed_books("M999") == []
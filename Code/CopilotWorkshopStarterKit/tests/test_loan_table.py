@@ -0,0 +1,32 @@
+"""Tests for the loan index."""
+
+from src.loan_table import LoanTable
+
+
+def test_add_and_remove_loan():
+    """Test that loans are visible from both the book and the member side."""
+    loans = LoanTable()
+
+    assert loans.add_loan("isbn-1", "M001") is True
+    assert loans.add_loan("isbn-2", "M001") is True
+    assert loans.get_borrower("isbn-1") == "M001"
+    assert loans.get_loans("M001") == ["isbn-1", "isbn-2"]
+    assert loans.count_loans("M001") == 2
+
+    assert loans.remove_loan("isbn-1", "M001") is True
+    assert loans.get_borrower("isbn-1") is None
+    assert loans.get_loans("M001") == ["isbn-2"]
+    assert len(loans) == 1
+
+
+def test_loan_failure_cases():
+    """Test that double loans and foreign returns are rejected."""
+    loans = LoanTable()
+    loans.add_loan("isbn-1", "M001")
+
+    assert loans.add_loan("isbn-1", "M002") is False
+    assert loans.remove_loan("isbn-1", "M002") is False
+    assert loans.remove_loan("isbn-9", "M001") is False
+    assert loans.has_loan("isbn-1", "M001") is True
+    assert loans.get_loans("M002") == []
+    assert loans.count_loans("M002") == 0
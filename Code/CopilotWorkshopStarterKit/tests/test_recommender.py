@@ -0,0 +1,107 @@
+"""Tests for the loan-based recommender."""
+
+from datetime import date
+from src.book_api import Book, BookCatalog
+from src.config import Config
+from src.library import Library
+from src.member_manager import Member
+from src.recommender import Recommender
+
+
+def make_catalog() -> BookCatalog:
+    """Create a catalog with two authors in two genres."""
+    catalog = BookCatalog()
+    books = [
+        Book("a1", "Dune", "Herbert", 1965, "SciFi"),
+        Book("a2", "Dune Messiah", "Herbert", 1969, "SciFi"),
+        Book("b1", "Foundation", "Asimov", 1951, "SciFi"),
+        Book("b2", "I, Robot", "Asimov", 1950, "SciFi"),
+        Book("c1", "Emma", "Austen", 1815, "Classics"),
+        Book("c2", "Persuasion", "Austen", 1817, "Classics"),
+    ]
+    for book in books:
+        catalog.add_book(book)
+    return catalog
+
+
+def isbns(books) -> list:
+    """Get the ISBNs of a list of books."""
+    return [book.isbn for book in books]
+
+
+def test_co_borrowed_books_rank_first():
+    """Test that books borrowed together are recommended together."""
+    recommender = Recommender(make_catalog(), top_k=2)
+    recommender.load_history(
+        [("M1", "a1"), ("M1", "b1"), ("M2", "a1"), ("M2", "b1"), ("M3", "a1")]
+    )
+
+    assert isbns(recommender.recommend("M3"))[0] == "b1"
+    assert recommender.similar_books("a1")[0][0] == "b1"
+
+
+def test_cold_start_fallbacks():
+    """Test author/genre fallback and popular books for new members."""
+    recommender = Recommender(make_catalog(), top_k=3)
+    recommender.load_history([("M1", "c1"), ("M2", "a1"), ("M3", "a1")])
+
+    assert isbns(recommender.recommend("M1")) == ["c2", "a1"]
+    assert isbns(recommender.recommend("NEW"))[0] == "a1"
+
+
+def test_incremental_updates_through_library():
+    """Test that loans and new books refresh cached recommendations."""
+    library = Library(Config(max_books_per_member=10))
+    library.catalog = make_catalog()
+    recommender = Recommender(library.catalog, top_k=1)
+    library.add_listener(recommender.handle_event)
+    for member_id in ["M1", "M2"]:
+        library.register_member(
+            Member(member_id, member_id, f"{member_id}@example.com", date(2024, 1, 1))
+        )
+
+    library.borrow_book("c1", "M1")
+    assert isbns(recommender.recommend("M1")) == ["c2"]
+
+    library.return_book("c1", "M1")
+    library.borrow_book("c1", "M2")
+    library.borrow_book("b1", "M2")
+    assert recommender.refresh() == 2
+    assert isbns(recommender.recommend("M1")) == ["b1"]
+
+    library.return_book("b1", "M2")
+    library.borrow_book("b1", "M1")
+    library.add_book(Book("c3", "Sense and Sensibility", "Austen", 1811, "Classics"))
+    recommender.top_k = 2
+    recommender.refresh()
+    assert isbns(recommender.recommend("M1")) == ["c2", "c3"]
+
+
+def test_loans_invalidate_borrowers_of_co_borrowed_books():
+    """Test that cached results match a rebuilt model after new co-borrowing."""
+    loans = [("M2", "c1"), ("M3", "c1"), ("M4", "c1")]
+    recommender = Recommender(make_catalog(), top_k=1)
+    recommender.load_history(loans)
+    assert isbns(recommender.recommend("M4")) == ["c2"]
+
+    loans += [("M2", "b1"), ("M3", "b1")]
+    recommender.load_history(loans[3:])
+    assert recommender.refresh() == 3
+
+    rebuilt = Recommender(make_catalog(), top_k=1)
+    rebuilt.load_history(loans)
+    assert isbns(rebuilt.recommend("M4")) == ["b1"]
+    assert isbns(recommender.recommend("M4")) == ["b1"]
+
+
+def test_popular_fallback_follows_new_loans():
+    """Test that lists padded with popular books see popularity changes."""
+    recommender = Recommender(make_catalog(), top_k=1)
+    recommender.load_history([("M1", "a1"), ("M2", "a1")])
+    assert isbns(recommender.recommend("NEW")) == ["a1"]
+
+    for member_id in ["M3", "M4", "M5"]:
+        recommender.record_loan(member_id, "c1")
+    assert isbns(recommender.recommend("NEW")) == ["c1"]
+    assert recommender.refresh() == 5
+    assert recommender.refresh() == 0
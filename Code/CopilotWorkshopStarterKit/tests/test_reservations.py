@@ -0,0 +1,121 @@
+"""Tests for reservation queues and holds."""
+
+from datetime import date, timedelta
+from src.book_api import BookStatus, create_sample_catalog
+from src.config import Config
+from src.library import Library
+from src.member_manager import Member
+from src.reservations import ReservationQueue
+
+ISBN = "978-0-13-110362-7"
+DAY = date(2024, 5, 1)
+
+
+def make_library() -> Library:
+    """Create a library with the sample catalog and four members."""
+    library = Library(Config(hold_period_days=3))
+    library.catalog = create_sample_catalog()
+    for i in range(1, 5):
+        library.members.register_member(
+            Member(f"M{i}", f"Member {i}", f"m{i}@example.com", DAY)
+        )
+    return library
+
+
+def test_queue_order_with_priority_and_cancel():
+    """Test FIFO order, priority members and cancellation."""
+    queue = ReservationQueue()
+    for member_id in ["A", "B", "C"]:
+        queue.push(member_id)
+    queue.push("VIP", priority=True)
+
+    assert queue.push("A") is False
+    assert queue.cancel("B") is True
+    assert queue.cancel("B") is False
+    assert queue.waiting() == [("VIP", True), ("A", False), ("C", False)]
+    assert [queue.pop(), queue.pop(), queue.pop(), queue.pop()] == [
+        "VIP",
+        "A",
+        "C",
+        None,
+    ]
+
+
+def test_queue_stays_compact_after_many_cancellations():
+    """Test that cancelled entries do not pile up in the heap."""
+    queue = ReservationQueue()
+    for i in range(1000):
+        queue.push(f"M{i}")
+    for i in range(999):
+        queue.cancel(f"M{i}")
+
+    assert len(queue) == 1
+    assert len(queue._heap) <= 2
+    assert queue.pop() == "M999"
+
+
+def test_return_puts_book_on_hold_and_notifies():
+    """Test that a returned book is held for the next member in line."""
+    library = make_library()
+    notifications = []
+    library.reservations.add_listener(
+        lambda isbn, member_id, expires: notifications.append((member_id, expires))
+    )
+    library.borrow_book(ISBN, "M1", DAY)
+
+    assert library.reserve_book("978-0-201-61622-4", "M2") is False
+    assert library.reserve_book(ISBN, "M1") is False
+    assert library.reserve_book(ISBN, "M2") is True
+    assert library.reserve_book(ISBN, "M3", priority=True) is True
+
+    library.return_book(ISBN, "M1", DAY)
+
+    assert library.catalog.get_book(ISBN).status == BookStatus.RESERVED
+    assert notifications == [("M3", DAY + timedelta(days=3))]
+    assert library.borrow_book(ISBN, "M2", DAY) is False
+    assert library.borrow_book(ISBN, "M3", DAY) is True
+    assert library.reservations.queue_length(ISBN) == 1
+    assert library.verify_statistics()
+
+
+def test_expired_hold_passes_to_next_member():
+    """Test that uncollected holds expire and move down the queue."""
+    library = make_library()
+    library.borrow_book(ISBN, "M1", DAY)
+    library.reserve_book(ISBN, "M2")
+    library.reserve_book(ISBN, "M3")
+    library.return_book(ISBN, "M1", DAY)
+
+    assert library.expire_holds(DAY + timedelta(days=3)) == []
+    assert library.expire_holds(DAY + timedelta(days=4)) == [ISBN]
+    assert library.reservations.get_hold(ISBN) == "M3"
+
+    assert library.cancel_reservation(ISBN, "M3", DAY + timedelta(days=5)) is True
+    assert library.reservations.get_hold(ISBN) is None
+    assert library.catalog.get_book(ISBN).status == BookStatus.AVAILABLE
+    assert library.verify_statistics()
+
+
+def test_expired_hold_cannot_be_borrowed():
+    """Test that a hold is checked against the borrowing date."""
+    library = make_library()
+    library.borrow_book(ISBN, "M1", DAY)
+    library.reserve_book(ISBN, "M2")
+    library.reserve_book(ISBN, "M3")
+    library.return_book(ISBN, "M1", DAY)
+
+    assert library.borrow_book(ISBN, "M2", DAY + timedelta(days=4)) is False
+    assert library.reservations.get_hold(ISBN) == "M3"
+    assert library.borrow_book(ISBN, "M3", DAY + timedelta(days=4)) is True
+
+
+def test_book_back_from_maintenance_serves_queue():
+    """Test that a book leaving maintenance goes to the first waiting member."""
+    library = make_library()
+    library.update_book_status(ISBN, BookStatus.MAINTENANCE, DAY)
+    library.reserve_book(ISBN, "M4")
+
+    library.update_book_status(ISBN, BookStatus.AVAILABLE, DAY)
+
+    assert library.catalog.get_book(ISBN).status == BookStatus.RESERVED
+    assert library.reservations.get_hold(ISBN) == "M4"
@@ -0,0 +1,96 @@
+"""Tests for the library HTTP API."""
+
+import asyncio
+import json
+from src.server import LibraryServer, create_sample_library
+
+
+def get_json(response) -> dict:
+    """Decode a JSON response body."""
+    return json.loads(response.body)
+
+
+def test_search_pagination():
+    """Test searching the catalog page by page."""
+    server = LibraryServer(create_sample_library(num_extra_books=45))
+
+    first = get_json(server.handle_request("GET", "/books?title=generated", {}))
+    last = get_json(
+        server.handle_request("GET", "/books?title=generated&page=3", {})
+    )
+
+    assert first["total"] == 45
+    assert len(first["items"]) == 20
+    assert len(last["items"]) == 5
+    bad = server.handle_request("GET", "/books?per_page=1000", {})
+    assert bad.status == 400
+
+
+def test_conditional_get_and_cache():
+    """Test ETags, 304 responses and cache invalidation on changes."""
+    server = LibraryServer(create_sample_library())
+
+    response = server.handle_request("GET", "/books?author=martin", {})
+    etag = response.headers["ETag"]
+    assert len(server.cache) == 1
+    assert server.handle_request("GET", "/books?author=martin", {}) is response
+
+    not_modified = server.handle_request(
+        "GET", "/books?author=martin", {"if-none-match": etag}
+    )
+    assert not_modified.status == 304
+
+    body = json.dumps({"member_id": "M001"}).encode()
+    assert server.handle_request("POST", "/books/978-0-132-35088-4/borrow", {}, body)
+    changed = server.handle_request(
+        "GET", "/books?author=martin", {"if-none-match": etag}
+    )
+    assert changed.status == 200
+    assert get_json(changed)["items"][0]["status"] == "borrowed"
+
+
+def test_borrow_return_and_stats():
+    """Test the transaction and statistics endpoints."""
+    server = LibraryServer(create_sample_library())
+    body = json.dumps({"member_id": "M002"}).encode()
+    book_url = "/books/978-0-13-110362-7"
+
+    borrowed = server.handle_request("POST", f"{book_url}/borrow", {}, body)
+    assert borrowed.status == 200
+    again = server.handle_request("POST", f"{book_url}/borrow", {}, body)
+    assert again.status == 409
+    member = get_json(server.handle_request("GET", "/members/M002", {}))
+    assert [b["isbn"] for b in member["borrowed_books"]] == ["978-0-13-110362-7"]
+    assert get_json(server.handle_request("GET", "/stats", {}))["borrowed_books"] == 1
+
+    returned = server.handle_request("POST", f"{book_url}/return", {}, body)
+    assert get_json(returned)["late_fee"] == 0.0
+    assert server.handle_request("POST", "/books/x/return", {}, b"").status == 400
+    assert server.handle_request("GET", "/overdue", {}).status == 200
+    assert server.handle_request("GET", "/nowhere", {}).status == 404
+
+
+def test_http_roundtrip():
+    """Test two keep-alive requests over a real socket."""
+
+    async def run() -> list:
+        server = await LibraryServer(create_sample_library()).start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        request = "GET /stats HTTP/1.1\r\nHost: localhost\r\n\r\n".encode()
+        writer.write(request + request)
+        await writer.drain()
+        statuses = []
+        for _ in range(2):
+            statuses.append(await reader.readline())
+            headers = {}
+            while (line := await reader.readline()) != b"\r\n":
+                name, _, value = line.decode().partition(":")
+                headers[name.lower()] = value.strip()
+            await reader.readexactly(int(headers["content-length"]))
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return statuses
+
+    assert asyncio.run(run()) == [b"HTTP/1.1 200 OK\r\n"] * 2
@@ -0,0 +1,182 @@
+"""Load test for the chatbot against a local stub of an OpenAI-compatible API.
+
+Starts a stub server that streams canned completions with configurable
+delays, points main.py at it and runs many chat sessions concurrently.
+Reports sessions per second and time to first token.
+
+    uv run python loadtest.py --sessions 500 --turns 3 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import statistics
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers /chat/completions with a fixed text, streamed word by word."""
+
+    latency = 0.2  # seconds until the first token
+    token_delay = 0.01  # seconds between tokens
+    tokens = 20
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        words = [f"word{i} " for i in range(self.tokens)]
+        time.sleep(self.latency)
+        if not body.get("stream"):
+            message = {"role": "assistant", "content": "".join(words)}
+            self._send_json(
+                {
+                    "id": "stub",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body["model"],
+                    "choices": [
+                        {"index": 0, "message": message, "finish_reason": "stop"}
+                    ],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": self.tokens},
+                }
+            )
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for i, word in enumerate(words):
+            if i:
+                time.sleep(self.token_delay)
+            self._send_chunk(body["model"], {"content": word}, None)
+        self._send_chunk(body["model"], {}, "stop")
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def _send_chunk(self, model, delta, finish_reason):
+        chunk = {
+            "id": "stub",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        self.wfile.flush()
+
+    def _send_json(self, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_stub(port, latency, token_delay, tokens):
+    """Run the stub server until the process is terminated."""
+    StubHandler.latency = latency
+    StubHandler.token_delay = token_delay
+    StubHandler.tokens = tokens
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    server.request_queue_size = 1024
+    server.serve_forever()
+
+
+def wait_for_port(port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+async def run_session(chat, index, turns, first_tokens):
+    """One user asking `turns` questions, each after the previous answer."""
+    request = SimpleNamespace(session_hash=f"load-{index}")
+    history = []
+    for turn in range(turns):
+        message = f"Session {index}, question {turn}"
+        start = time.perf_counter()
+        answer = None
+        async for partial in chat(message, history, "Helpful Assistant", request):
+            if answer is None:
+                first_tokens.append(time.perf_counter() - start)
+            answer = partial
+        history += [
+            {"role": "user", "content": message},
+            {"role": "assistant", "content": answer},
+        ]
+
+
+async def run_load(sessions, turns):
+    # Imported here, after the environment points it at the stub server.
+    import main
+
+    first_tokens = []
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(
+            run_session(main.chat_with_system_prompt, i, turns, first_tokens)
+            for i in range(sessions)
+        ),
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - start
+    failed = sum(isinstance(result, Exception) for result in results)
+    return elapsed, failed, first_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--queue", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    parser.add_argument("--tokens", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    os.environ["OPENROUTER_BASE_URL"] = f"http://127.0.0.1:{args.port}/v1"
+    os.environ["OPENROUTER_API_KEY"] = "stub"
+    os.environ["MAX_CONCURRENT_REQUESTS"] = str(args.concurrency)
+    os.environ["MAX_QUEUED_REQUESTS"] = str(args.queue)
+
+    stub = multiprocessing.Process(
+        target=serve_stub,
+        args=(args.port, args.latency, args.token_delay, args.tokens),
+        daemon=True,
+    )
+    stub.start()
+    try:
+        wait_for_port(args.port)
+        elapsed, failed, first_tokens = asyncio.run(run_load(args.sessions, args.turns))
+    finally:
+        stub.terminate()
+
+    completed = args.sessions - failed
+    print(f"sessions:        {completed} completed, {failed} failed")
+    print(f"wall time:       {elapsed:.2f} s")
+    print(f"sessions/s:      {completed / elapsed:.1f}")
+    if len(first_tokens) > 1:
+        percentiles = statistics.quantiles(first_tokens, n=100)
+        print(
+            "first token:     "
+            f"p50 {percentiles[49] * 1000:.0f} ms, p95 {percentiles[94] * 1000:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,21 @@
+import asyncio
+import hashlib
+import json
+import logging
 import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
 
 import gradio as gr
 
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langchain_openai import ChatOpenAI
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+from router import ModelRouter
+from semantic_cache import SemanticCache
+
+logger = logging.getLogger(__name__)
 
 SYSTEM_PROMPTS = {
     "Helpful Assistant": "You are a helpful assistant.",
@@ -13,31 +25,348 @@ SYSTEM_PROMPTS = {
 
 model = "mistralai/ministral-14b-2512"
 
-llm = ChatOpenAI(
-    api_key=os.getenv("OPENROUTER_API_KEY"),
-    base_url="https://openrouter.ai/api/v1",
-    model=model,
+# USD per 1K tokens; keep in line with the OpenRouter price list.
+MODEL_PRICES = {
+    "mistralai/ministral-3b-2512": 0.0001,
+    "mistralai/ministral-8b-2512": 0.00015,
+    model: 0.0002,
+}
+ROUTER_POLICY = os.getenv("ROUTER_POLICY", "cheapest")
+ROUTER_LATENCY_BUDGET = float(os.getenv("ROUTER_LATENCY_BUDGET", "2.0"))
+ROUTER_METRICS_FILE = os.getenv("ROUTER_METRICS_FILE")  # ".prom" or JSON
+
+
+def make_client(model_name):
+    # One client per model for all sessions, so HTTP connections are reused.
+    return ChatOpenAI(
+        api_key=os.getenv("OPENROUTER_API_KEY"),
+        base_url=os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
+        model=model_name,
+    )
+
+
+router = ModelRouter(
+    MODEL_PRICES,
+    make_client,
+    latency_budget=ROUTER_LATENCY_BUDGET,
+    policy=ROUTER_POLICY,
 )
+llm = router.clients[model]  # for summaries
+_metrics_exported = 0.0
+
+
+def export_router_metrics():
+    """Write the router metrics to ROUTER_METRICS_FILE, at most once a second."""
+    global _metrics_exported
+    if ROUTER_METRICS_FILE and time.monotonic() - _metrics_exported >= 1.0:
+        router.export(ROUTER_METRICS_FILE)
+        _metrics_exported = time.monotonic()
+
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "32"))
+MAX_QUEUED_REQUESTS = int(os.getenv("MAX_QUEUED_REQUESTS", "256"))
+
+
+class RequestLimiter:
+    """Caps concurrent model calls; requests over the limit wait in order.
+
+    When `max_queued` requests are already waiting, new ones are refused
+    instead of piling up.
+    """
+
+    def __init__(self, limit=MAX_CONCURRENT_REQUESTS, max_queued=MAX_QUEUED_REQUESTS):
+        self.limit = limit
+        self.max_queued = max_queued
+        self.active = 0
+        self.waiting = 0
+        self._slots = asyncio.Semaphore(limit)
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._slots.locked() and self.waiting >= self.max_queued:
+            raise gr.Error("Zu viele Anfragen, bitte versuchen Sie es gleich erneut.")
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._slots.release()
+
+
+limiter = RequestLimiter()
+
+CACHE_MAX_ENTRIES = 512
+CACHE_TTL_SECONDS = 60 * 60
+
+
+class ResponseCache:
+    """Exact-match answer cache with LRU eviction and a time-to-live."""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """Return the cached answer for `key`, or None."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, answer):
+        """Store an answer, evicting the least recently used one if full."""
+        self._entries[key] = (time.monotonic() + self.ttl, answer)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+response_cache = ResponseCache()
+
+# The semantic cache is off unless an embedding model is configured, e.g.
+# SEMANTIC_CACHE_EMBEDDINGS=openai/text-embedding-3-small via OpenRouter.
+SEMANTIC_CACHE_EMBEDDINGS = os.getenv("SEMANTIC_CACHE_EMBEDDINGS")
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+PRICE_PER_1K_TOKENS = float(os.getenv("PRICE_PER_1K_TOKENS", MODEL_PRICES[model]))
+
+semantic_cache = None
+if SEMANTIC_CACHE_EMBEDDINGS:
+    semantic_cache = SemanticCache(
+        OpenAIEmbeddings(
+            api_key=os.getenv("OPENROUTER_API_KEY"),
+            base_url=os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
+            model=SEMANTIC_CACHE_EMBEDDINGS,
+            # Send raw text; the tiktoken check only knows OpenAI models.
+            check_embedding_ctx_length=False,
+        ),
+        threshold=SEMANTIC_CACHE_THRESHOLD,
+        max_entries=CACHE_MAX_ENTRIES,
+        ttl=CACHE_TTL_SECONDS,
+        price_per_1k_tokens=PRICE_PER_1K_TOKENS,
+    )
+
+
+def _content_key(content):
+    # Gradio may send content as a list of parts; make it hashable.
+    if isinstance(content, str):
+        return content
+    return json.dumps(content, sort_keys=True, default=str)
+
+
+MAX_PROMPT_TOKENS = int(os.getenv("MAX_PROMPT_TOKENS", "4000"))
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "1000"))
+# Summaries cost an extra model call whenever turns are trimmed.
+SUMMARIZE_TRIMMED_TURNS = os.getenv("SUMMARIZE_TRIMMED_TURNS") == "1"
+
+
+def estimate_tokens(content):
+    """Rough token count of a message (about four characters per token)."""
+    return len(_content_key(content)) // 4 + 4
+
+
+async def summarize_with_llm(summary, messages):
+    """Fold trimmed messages into the running conversation summary."""
+    transcript = "\n".join(
+        f"{type(msg).__name__[:-7]}: {_content_key(msg.content)}" for msg in messages
+    )
+    prompt = (
+        "Update the summary of an ongoing conversation with the messages below. "
+        "Keep it under 150 words.\n\n"
+        f"Summary so far:\n{summary or '(none)'}\n\nMessages:\n{transcript}"
+    )
+    response = await llm.ainvoke([HumanMessage(content=prompt)])
+    return response.text
+
+
+class Conversation:
+    """LangChain messages of one chat session, kept within a token budget.
+
+    Gradio sends the whole history with every turn. A conversation keeps the
+    messages it has already converted and only appends the new ones, so a
+    turn costs the same however long the chat is. When the prompt exceeds
+    `max_tokens`, the oldest turns are dropped from it and, if `summarize`
+    is given, folded into a running summary by `update_summary`.
+    """
+
+    def __init__(self, system_prompt, max_tokens=MAX_PROMPT_TOKENS, summarize=None):
+        self.system_prompt = system_prompt
+        self.max_tokens = max_tokens
+        self.summarize = summarize
+        self.summary = ""
+        self.length = 0  # number of history messages appended so far
+        self.key = ""  # digest of all messages so far, for the response cache
+        self._messages = deque()  # (message, tokens), oldest first
+        self._trimmed = []  # dropped messages not yet in the summary
+        self._tokens = estimate_tokens(system_prompt)
+
+    def sync(self, history):
+        """Append the history messages not seen yet.
 
+        Returns False if the history no longer continues this conversation,
+        e.g. after the user cleared, retried or edited the chat.
+        """
+        if len(history) < self.length:
+            return False
+        for msg in history[self.length :]:
+            self.append(msg["role"], msg["content"])
+        return True
 
-def chat_with_system_prompt(message, history, system_prompt_name):
-    """Chatbot that uses the selected system prompt."""
+    def append(self, role, content):
+        """Add a message and trim the oldest turns if over budget."""
+        if role == "user":
+            message = HumanMessage(content=content)
+        elif role == "assistant":
+            message = AIMessage(content=content)
+        else:
+            message = None
+        self.length += 1
+        self.key = hashlib.sha256(
+            f"{self.key}\0{role}\0{_content_key(content)}".encode()
+        ).hexdigest()
+        if message is None:
+            return
+        tokens = estimate_tokens(content)
+        self._messages.append((message, tokens))
+        self._tokens += tokens
+        self._trim()
+
+    def messages(self):
+        """Prompt messages: system prompt (with summary), then recent turns."""
+        system_prompt = self.system_prompt
+        if self.summary:
+            system_prompt += f"\n\nSummary of the earlier conversation:\n{self.summary}"
+        return [SystemMessage(content=system_prompt)] + [msg for msg, _ in self._messages]
+
+    def _trim(self):
+        if self._tokens <= self.max_tokens:
+            return
+        # A summary costs a model call, so then make room for several turns.
+        target = self.max_tokens // 2 if self.summarize else self.max_tokens
+        # Drop whole turns, so the prompt still starts with a user message,
+        # but always keep the newest message.
+        while len(self._messages) > 1 and (
+            self._tokens > target or isinstance(self._messages[0][0], AIMessage)
+        ):
+            message, tokens = self._messages.popleft()
+            self._tokens -= tokens
+            if self.summarize:
+                self._trimmed.append(message)
+
+    async def update_summary(self):
+        """Fold the turns trimmed since the last call into the summary."""
+        if not self._trimmed:
+            return
+        trimmed, self._trimmed = self._trimmed, []
+        self._tokens -= estimate_tokens(self.summary) if self.summary else 0
+        self.summary = await self.summarize(self.summary, trimmed)
+        self._tokens += estimate_tokens(self.summary)
+
+
+class SessionStore:
+    """Conversations by Gradio session; least recently used evicted first."""
+
+    def __init__(self, max_sessions=MAX_SESSIONS, **conversation_options):
+        self.max_sessions = max_sessions
+        self.conversation_options = conversation_options
+        self._conversations = OrderedDict()
+
+    def conversation(self, session_id, system_prompt, history):
+        """The session's conversation, brought up to date with `history`."""
+        conversation = self._conversations.get(session_id)
+        if (
+            conversation is None
+            or conversation.system_prompt != system_prompt
+            or not conversation.sync(history)
+        ):
+            conversation = Conversation(system_prompt, **self.conversation_options)
+            conversation.sync(history)
+        if session_id is not None:
+            self._conversations[session_id] = conversation
+            self._conversations.move_to_end(session_id)
+            while len(self._conversations) > self.max_sessions:
+                self._conversations.popitem(last=False)
+        return conversation
+
+
+sessions = SessionStore(summarize=summarize_with_llm if SUMMARIZE_TRIMMED_TURNS else None)
+
+
+async def chat_with_system_prompt(
+    message, history, system_prompt_name, request: gr.Request
+):
+    """Chatbot that uses the selected system prompt.
+
+    Streams the answer token by token. Answers for a conversation state
+    seen before are served from `response_cache` without calling the model.
+    If `semantic_cache` is enabled, opening questions close enough to an
+    earlier one under the same system prompt are answered from it.
+    The handler is async, so waiting on the model does not tie up a worker
+    thread; `limiter` bounds how many model calls run at once, and `router`
+    picks the model.
+    """
     system_prompt = SYSTEM_PROMPTS[system_prompt_name]
+    session_id = request.session_hash if request else None
+    conversation = sessions.conversation(session_id, system_prompt, history)
+    conversation.append("user", message)
+
+    key = (system_prompt, conversation.key)
+    cached = response_cache.get(key)
+    if cached is not None:
+        yield cached
+        return
 
-    messages = [SystemMessage(content=system_prompt)]
-    for msg in history:
-        if msg["role"] == "user":
-            messages.append(HumanMessage(content=msg["content"]))
-        elif msg["role"] == "assistant":
-            messages.append(AIMessage(content=msg["content"]))
-    messages.append(HumanMessage(content=message))
+    # Only opening questions are matched by meaning: later answers depend
+    # on the conversation so far.
+    vector = None
+    if semantic_cache and conversation.length == 1:
+        try:
+            vector = await semantic_cache.embed(_content_key(message))
+        except Exception:
+            # The cache only saves model calls; answer without it.
+            logger.exception("Embedding failed, skipping the semantic cache")
+        else:
+            cached = semantic_cache.lookup(system_prompt, vector)
+            if cached is not None:
+                response_cache.put(key, cached)
+                yield cached
+                return
 
-    response = llm.invoke(messages)
-    return response.content
+    answer = ""
+    try:
+        async with limiter.slot():
+            await conversation.update_summary()
+            prompt = conversation.messages()
+            start = time.monotonic()
+            async for chunk in router.astream(prompt):
+                answer += chunk.text
+                yield answer
+            seconds = time.monotonic() - start
+    finally:
+        # Failed and stopped calls change the error rates, too.
+        export_router_metrics()
+    # Only complete answers are cached; a stopped stream never gets here.
+    response_cache.put(key, answer)
+    if vector is not None:
+        tokens = sum(estimate_tokens(msg.content) for msg in prompt)
+        tokens += estimate_tokens(answer)
+        semantic_cache.store(system_prompt, vector, answer, seconds, tokens)
 
 
 system_prompt_demo = gr.ChatInterface(
     fn=chat_with_system_prompt,
+    # Concurrency is bounded by `limiter`, which lets cache hits skip the line.
+    concurrency_limit=None,
     additional_inputs=[
         gr.Dropdown(
             choices=list(SYSTEM_PROMPTS.keys()),
@@ -51,4 +380,9 @@ system_prompt_demo = gr.ChatInterface(
 
 
 if __name__ == "__main__":
-    system_prompt_demo.launch()
+    # INFO for this module only; httpx logs every request at INFO.
+    logging.basicConfig()
+    logger.setLevel(logging.INFO)
+    system_prompt_demo.queue(max_size=MAX_QUEUED_REQUESTS).launch()
+    if semantic_cache:
+        logger.info("Semantic cache: %s", semantic_cache.report())
@@ -0,0 +1,236 @@
+"""Route chat requests across several models by cost, latency and errors."""
+
+import asyncio
+import json
+import os
+import statistics
+import time
+from collections import deque
+
+
+class ModelStats:
+    """Moving averages of one model's time to first token and error rate."""
+
+    def __init__(self, alpha=0.2, window=200):
+        self.alpha = alpha
+        self.latency = None  # moving average of seconds to first token
+        self.error_rate = 0.0
+        self.calls = 0
+        self.errors = 0
+        self.hedged = 0  # calls overtaken by a parallel call to another model
+        self.last_error = None  # time.monotonic() of the last failed call
+        self._recent = deque(maxlen=window)
+
+    def record_latency(self, seconds):
+        """Add the time a call took to its first token."""
+        self._recent.append(seconds)
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += self.alpha * (seconds - self.latency)
+
+    def record_result(self, error):
+        """Add the outcome of a call."""
+        self.calls += 1
+        self.errors += error
+        self.error_rate += self.alpha * (error - self.error_rate)
+        if error:
+            self.last_error = time.monotonic()
+
+    def p95(self, min_samples=20):
+        """95th percentile of recent latencies, None with too few samples."""
+        if len(self._recent) < min_samples:
+            return None
+        return statistics.quantiles(self._recent, n=20)[-1]
+
+
+class ModelRouter:
+    """Send each request to the best model that fits a latency budget.
+
+    Every model keeps a moving average of its time to first token and of
+    its error rate. Models whose error rate is at most `max_error_rate` and
+    whose average latency is within `latency_budget` (or not yet known)
+    are candidates; `policy` "cheapest" picks the lowest price among them,
+    "fastest" the lowest latency. If no model fits, the fastest healthy one
+    is used. A model avoided for its errors is tried again once
+    `retry_after` seconds have passed since its last failure.
+
+    Requests are hedged: if the first token has not arrived after the
+    chosen model's p95 latency (the budget while there are too few samples),
+    the same request goes to the next candidate as well, and whichever
+    answers first is streamed. A call that fails before its first token
+    falls back to the next candidate.
+
+    Args:
+        prices: Price per 1K tokens by model name
+        client_factory: Returns the chat model client for a model name
+        latency_budget: Target seconds to first token
+        policy: "cheapest" or "fastest"
+        max_error_rate: Models with a higher error rate are avoided
+        retry_after: Seconds after which an avoided model is tried again
+        hedge: Whether to issue backup calls for slow requests
+    """
+
+    def __init__(
+        self,
+        prices,
+        client_factory,
+        latency_budget=2.0,
+        policy="cheapest",
+        max_error_rate=0.5,
+        retry_after=30.0,
+        hedge=True,
+    ):
+        if policy not in ("cheapest", "fastest"):
+            raise ValueError(f"Unknown routing policy: {policy}")
+        self.prices = dict(prices)
+        self.latency_budget = latency_budget
+        self.policy = policy
+        self.max_error_rate = max_error_rate
+        self.retry_after = retry_after
+        self.hedge = hedge
+        self.clients = {name: client_factory(name) for name in self.prices}
+        self.stats = {name: ModelStats() for name in self.prices}
+        self._closing = set()  # references to pending aclose() tasks
+
+    def candidates(self):
+        """Model names in the order they should be tried."""
+
+        def latency(name):
+            known = self.stats[name].latency
+            return known if known is not None else 0.0
+
+        def is_healthy(name):
+            stats = self.stats[name]
+            return (
+                stats.error_rate <= self.max_error_rate
+                or time.monotonic() - stats.last_error > self.retry_after
+            )
+
+        healthy = [name for name in self.prices if is_healthy(name)] or list(
+            self.prices
+        )
+        fitting = [name for name in healthy if latency(name) <= self.latency_budget]
+        if self.policy == "cheapest":
+            fitting.sort(key=lambda name: (self.prices[name], latency(name)))
+        else:
+            fitting.sort(key=latency)
+        others = sorted((name for name in healthy if name not in fitting), key=latency)
+        unhealthy = [name for name in self.prices if name not in healthy]
+        return fitting + others + unhealthy
+
+    async def astream(self, messages):
+        """Stream the answer of the first model to respond."""
+        queue = self.candidates()
+        chosen = queue.pop(0)
+        delay = self.stats[chosen].p95() or self.latency_budget
+        pending = {self._first_chunk(chosen, messages)}
+        done, winner = set(), None
+        try:
+            while True:
+                timeout = delay if self.hedge and queue and len(pending) == 1 else None
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                # Retrieve every exception, so none is reported as unhandled.
+                failed = [task for task in done if task.exception() is not None]
+                winner = next((task for task in done if task not in failed), None)
+                if winner is not None:
+                    break
+                if not pending and not queue:
+                    raise failed[0].exception()
+                if queue and (done or not pending or timeout is not None):
+                    # Failed, or slower than the p95 delay: ask the next model.
+                    pending.add(self._first_chunk(queue.pop(0), messages))
+        finally:
+            # Also reached when the consumer is cancelled while waiting. A call
+            # may answer before its cancellation lands, or together with the
+            # winner, so unused streams are closed once their task is done.
+            for task in pending | done:
+                if task is not winner:
+                    task.cancel()
+                    task.add_done_callback(self._close_unused)
+
+        name, stream, first = winner.result()
+        try:
+            yield first
+            async for chunk in stream:
+                yield chunk
+        except Exception:
+            self.stats[name].record_result(error=True)
+            raise
+        else:
+            self.stats[name].record_result(error=False)
+        finally:
+            await stream.aclose()
+
+    def _close_unused(self, task):
+        """Close the stream of a call whose answer is not used."""
+        if task.cancelled() or task.exception() is not None:
+            return
+        closing = asyncio.ensure_future(task.result()[1].aclose())
+        self._closing.add(closing)
+        closing.add_done_callback(self._closing.discard)
+
+    def _first_chunk(self, name, messages):
+        async def first_chunk():
+            stream = self.clients[name].astream(messages)
+            start = time.monotonic()
+            try:
+                first = await anext(stream)
+            except asyncio.CancelledError:
+                # Overtaken by another call. Its latency is unknown, so it is
+                # only counted as hedged.
+                self.stats[name].hedged += 1
+                await stream.aclose()
+                raise
+            except Exception:
+                self.stats[name].record_result(error=True)
+                await stream.aclose()
+                raise
+            self.stats[name].record_latency(time.monotonic() - start)
+            return name, stream, first
+
+        return asyncio.create_task(first_chunk(), name=name)
+
+    def metrics(self):
+        """Current statistics per model."""
+        return {
+            name: {
+                "price_per_1k_tokens": self.prices[name],
+                "latency_avg_seconds": stats.latency,
+                "latency_p95_seconds": stats.p95(),
+                "error_rate": stats.error_rate,
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "hedged": stats.hedged,
+            }
+            for name, stats in self.stats.items()
+        }
+
+    def prometheus(self):
+        """Metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, values in self.metrics().items():
+            for key, value in values.items():
+                if value is None:
+                    continue
+                lines.append(
+                    f'chatbot_model_{key}{{model="{name}"}} {float(value):g}'
+                )
+        return "\n".join(sorted(lines)) + "\n"
+
+    def export(self, path):
+        """Write the metrics to `path`: Prometheus text for ".prom", else JSON.
+
+        A ".prom" file can be picked up by node_exporter's textfile
+        collector. The file is replaced atomically.
+        """
+        if path.endswith(".prom"):
+            content = self.prometheus()
+        else:
+            content = json.dumps(self.metrics(), indent=2)
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as f:
+            f.write(content)
+        os.replace(temporary, path)
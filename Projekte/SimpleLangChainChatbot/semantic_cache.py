@@ -0,0 +1,166 @@
+"""Semantic answer cache: reuse answers to questions similar to earlier ones."""
+
+import re
+import time
+import zlib
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+_WORD = re.compile(r"\w+")
+
+
+class HashingEmbeddings(Embeddings):
+    """Deterministic local embeddings from hashed words and word pairs.
+
+    For offline tests only. The vectors are lexical: questions that differ
+    in one decisive word ("ascending" vs "descending") still score above
+    0.9, so these embeddings must not back a cache that serves users.
+    """
+
+    def __init__(self, dimensions=512):
+        self.dimensions = dimensions
+
+    def embed_query(self, text):
+        vector = np.zeros(self.dimensions)
+        words = _WORD.findall(text.lower())
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            # crc32 is stable across processes, unlike the built-in hash().
+            code = zlib.crc32(feature.encode())
+            vector[code % self.dimensions] += 1.0 if code & 1 << 31 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    async def aembed_query(self, text):
+        # Cheap enough to run inline instead of in a worker thread.
+        return self.embed_query(text)
+
+
+class _Index:
+    """Fixed-size matrix of normalized question vectors for one system prompt."""
+
+    def __init__(self, capacity):
+        self.vectors = None
+        self.answers = [None] * capacity
+        self.expires = np.full(capacity, -np.inf)
+        self.last_used = np.zeros(capacity)
+        self.savings = [None] * capacity  # (seconds, tokens) per answer
+
+    def search(self, vector, now):
+        """Slot with the highest cosine similarity among live entries."""
+        if self.vectors is None:
+            return None, -1.0
+        scores = self.vectors @ vector
+        scores[self.expires < now] = -np.inf
+        slot = int(np.argmax(scores))
+        return slot, float(scores[slot])
+
+    def free_slot(self, now):
+        """An expired slot if there is one, else the least recently used."""
+        expired = np.flatnonzero(self.expires < now)
+        if len(expired):
+            return int(expired[0])
+        return int(np.argmin(self.last_used))
+
+
+class SemanticCache:
+    """Answers keyed by question meaning, per system prompt.
+
+    Questions are embedded and compared by cosine similarity with the
+    cached questions of the same system prompt: one matrix-vector product
+    over at most `max_entries` rows. A match at or above `threshold` is a
+    hit. Storing an answer for a question that would hit replaces the
+    matching entry; otherwise, when an index is full, the least recently
+    used entry is evicted.
+
+    Hits are counted together with the time and tokens their original
+    answer took, so `report()` shows what the cache saved.
+
+    Args:
+        embeddings: LangChain `Embeddings` used to compare questions
+        threshold: Minimal cosine similarity for a hit
+        max_entries: Maximal number of answers per system prompt
+        ttl: Seconds an answer stays valid
+        price_per_1k_tokens: Token price used for the cost estimate
+    """
+
+    def __init__(
+        self,
+        embeddings,
+        threshold=0.95,
+        max_entries=1000,
+        ttl=60 * 60,
+        price_per_1k_tokens=0.0,
+    ):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.price_per_1k_tokens = price_per_1k_tokens
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self.saved_tokens = 0
+        self._indexes = {}
+
+    async def embed(self, question):
+        """Normalized embedding of a question."""
+        vector = np.asarray(await self.embeddings.aembed_query(question))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, system_prompt, vector):
+        """Cached answer to a similar question, or None."""
+        now = time.monotonic()
+        index = self._indexes.get(system_prompt)
+        slot, score = index.search(vector, now) if index else (None, -1.0)
+        if slot is None or score < self.threshold:
+            self.misses += 1
+            return None
+        index.last_used[slot] = now
+        seconds, tokens = index.savings[slot]
+        self.hits += 1
+        self.saved_seconds += seconds
+        self.saved_tokens += tokens
+        return index.answers[slot]
+
+    def store(self, system_prompt, vector, answer, seconds, tokens):
+        """Cache an answer with what it cost to generate it.
+
+        Args:
+            system_prompt: System prompt the answer was generated with
+            vector: Question embedding from `embed`
+            answer: The answer
+            seconds: Time the model took to answer
+            tokens: Prompt and completion tokens the answer used
+        """
+        index = self._indexes.get(system_prompt)
+        if index is None:
+            index = self._indexes[system_prompt] = _Index(self.max_entries)
+        if index.vectors is None:
+            index.vectors = np.zeros((self.max_entries, len(vector)))
+        now = time.monotonic()
+        # An answer to a question the cache already matches replaces it.
+        slot, score = index.search(vector, now)
+        if score < self.threshold:
+            slot = index.free_slot(now)
+        index.vectors[slot] = vector
+        index.answers[slot] = answer
+        index.expires[slot] = now + self.ttl
+        index.last_used[slot] = now
+        index.savings[slot] = (seconds, tokens)
+
+    def report(self):
+        """Hit rate and the latency, tokens and cost saved by hits."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "saved_seconds": round(self.saved_seconds, 3),
+            "saved_tokens": self.saved_tokens,
+            "saved_cost": round(self.saved_tokens / 1000 * self.price_per_1k_tokens, 6),
+        }
@@ -0,0 +1,190 @@
+"""Tests for the chat handler's caches and conversation state, without a model."""
+
+import asyncio
+import os
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+# main creates its model clients on import; no request is ever sent.
+os.environ.setdefault("OPENROUTER_API_KEY", "test")
+
+from main import (  # noqa: E402
+    Conversation,
+    RequestLimiter,
+    ResponseCache,
+    SessionStore,
+    estimate_tokens,
+    gr,
+)
+
+PROMPT = "You are a helpful assistant."
+
+
+def turns(*contents):
+    """Gradio history alternating user and assistant messages."""
+    roles = ("user", "assistant")
+    return [
+        {"role": roles[i % 2], "content": content} for i, content in enumerate(contents)
+    ]
+
+
+class RequestLimiterTest(unittest.IsolatedAsyncioTestCase):
+    async def hold(self, limiter, release):
+        async with limiter.slot():
+            await release.wait()
+
+    async def test_full_queue_refuses_new_requests(self):
+        limiter = RequestLimiter(limit=1, max_queued=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(self.hold(limiter, release))
+        waiter = asyncio.create_task(self.hold(limiter, release))
+        await asyncio.sleep(0)
+
+        self.assertEqual((limiter.active, limiter.waiting), (1, 1))
+        with self.assertRaises(gr.Error):
+            async with limiter.slot():
+                pass
+
+        release.set()
+        await asyncio.gather(holder, waiter)
+        self.assertEqual((limiter.active, limiter.waiting), (0, 0))
+
+    async def test_slot_is_released_when_the_call_fails(self):
+        limiter = RequestLimiter(limit=1, max_queued=0)
+        with self.assertRaises(ValueError):
+            async with limiter.slot():
+                raise ValueError("model error")
+
+        self.assertEqual(limiter.active, 0)
+        async with limiter.slot():
+            self.assertEqual(limiter.active, 1)
+
+    async def test_cancelled_waiter_leaves_the_queue(self):
+        limiter = RequestLimiter(limit=1, max_queued=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(self.hold(limiter, release))
+        waiter = asyncio.create_task(self.hold(limiter, release))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.assertEqual(limiter.waiting, 0)
+        release.set()
+        await holder
+        self.assertEqual(limiter.active, 0)
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        clock = SimpleNamespace(monotonic=lambda: self.now)
+        patcher = mock.patch("main.time", clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_entries_expire_after_ttl(self):
+        cache = ResponseCache(ttl=60)
+        cache.put("key", "answer")
+        self.now += 60
+        self.assertEqual(cache.get("key"), "answer")
+        self.now += 1
+        self.assertIsNone(cache.get("key"))
+
+    def test_full_cache_evicts_least_recently_used(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", "A")
+        cache.put("b", "B")
+        cache.get("a")
+        cache.put("c", "C")
+
+        self.assertEqual(cache.get("a"), "A")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "C")
+
+    def test_hits_and_misses_are_counted(self):
+        cache = ResponseCache()
+        cache.get("key")
+        cache.put("key", "answer")
+        cache.get("key")
+        cache.get("key")
+
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+
+class ConversationTest(unittest.IsolatedAsyncioTestCase):
+    def test_trim_drops_whole_turns_from_the_front(self):
+        conversation = Conversation(PROMPT, max_tokens=45)
+        conversation.sync(turns("a" * 40, "b" * 40, "c" * 40, "d" * 40, "e" * 40))
+
+        # Trimming stops at a user message: the prompt never starts mid-turn.
+        contents = [msg.content for msg in conversation.messages()[1:]]
+        self.assertEqual(contents, ["e" * 40])
+        self.assertEqual(conversation.length, 5)
+
+    def test_trim_keeps_the_newest_message(self):
+        conversation = Conversation(PROMPT, max_tokens=20)
+        conversation.append("user", "x" * 400)
+
+        self.assertEqual(conversation.messages()[-1].content, "x" * 400)
+
+    async def test_update_summary_replaces_the_summary_in_the_token_count(self):
+        calls = []
+
+        async def summarize(summary, messages):
+            calls.append((summary, [msg.content for msg in messages]))
+            return f"summary {len(calls)}"
+
+        conversation = Conversation(PROMPT, max_tokens=45, summarize=summarize)
+        conversation.sync(turns("a" * 40, "b" * 40, "c" * 40))
+        await conversation.update_summary()
+        conversation.sync(turns("a" * 40, "b" * 40, "c" * 40, "d" * 40, "e" * 40))
+        await conversation.update_summary()
+
+        self.assertEqual(
+            calls,
+            [("", ["a" * 40, "b" * 40]), ("summary 1", ["c" * 40, "d" * 40])],
+        )
+        self.assertIn("summary 2", conversation.messages()[0].content)
+        kept = sum(estimate_tokens(msg.content) for msg in conversation.messages()[1:])
+        self.assertEqual(
+            conversation._tokens,
+            estimate_tokens(PROMPT) + estimate_tokens("summary 2") + kept,
+        )
+
+
+class SessionStoreTest(unittest.TestCase):
+    def test_conversation_continues_with_the_same_history(self):
+        store = SessionStore()
+        first = store.conversation("s", PROMPT, turns("Hi", "Hello"))
+        again = store.conversation("s", PROMPT, turns("Hi", "Hello", "How are you?"))
+
+        self.assertIs(again, first)
+        self.assertEqual(again.length, 3)
+
+    def test_shorter_history_or_new_prompt_rebuilds_the_conversation(self):
+        store = SessionStore()
+        first = store.conversation("s", PROMPT, turns("Hi", "Hello", "Bye"))
+
+        retried = store.conversation("s", PROMPT, turns("Hi"))
+        self.assertIsNot(retried, first)
+        self.assertEqual(retried.length, 1)
+
+        pirate = store.conversation("s", "Pirate", turns("Hi", "Hello"))
+        self.assertIsNot(pirate, retried)
+        self.assertEqual(pirate.messages()[0].content, "Pirate")
+
+    def test_least_recently_used_session_is_evicted(self):
+        store = SessionStore(max_sessions=2)
+        a = store.conversation("a", PROMPT, turns("Hi"))
+        b = store.conversation("b", PROMPT, turns("Hi"))
+        store.conversation("a", PROMPT, turns("Hi"))
+        store.conversation("c", PROMPT, turns("Hi"))
+
+        self.assertIs(store.conversation("a", PROMPT, turns("Hi")), a)
+        self.assertIsNot(store.conversation("b", PROMPT, turns("Hi")), b)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Tests for the model router, using fake streaming clients."""
+
+import asyncio
+import unittest
+
+from router import ModelRouter
+
+
+class FakeClient:
+    """Streams two chunks once its event is set and records closed streams."""
+
+    def __init__(self, name):
+        self.name = name
+        self.ready = asyncio.Event()
+        self.opened = 0
+        self.closed = 0
+
+    async def astream(self, messages):
+        self.opened += 1
+        try:
+            await self.ready.wait()
+            yield f"{self.name}:a"
+            yield f"{self.name}:b"
+        finally:
+            self.closed += 1
+
+
+class ModelRouterTest(unittest.IsolatedAsyncioTestCase):
+    def make_router(self):
+        # A tiny budget makes the router hedge almost at once.
+        return ModelRouter({"cheap": 0.1, "fast": 1.0}, FakeClient, latency_budget=0.01)
+
+    async def wait_for_hedge(self, router):
+        while router.clients["fast"].opened == 0:
+            await asyncio.sleep(0.005)
+
+    async def test_cancelled_consumer_closes_all_streams(self):
+        router = self.make_router()
+        consumer = asyncio.create_task(anext(router.astream([])))
+        await self.wait_for_hedge(router)
+
+        consumer.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await consumer
+        await asyncio.sleep(0.01)
+
+        for client in router.clients.values():
+            self.assertEqual(client.closed, client.opened)
+        self.assertEqual(router.stats["cheap"].hedged, 1)
+        self.assertEqual(router.stats["fast"].hedged, 1)
+
+    async def test_streams_answering_together_are_all_closed(self):
+        router = self.make_router()
+        stream = router.astream([])
+        consumer = asyncio.create_task(anext(stream))
+        await self.wait_for_hedge(router)
+
+        for client in router.clients.values():
+            client.ready.set()
+        first = await consumer
+        rest = [chunk async for chunk in stream]
+        await asyncio.sleep(0.01)
+
+        winner = first.split(":")[0]
+        self.assertEqual(rest, [f"{winner}:b"])
+        for client in router.clients.values():
+            self.assertEqual(client.closed, 1)
+
+    async def test_hedged_away_calls_leave_latency_and_errors_alone(self):
+        router = self.make_router()
+        consumer = asyncio.create_task(anext(router.astream([])))
+        await self.wait_for_hedge(router)
+
+        router.clients["fast"].ready.set()
+        self.assertEqual(await consumer, "fast:a")
+        await asyncio.sleep(0.01)
+
+        cheap = router.stats["cheap"]
+        self.assertEqual(cheap.hedged, 1)
+        self.assertIsNone(cheap.latency)
+        self.assertEqual(cheap.calls, 0)
+        self.assertEqual(cheap.error_rate, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
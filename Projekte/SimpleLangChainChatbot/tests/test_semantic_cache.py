@@ -0,0 +1,124 @@
+"""Tests for the semantic answer cache, using offline embeddings."""
+
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from semantic_cache import HashingEmbeddings, SemanticCache
+
+PROMPT = "You are a helpful assistant."
+
+
+class SemanticCacheTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        clock = SimpleNamespace(monotonic=lambda: self.now)
+        patcher = mock.patch("semantic_cache.time", clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_cache(self, **options):
+        return SemanticCache(HashingEmbeddings(), **options)
+
+    async def store(self, cache, question, answer, seconds=1.0, tokens=100):
+        vector = await cache.embed(question)
+        cache.store(PROMPT, vector, answer, seconds, tokens)
+
+    async def lookup(self, cache, question, system_prompt=PROMPT):
+        return cache.lookup(system_prompt, await cache.embed(question))
+
+    def test_embeddings_are_deterministic_and_normalized(self):
+        embeddings = HashingEmbeddings()
+        vector = embeddings.embed_query("What is a decorator?")
+        self.assertEqual(vector, embeddings.embed_query("What is a decorator?"))
+        self.assertAlmostEqual(sum(x * x for x in vector), 1.0)
+
+    async def test_threshold_decides_hits(self):
+        question = "How do I reverse a list in Python?"
+        rephrased = "How can I reverse a list in Python?"
+        embeddings = HashingEmbeddings()
+        similarity = sum(
+            a * b
+            for a, b in zip(
+                embeddings.embed_query(question), embeddings.embed_query(rephrased)
+            )
+        )
+
+        strict = self.make_cache(threshold=similarity + 0.01)
+        await self.store(strict, question, "Use reversed().")
+        self.assertIsNone(await self.lookup(strict, rephrased))
+
+        lenient = self.make_cache(threshold=similarity - 0.01)
+        await self.store(lenient, question, "Use reversed().")
+        self.assertEqual(await self.lookup(lenient, rephrased), "Use reversed().")
+
+    async def test_exact_question_hits_only_under_its_system_prompt(self):
+        cache = self.make_cache()
+        await self.store(cache, "What is a decorator?", "A wrapper.")
+        self.assertEqual(await self.lookup(cache, "what is a decorator"), "A wrapper.")
+        self.assertIsNone(await self.lookup(cache, "What is a decorator?", "Pirate"))
+
+    async def test_entries_expire_after_ttl(self):
+        cache = self.make_cache(ttl=60)
+        await self.store(cache, "What is a decorator?", "A wrapper.")
+        self.now += 59
+        self.assertEqual(await self.lookup(cache, "What is a decorator?"), "A wrapper.")
+        self.now += 2
+        self.assertIsNone(await self.lookup(cache, "What is a decorator?"))
+
+    async def test_full_cache_evicts_least_recently_used(self):
+        cache = self.make_cache(max_entries=2)
+        await self.store(cache, "What is a decorator?", "A wrapper.")
+        self.now += 1
+        await self.store(cache, "What is a generator?", "A lazy iterator.")
+        self.now += 1
+        # Using the first entry makes the second the least recently used.
+        await self.lookup(cache, "What is a decorator?")
+        self.now += 1
+        await self.store(cache, "What is a metaclass?", "A class of classes.")
+
+        self.assertEqual(await self.lookup(cache, "What is a decorator?"), "A wrapper.")
+        self.assertIsNone(await self.lookup(cache, "What is a generator?"))
+        self.assertEqual(
+            await self.lookup(cache, "What is a metaclass?"), "A class of classes."
+        )
+
+    async def test_storing_a_matching_question_replaces_its_answer(self):
+        cache = self.make_cache(max_entries=2)
+        await self.store(cache, "What is a decorator?", "A wrapper.")
+        await self.store(cache, "What is a decorator?", "A function wrapper.")
+        self.assertEqual(
+            await self.lookup(cache, "What is a decorator?"), "A function wrapper."
+        )
+
+        # The new answer reused the old slot, so there is room for another.
+        await self.store(cache, "What is a generator?", "A lazy iterator.")
+        self.assertEqual(
+            await self.lookup(cache, "What is a decorator?"), "A function wrapper."
+        )
+        self.assertEqual(
+            await self.lookup(cache, "What is a generator?"), "A lazy iterator."
+        )
+
+    async def test_report_counts_savings_of_hits(self):
+        cache = self.make_cache(price_per_1k_tokens=0.5)
+        await self.store(cache, "What is a decorator?", "A wrapper.", 2.0, 400)
+        await self.lookup(cache, "What is a decorator?")
+        await self.lookup(cache, "What is a decorator?")
+        await self.lookup(cache, "Explain asyncio event loops")
+
+        self.assertEqual(
+            cache.report(),
+            {
+                "hits": 2,
+                "misses": 1,
+                "hit_rate": 2 / 3,
+                "saved_seconds": 4.0,
+                "saved_tokens": 800,
+                "saved_cost": 0.4,
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()